@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Executor-backed asynchronous file access.
+
+Blocking filesystem work (directory scans, file reads, cache writes) runs on a
+bounded thread pool so that a slow disk or network mount never stalls the
+event loop serving other MCP requests.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+
+class AsyncFileAccess:
+    """Run blocking I/O on a dedicated thread pool with timeouts."""
+
+    def __init__(self, max_workers: int = 8, timeout: Optional[float] = 30.0):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="sap-groovy-io")
+
+    async def run(self, func: Callable[..., Any], *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """Run func(*args, **kwargs) on the pool; raise TimeoutError after the timeout.
+
+        The function runs in a copy of the caller's context, so per-call
+        context variables (e.g. metrics counters) are visible to it.
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        future = loop.run_in_executor(self._executor, partial(context.run, func, *args, **kwargs))
+        limit = self.timeout if timeout is None else timeout
+        if limit is None:
+            return await future
+        return await asyncio.wait_for(future, limit)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the SAP Groovy MCP server.
+
+Generates synthetic example corpora of a given size (scripts, READMEs,
+meta.yaml and fixtures), then drives the tools in-process and over a real
+stdio MCP session. Reports startup time, p50/p99 latency, throughput and peak
+RSS per tool as JSON that can be compared between commits.
+
+Usage:
+    python benchmark.py --sizes 1000 10000 --output bench.json
+    python benchmark.py --sizes 1000 --compare bench.json --max-regression 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+HERE = Path(__file__).parent
+
+WORDS = [
+    "order", "invoice", "customer", "material", "partner", "payload", "segment",
+    "delivery", "currency", "amount", "status", "shipment", "account", "address",
+    "contract", "product", "supplier", "receipt", "payment", "booking", "batch",
+    "record", "document", "entry", "item", "line", "price", "tax", "vendor", "region",
+]
+
+TAGS = ["beginner", "xml", "csv", "json", "edi", "logging", "headers", "properties", "security", "attachments"]
+
+IMPORTS = [
+    "groovy.xml.XmlSlurper",
+    "groovy.xml.MarkupBuilder",
+    "groovy.xml.XmlUtil",
+    "groovy.json.JsonSlurper",
+    "groovy.json.JsonOutput",
+    "java.util.HashMap",
+    "java.text.SimpleDateFormat",
+    "com.sap.it.api.ITApiFactory",
+    "com.sap.it.api.securestore.SecureStoreService",
+]
+
+BLOCKS = [
+    '    def body = message.getBody(String)\n',
+    '    def reader = message.getBody(java.io.Reader)\n    def root = new XmlSlurper().parse(reader)\n',
+    '    def json = new JsonSlurper().parseText(message.getBody(String))\n',
+    '    message.setHeader("{Word}Id", message.getHeaders().get("{word}Key"))\n',
+    '    message.setProperty("{word}Count", {num})\n',
+    '    def messageLog = messageLogFactory.getMessageLog(message)\n'
+    '    if (messageLog != null) {{\n'
+    '        messageLog.setStringProperty("{Word}", "{word} logged")\n'
+    '        messageLog.addAttachmentAsString("{Word}Payload", message.getBody(String), "text/plain")\n'
+    '    }}\n',
+    '    def writer = new StringWriter()\n    def xml = new MarkupBuilder(writer)\n'
+    '    xml.{Word}s {{\n        {word}(id: "{num}", "{word} value")\n    }}\n    message.setBody(writer.toString())\n',
+    '    def lines = message.getBody(String).split("\\n")\n    lines.eachWithIndex {{ line, i ->\n'
+    '        def fields = line.split(",")\n        message.setProperty("{word}_" + i, fields[0])\n    }}\n',
+    '    def format = new SimpleDateFormat("yyyy-MM-dd")\n    message.setHeader("{Word}Date", format.format(new Date()))\n',
+]
+
+
+def _script(rng: random.Random, words: list[str]) -> str:
+    imports = ["com.sap.gateway.ip.core.customdev.util.Message"] + rng.sample(IMPORTS, rng.randint(1, 4))
+    source = "".join(f"import {name};\n" for name in imports) + "\n"
+    source += "def Message processData(Message message) {\n"
+    for _ in range(rng.randint(2, 6)):
+        word = rng.choice(words)
+        source += rng.choice(BLOCKS).format(word=word, Word=word.capitalize(), num=rng.randint(1, 999))
+    source += "    return message\n}\n"
+    for _ in range(rng.randint(0, 3)):
+        a, b = rng.sample(words, 2)
+        source += (
+            f"\ndef {a}{b.capitalize()}(String {a}) {{\n"
+            f"    // Normalize the {a} {b}\n"
+            f"    return {a}?.trim()?.toUpperCase() + \"-{b}\"\n}}\n"
+        )
+    return source
+
+
+def _fixture(rng: random.Random, word: str, items: int) -> str:
+    rows = "".join(
+        f'    <{word.capitalize()} id="{i}"><Value>{rng.randint(0, 10_000)}</Value></{word.capitalize()}>\n'
+        for i in range(items)
+    )
+    return f"<Root>\n{rows}</Root>\n"
+
+
+def generate_corpus(target: Path, count: int, seed: int = 42, fixture_items: int = 20) -> Path:
+    """Write count synthetic example folders below target."""
+    rng = random.Random(seed)
+    target.mkdir(parents=True, exist_ok=True)
+    for n in range(count):
+        words = rng.sample(WORDS, 4)
+        name = f"{'-'.join(words[:2])}-{n:05d}"
+        folder = target / name
+        folder.mkdir(exist_ok=True)
+        (folder / "script.groovy").write_text(_script(rng, words), encoding="utf-8")
+        title = " ".join(w.capitalize() for w in words[:2])
+        (folder / "README.md").write_text(
+            f"# {title} Processing\n\nProcesses {words[0]} and {words[1]} data "
+            f"and stores {words[2]} details in headers and properties.\n",
+            encoding="utf-8",
+        )
+        tags = "".join(f"  - {tag}\n" for tag in rng.sample(TAGS, rng.randint(1, 3)))
+        (folder / "meta.yaml").write_text(f"author: Bench {n % 50}\ntags:\n{tags}", encoding="utf-8")
+        (folder / "input.body.xml").write_text(_fixture(rng, words[0], fixture_items), encoding="utf-8")
+        (folder / "input.header").write_text(f"{words[0]}Key={rng.randint(1, 99)}\n", encoding="utf-8")
+        if n % 3 == 0:
+            (folder / "expected.body.xml").write_text(_fixture(rng, words[1], 3), encoding="utf-8")
+    return target
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize_timings(timings: list[float], first: float) -> dict:
+    values = sorted(timings)
+    total = sum(values)
+    return {
+        "n": len(values),
+        "first_ms": round(first * 1000, 3),
+        "p50_ms": round(_percentile(values, 0.50) * 1000, 3),
+        "p99_ms": round(_percentile(values, 0.99) * 1000, 3),
+        "mean_ms": round(total / len(values) * 1000, 3),
+        "ops_per_s": round(len(values) / total, 1) if total else None,
+    }
+
+
+def peak_rss_mb(children: bool = False) -> Optional[float]:
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(usage.ru_maxrss / scale, 1)
+
+
+def workload(names: list[str], iterations: int, seed: int = 7) -> list[tuple[str, dict]]:
+    """Tool calls per tool (name, arguments), iterations of each."""
+    rng = random.Random(seed)
+    queries = ["invoice", "messageLogFactory", "XmlSlurper", "order customer", "setHeader", "LogFact", "payment tax"]
+    calls = []
+    for i in range(iterations):
+        a, b = rng.sample(names, 2)
+        batch = rng.sample(names, min(10, len(names)))
+        calls += [
+            ("list_examples", {}),
+            ("list_examples:json", {"format": "json", "fields": ["name", "tags"]}),
+            ("get_example", {"example_name": a}),
+            ("search_examples", {"query": queries[i % len(queries)]}),
+            ("analyze_script", {"example_name": a}),
+            ("compare_examples", {"example1": a, "example2": b}),
+            ("find_similar", {"example_name": a}),
+            ("query_examples", {"all": [f"tag:{TAGS[i % len(TAGS)]}", "input:xml"], "none": ["api:getMessageLog"]}),
+            ("find_usages", {"symbol": "MessageLog#setStringProperty"}),
+            ("list_symbols", {"prefix": "com.sap."}),
+            ("read_fixture", {"example_name": a, "file": "input.body.xml", "mode": "xpath", "xpath": "//Value"}),
+            ("get_examples_batch", {"names": batch}),
+            ("analyze_scripts_batch", {"names": batch}),
+        ]
+    return calls
+
+
+def _tool_name(label: str) -> str:
+    return label.split(":", 1)[0]
+
+
+async def _drive(call, calls: list[tuple[str, dict]], warmup: int) -> dict:
+    timings: dict[str, list[float]] = {}
+    firsts: dict[str, float] = {}
+    started = time.perf_counter()
+    for label, arguments in calls:
+        t0 = time.perf_counter()
+        await call(_tool_name(label), arguments)
+        elapsed = time.perf_counter() - t0
+        if label not in firsts:
+            firsts[label] = elapsed
+        timings.setdefault(label, []).append(elapsed)
+    wall = time.perf_counter() - started
+    tools = {
+        label: summarize_timings(values[warmup:] or values, firsts[label])
+        for label, values in timings.items()
+    }
+    return {"tools": tools, "wall_s": round(wall, 3), "calls_per_s": round(len(calls) / wall, 1)}
+
+
+async def run_inprocess(corpus: Path, iterations: int, warmup: int) -> dict:
+    """Drive the tools by calling the server object directly."""
+    sys.path.insert(0, str(HERE))
+    from mcp_server import SAPGroovyMCPServer
+
+    cache = corpus / ".cache" / "catalog.sqlite"
+    t0 = time.perf_counter()
+    server = SAPGroovyMCPServer(corpus, cache)
+    cold = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    SAPGroovyMCPServer(corpus, cache).io.close()
+    warm = time.perf_counter() - t0
+
+    names = server.catalog.names()
+    try:
+        result = await _drive(server.call_tool, workload(names, iterations), warmup)
+        t0 = time.perf_counter()
+        cursor = None
+        while True:
+            cursor = server.list_resources_page(cursor).nextCursor
+            if cursor is None:
+                break
+        elapsed = time.perf_counter() - t0
+        result["tools"]["resources/list:all-pages"] = summarize_timings([elapsed], elapsed)
+    finally:
+        server.io.close()
+    result.update(startup_cold_s=round(cold, 3), startup_warm_s=round(warm, 3), peak_rss_mb=peak_rss_mb())
+    return result
+
+
+async def run_stdio(corpus: Path, iterations: int, warmup: int) -> dict:
+    """Drive the tools through a real MCP client session over stdio."""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    env = dict(os.environ, SAP_GROOVY_MCP_EXAMPLES_DIR=str(corpus))
+    params = StdioServerParameters(command=sys.executable, args=[str(HERE / "mcp_server.py")], env=env)
+    names = sorted(p.name for p in corpus.iterdir() if (p / "script.groovy").exists())
+
+    t0 = time.perf_counter()
+    with open(os.devnull, "w") as errlog:
+        async with stdio_client(params, errlog=errlog) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                startup = time.perf_counter() - t0
+
+                async def call(name: str, arguments: dict):
+                    result = await session.call_tool(name, arguments)
+                    if result.isError:
+                        raise RuntimeError(f"{name} failed: {result.content[0].text}")
+                    return result
+
+                result = await _drive(call, workload(names, iterations), warmup)
+                t0 = time.perf_counter()
+                cursor = None
+                while True:
+                    page = await session.list_resources(cursor)
+                    cursor = page.nextCursor
+                    if cursor is None:
+                        break
+                elapsed = time.perf_counter() - t0
+                result["tools"]["resources/list:all-pages"] = summarize_timings([elapsed], elapsed)
+    result.update(startup_s=round(startup, 3), server_peak_rss_mb=peak_rss_mb(children=True))
+    return result
+
+
+def _isolated(mode: str, corpus: Path, iterations: int, warmup: int) -> dict:
+    """Run one mode in a fresh interpreter so peak RSS is per corpus size."""
+    output = subprocess.run(
+        [sys.executable, __file__, "--worker", mode, "--corpus", str(corpus),
+         "--iterations", str(iterations), "--warmup", str(warmup)],
+        check=True, stdout=subprocess.PIPE, text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline: dict, current: dict, max_regression: Optional[float]) -> int:
+    """Print p50 changes against a baseline; non-zero if any exceeds max_regression."""
+    failed = 0
+    for size, modes in current["runs"].items():
+        for mode, result in modes.items():
+            old_tools = baseline.get("runs", {}).get(size, {}).get(mode, {}).get("tools", {})
+            for label, stats in result["tools"].items():
+                old = old_tools.get(label)
+                if not old or not old["p50_ms"]:
+                    continue
+                change = stats["p50_ms"] / old["p50_ms"] - 1
+                flag = ""
+                if max_regression is not None and change > max_regression:
+                    flag = "  REGRESSION"
+                    failed += 1
+                print(f"{size:>6} {mode:9} {label:28} {old['p50_ms']:10.3f} -> {stats['p50_ms']:10.3f} ms "
+                      f"({change:+.0%}){flag}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the SAP Groovy MCP server on synthetic corpora")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000], help="corpus sizes (examples)")
+    parser.add_argument("--modes", nargs="+", choices=["inprocess", "stdio"], default=["inprocess", "stdio"])
+    parser.add_argument("--iterations", type=int, default=20, help="calls per tool")
+    parser.add_argument("--warmup", type=int, default=2, help="calls per tool excluded from the statistics")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--corpus-dir", type=Path, help="keep generated corpora here instead of a temp dir")
+    parser.add_argument("--output", type=Path, help="write JSON results to this file (default stdout)")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare p50 latencies with")
+    parser.add_argument("--max-regression", type=float, help="fail if a p50 grows by more than this fraction")
+    parser.add_argument("--worker", choices=["inprocess", "stdio"], help=argparse.SUPPRESS)
+    parser.add_argument("--corpus", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run = run_inprocess if args.worker == "inprocess" else run_stdio
+        print(json.dumps(asyncio.run(run(args.corpus, args.iterations, args.warmup))))
+        return 0
+
+    root = args.corpus_dir or Path(tempfile.mkdtemp(prefix="sap-groovy-bench-"))
+    report = {
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "iterations": args.iterations,
+        "runs": {},
+    }
+    try:
+        for size in args.sizes:
+            corpus = root / f"corpus-{size}"
+            if not corpus.exists():
+                t0 = time.perf_counter()
+                generate_corpus(corpus, size, args.seed)
+                print(f"Generated {size} examples in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+            runs = report["runs"][str(size)] = {}
+            for mode in args.modes:
+                # Every mode starts from an empty index cache
+                shutil.rmtree(corpus / ".cache", ignore_errors=True)
+                print(f"Running {mode} on {size} examples...", file=sys.stderr)
+                runs[mode] = _isolated(mode, corpus, args.iterations, args.warmup)
+    finally:
+        if args.corpus_dir is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if args.compare:
+        return compare(json.loads(args.compare.read_text(encoding="utf-8")), report, args.max_regression)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
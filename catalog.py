@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+In-memory catalog of SAP CPI Groovy examples.
+
+The catalog loads every example folder (scripts, README, metadata and fixture
+file lists) once and afterwards refreshes only the folders whose files changed,
+detected by polling file modification times and sizes. A tag -> examples index
+is built on first use and dropped whenever an example changes.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Optional
+
+import yaml
+
+from metadata import Metadata, parse_metadata
+from metrics import note_file_read
+
+if TYPE_CHECKING:
+    from index_cache import CatalogCache
+
+logger = logging.getLogger("sap-groovy-mcp")
+
+# Files that describe an example rather than being one of its fixtures
+NON_FIXTURE_SUFFIXES = {".groovy", ".md", ".yaml"}
+
+# Separates a root's namespace from the example name ("team:csv-split")
+NAMESPACE_SEP = ":"
+
+
+@dataclass(slots=True)
+class Example:
+    """A single example folder held in memory."""
+
+    name: str
+    path: Path
+    scripts: dict[str, str]
+    readme: Optional[str] = None
+    meta_text: Optional[str] = None
+    metadata: Metadata = field(default_factory=Metadata)
+    files: list[str] = field(default_factory=list)
+    signature: tuple = ()
+    hashes: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def fixtures(self) -> list[str]:
+        """Input/expected files shipped with the example."""
+        return [f for f in self.files if Path(f).suffix not in NON_FIXTURE_SUFFIXES]
+
+    @property
+    def script_name(self) -> str:
+        """Name of the main script (script.groovy, else the first *.groovy)."""
+        if "script.groovy" in self.scripts:
+            return "script.groovy"
+        return next(iter(self.scripts))
+
+    @property
+    def script(self) -> str:
+        """Content of the main script."""
+        return self.scripts[self.script_name]
+
+    @property
+    def description(self) -> str:
+        """First line of the README without the markdown heading marker."""
+        if not self.readme:
+            return ""
+        return self.readme.split("\n")[0].lstrip("# ").strip()
+
+    @property
+    def author(self) -> str:
+        return self.metadata.author or "Unknown"
+
+    @property
+    def tags(self) -> tuple[str, ...]:
+        return self.metadata.tags
+
+
+def is_indexed_file(file_name: str) -> bool:
+    """Whether a file is read into memory (scripts, README and metadata)."""
+    return file_name.endswith(".groovy") or file_name in ("README.md", "meta.yaml")
+
+
+def _read_file(path: Path) -> bytes:
+    data = path.read_bytes()
+    note_file_read(len(data))
+    return data
+
+
+def scan_signature(example_dir: Path) -> Optional[tuple]:
+    """Return a cheap (name, mtime, size) signature of a folder's files.
+
+    Only ``stat`` calls are made, so this is safe to run on every poll.
+    Returns None when the folder is not an example (no Groovy script).
+    """
+    try:
+        entries = sorted(os.scandir(example_dir), key=lambda e: e.name)
+    except OSError:
+        return None
+    signature = []
+    has_script = False
+    for entry in entries:
+        try:
+            if not entry.is_file():
+                continue
+            st = entry.stat()
+        except OSError:
+            continue
+        if entry.name.endswith(".groovy"):
+            has_script = True
+        signature.append((entry.name, st.st_mtime_ns, st.st_size))
+    if not has_script:
+        return None
+    return tuple(signature)
+
+
+def make_example(name: str, path: Path, signature: tuple, read: Callable[[str], bytes]) -> Example:
+    """Build an Example from a file signature, reading its text files through ``read``."""
+    files = [file_name for file_name, _, _ in signature]
+    hashes = {}
+    texts = {}
+    for file_name in files:
+        if is_indexed_file(file_name):
+            data = read(file_name)
+            hashes[file_name] = hashlib.sha1(data).hexdigest()
+            texts[file_name] = data.decode("utf-8", errors="replace")
+
+    metadata = Metadata()
+    meta_text = texts.get("meta.yaml")
+    if meta_text is not None:
+        try:
+            metadata = parse_metadata(meta_text, name)
+        except (yaml.YAMLError, ValueError) as e:
+            logger.warning(f"Invalid metadata for {name}: {e}")
+
+    return Example(
+        name=name,
+        path=path,
+        scripts={f: text for f, text in texts.items() if f.endswith(".groovy")},
+        readme=texts.get("README.md"),
+        meta_text=meta_text,
+        metadata=metadata,
+        files=files,
+        signature=signature,
+        hashes=hashes,
+    )
+
+
+def content_changed(previous: Optional[Example], example: Example) -> bool:
+    """Whether a re-read example differs from its previous record.
+
+    Scripts, README and metadata are compared by hash, so touching them with
+    identical content is not a change; fixtures are not read into memory and
+    count as changed when their size or modification time does.
+    """
+    if previous is None or previous.hashes != example.hashes or previous.files != example.files:
+        return True
+    return _fixture_stamps(previous) != _fixture_stamps(example)
+
+
+def _fixture_stamps(example: Example) -> list[tuple]:
+    return [entry for entry in example.signature if not is_indexed_file(entry[0])]
+
+
+def load_example(
+    example_dir: Path,
+    signature: Optional[tuple] = None,
+    name: Optional[str] = None,
+) -> Optional[Example]:
+    """Read one example folder into an Example record (named after the folder by default)."""
+    if signature is None:
+        signature = scan_signature(example_dir)
+    if signature is None:
+        return None
+    return make_example(name or example_dir.name, example_dir, signature,
+                        lambda file_name: _read_file(example_dir / file_name))
+
+
+class ExampleCatalog:
+    """All examples below a base directory, kept in memory.
+
+    With a namespace, example names are prefixed with ``namespace:`` so the
+    catalog can be federated with others (see ``federation``).
+    """
+
+    def __init__(self, base_dir: Path, cache: Optional["CatalogCache"] = None, namespace: str = ""):
+        self.base_dir = Path(base_dir).resolve()
+        self.cache = cache
+        self.namespace = namespace
+        self.prefix = f"{namespace}{NAMESPACE_SEP}" if namespace else ""
+        self._examples: dict[str, Example] = {}
+        self._tags: Optional[dict[str, list[str]]] = None
+        self._listeners: list[Callable[[set[str]], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._examples)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._examples
+
+    def names(self) -> list[str]:
+        """Sorted example names."""
+        return sorted(self._examples)
+
+    def examples(self) -> list[Example]:
+        """Examples sorted by name."""
+        return [self._examples[name] for name in self.names()]
+
+    def _tag_index(self) -> dict[str, list[str]]:
+        tags = self._tags
+        if tags is None:
+            examples = self._examples
+            tags = {}
+            for name in sorted(examples):
+                for tag in examples[name].tags:
+                    tags.setdefault(tag, []).append(name)
+            # A refresh may have replaced the examples while this one was built
+            if self._examples is examples:
+                self._tags = tags
+        return tags
+
+    def tagged(self, tag: str) -> list[Example]:
+        """Examples with a tag, sorted by name."""
+        return [self._examples[name] for name in self._tag_index().get(tag, ()) if name in self._examples]
+
+    def tag_counts(self) -> dict[str, int]:
+        """Number of examples per tag."""
+        return {tag: len(names) for tag, names in self._tag_index().items()}
+
+    def _install(self, examples: dict[str, Example]) -> None:
+        previous = self._examples
+        self._examples = examples
+        if examples.keys() != previous.keys() or any(previous[name] is not ex for name, ex in examples.items()):
+            self._tags = None
+
+    def get(self, name: str) -> Example:
+        """Return an example or raise ValueError if it does not exist."""
+        example = self.find(name)
+        if example is None:
+            raise ValueError(f"Example not found: {name}")
+        return example
+
+    def find(self, name: str) -> Optional[Example]:
+        """Return an example or None if it does not exist."""
+        return self._examples.get(name)
+
+    def ensure_local(self, example: Example) -> Path:
+        """Folder holding the example's files on the local file system."""
+        return example.path
+
+    def add_listener(self, callback: Callable[[set[str]], None]) -> None:
+        """Register a callback invoked with the names of changed examples."""
+        self._listeners.append(callback)
+
+    def _candidate_dirs(self) -> list[Path]:
+        try:
+            entries = list(os.scandir(self.base_dir))
+        except OSError as e:
+            logger.warning(f"Cannot scan {self.base_dir}: {e}")
+            return []
+        return [
+            Path(entry.path)
+            for entry in entries
+            if entry.is_dir() and not entry.name.startswith((".", "__"))
+        ]
+
+    def _sync(self, known: dict[str, Example]) -> tuple[dict[str, Example], set[str], list[Example]]:
+        """Compare known records with the disk.
+
+        Returns the up-to-date examples, the names whose content changed and
+        the records that were re-read (and should be written to the cache).
+        """
+        examples = {}
+        changed = set()
+        reread = []
+        for example_dir in self._candidate_dirs():
+            name = self.prefix + example_dir.name
+            signature = scan_signature(example_dir)
+            if signature is None:
+                continue
+            current = known.get(name)
+            if current is not None and current.signature == signature:
+                examples[name] = current
+                continue
+            example = load_example(example_dir, signature, name)
+            if example is None:
+                continue
+            examples[name] = example
+            reread.append(example)
+            if content_changed(current, example):
+                changed.add(name)
+        changed.update(set(known) - set(examples))
+        return examples, changed, reread
+
+    def load(self) -> None:
+        """Load every example, reusing cached records whose files are unchanged."""
+        cached = self.cache.load(self.base_dir, self.prefix) if self.cache is not None else {}
+        examples, _, reread = self._sync(cached)
+        self._install(examples)
+        if self.cache is not None and (reread or set(cached) - set(examples)):
+            self.cache.save(reread, set(cached) - set(examples))
+        logger.info(
+            f"Loaded {len(examples)} examples from {self.base_dir} "
+            f"({len(examples) - len(reread)} from cache)"
+        )
+
+    def scan(self) -> tuple[dict[str, Example], set[str]]:
+        """Read changes from disk without touching the live catalog.
+
+        Safe to call from a worker thread; pass the result to ``apply``.
+        """
+        previous = self._examples
+        examples, changed, reread = self._sync(previous)
+        if self.cache is not None and (reread or set(previous) - set(examples)):
+            self.cache.save(reread, set(previous) - set(examples))
+        return examples, changed
+
+    def apply(self, examples: dict[str, Example], changed: set[str]) -> set[str]:
+        """Install the result of ``scan`` and notify listeners of changed examples."""
+        self._install(examples)
+        if changed:
+            logger.info(f"Catalog refreshed: {', '.join(sorted(changed))}")
+            self._notify(changed)
+        return changed
+
+    def _notify(self, changed: set[str]) -> None:
+        for callback in self._listeners:
+            callback(changed)
+
+    def refresh(self) -> set[str]:
+        """Reload only folders that were added, changed or removed.
+
+        Returns the names of the examples that changed and notifies listeners.
+        """
+        return self.apply(*self.scan())
+
+    async def watch(self, interval: float = 2.0, run: Optional[Callable] = None) -> None:
+        """Poll the base directory forever, refreshing changed examples.
+
+        ``run`` is an awaitable executor (e.g. ``AsyncFileAccess.run``) used to
+        scan the disk off the event loop; listeners are always notified on the
+        loop itself.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if run is None:
+                    self.refresh()
+                else:
+                    self.apply(*await run(self.scan))
+            except Exception as e:
+                logger.warning(f"Catalog refresh failed: {e!r}")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Size-bounded LRU cache keyed by content hashes.
+
+Analysis results (parsed summaries, lint findings, diffs) depend only on the
+script text, so they are cached under the hash of that text and shared by
+every tool, whether the script comes from the catalog or is pasted inline.
+Rendered tool responses are cached the same way under the content hashes of
+the examples they were rendered from.
+Entries are weighed by the size of the source they were computed from (or of
+the value itself) and the least recently used ones are evicted once the total
+exceeds the budget, so a few huge scripts cannot crowd the cache more than
+their share.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar, Union
+
+T = TypeVar("T")
+
+
+class ContentCache(Generic[T]):
+    """Thread-safe LRU of computed values with a byte budget."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, tuple[T, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        weight: Union[int, Callable[[T], int]],
+        compute: Callable[[], T],
+    ) -> T:
+        """Return the cached value for key, computing and storing it on a miss.
+
+        ``weight`` is a byte count, or a function weighing the computed value.
+        ``compute`` runs outside the lock, so two threads missing the same key
+        at once may both compute it; the results are identical.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[0]
+            self.misses += 1
+        value = compute()
+        if callable(weight):
+            weight = weight(value)
+        if weight > self.max_bytes:
+            # Larger than the whole budget: return it without caching
+            return value
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, weight)
+            self._bytes += weight
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def info(self) -> dict:
+        """Hit/miss counters, entry count and bytes held against the budget."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": None,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Bitmap indexes of example facets for boolean queries.
+
+Every example gets a bit position; every facet value (a tag, an imported
+class, an SAP API method, an input body format, ...) keeps a bitmap of the
+examples that have it. Bitmaps are plain Python integers, so AND/OR/NOT over
+tens of thousands of examples are a handful of word operations, and facet
+counts are ``int.bit_count`` of an intersection. Positions freed by removed
+examples are reused, keeping the bitmaps as short as the catalog.
+
+Facet values come from the metadata, the fixture file names and the cached
+Groovy parse, so comments and strings do not count.
+"""
+
+from typing import Iterable, Optional
+
+from catalog import Example
+from groovy_parser import summarize
+
+FACETS = {
+    "tag": "metadata tag",
+    "complexity": "metadata complexity",
+    "adapter": "adapter listed in the metadata",
+    "import": "imported class (`*` matches a package prefix)",
+    "api": "SAP API method called (getBody, getMessageLog, ...)",
+    "input": "input body format (xml, csv, json, base64, ...)",
+    "expected": "has expected.* fixtures (yes/no)",
+}
+
+
+def input_format(file_name: str) -> Optional[str]:
+    """Body format of an input.body.* fixture name (base64 for *.base64.txt)."""
+    if not file_name.startswith("input.body."):
+        return None
+    suffix = file_name[len("input.body."):].lower()
+    return "base64" if suffix.endswith("base64.txt") else suffix.rsplit(".", 1)[-1]
+
+
+def example_terms(example: Example) -> set[tuple[str, str]]:
+    """(facet, value) pairs describing an example."""
+    terms = {("tag", tag) for tag in example.tags}
+    terms.update(("adapter", adapter) for adapter in example.metadata.adapters)
+    if example.metadata.complexity:
+        terms.add(("complexity", example.metadata.complexity))
+    for source in example.scripts.values():
+        summary = summarize(source)
+        terms.update(("import", imp.name) for imp in summary.imports if not imp.static)
+        terms.update(("api", call.method) for call in summary.sap_calls)
+    has_expected = False
+    for file_name in example.fixtures:
+        fmt = input_format(file_name)
+        if fmt:
+            terms.add(("input", fmt))
+        has_expected = has_expected or file_name.startswith("expected.")
+    terms.add(("expected", "yes" if has_expected else "no"))
+    return terms
+
+
+def parse_term(term: str) -> tuple[str, str]:
+    """Split ``facet:value``; raises ValueError for unknown facets."""
+    facet, sep, value = term.partition(":")
+    facet = facet.strip()
+    value = value.strip()
+    if not sep or not value:
+        raise ValueError(f"Expected facet:value, got '{term}'")
+    if facet not in FACETS:
+        raise ValueError(f"Unknown facet: {facet} (available: {', '.join(FACETS)})")
+    if facet == "api" and not value.endswith("*"):
+        # message.getBody and getBody name the same API
+        value = value.rsplit(".", 1)[-1]
+    return facet, value
+
+
+class FacetIndex:
+    """Per-facet bitmaps over the examples of a catalog."""
+
+    def __init__(self):
+        self._names: list[Optional[str]] = []
+        self._positions: dict[str, int] = {}
+        self._free: list[int] = []
+        self._terms: dict[str, set[tuple[str, str]]] = {}
+        self._bitmaps: dict[str, dict[str, int]] = {facet: {} for facet in FACETS}
+        self._all = 0
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def build(self, examples: Iterable[Example]) -> None:
+        self.__init__()
+        for example in examples:
+            self._add(example.name, example_terms(example))
+
+    def update(self, examples: dict[str, Optional[Example]]) -> None:
+        """Apply catalog changes: a None value removes the example."""
+        for name, example in examples.items():
+            self._remove(name)
+            if example is not None:
+                self._add(name, example_terms(example))
+
+    def _add(self, name: str, terms: set[tuple[str, str]]) -> None:
+        if self._free:
+            position = self._free.pop()
+            self._names[position] = name
+        else:
+            position = len(self._names)
+            self._names.append(name)
+        self._positions[name] = position
+        self._terms[name] = terms
+        bit = 1 << position
+        self._all |= bit
+        for facet, value in terms:
+            values = self._bitmaps[facet]
+            values[value] = values.get(value, 0) | bit
+
+    def _remove(self, name: str) -> None:
+        position = self._positions.pop(name, None)
+        if position is None:
+            return
+        bit = 1 << position
+        self._all &= ~bit
+        for facet, value in self._terms.pop(name):
+            values = self._bitmaps[facet]
+            values[value] &= ~bit
+            if not values[value]:
+                del values[value]
+        self._names[position] = None
+        self._free.append(position)
+
+    def bitmap(self, term: str) -> int:
+        """Examples matching one ``facet:value`` term; a trailing ``*`` matches a prefix."""
+        facet, value = parse_term(term)
+        values = self._bitmaps[facet]
+        if not value.endswith("*"):
+            return values.get(value, 0)
+        prefix = value[:-1]
+        bits = 0
+        for candidate, candidate_bits in values.items():
+            if candidate.startswith(prefix):
+                bits |= candidate_bits
+        return bits
+
+    def query(
+        self,
+        all_of: Iterable[str] = (),
+        any_of: Iterable[str] = (),
+        none_of: Iterable[str] = (),
+        within: Optional[Iterable[str]] = None,
+    ) -> int:
+        """Bitmap of the examples matching every ``all_of`` term, at least one
+        ``any_of`` term (if given) and no ``none_of`` term, optionally limited
+        to the named examples."""
+        bits = self._all
+        if within is not None:
+            bits = 0
+            for name in within:
+                position = self._positions.get(name)
+                if position is not None:
+                    bits |= 1 << position
+        for term in all_of:
+            bits &= self.bitmap(term)
+        any_of = list(any_of)
+        if any_of:
+            union = 0
+            for term in any_of:
+                union |= self.bitmap(term)
+            bits &= union
+        for term in none_of:
+            bits &= ~self.bitmap(term)
+        return bits
+
+    def names(self, bits: int) -> list[str]:
+        """Sorted example names of a bitmap."""
+        # One pass over the binary digits instead of peeling bits off a big int
+        digits = bin(bits)[:1:-1]
+        return sorted(self._names[position] for position, digit in enumerate(digits) if digit == "1")
+
+    def counts(self, bits: int, facets: Optional[Iterable[str]] = None, top: int = 10) -> dict[str, list[tuple[str, int]]]:
+        """Most frequent values of each facet among the examples of a bitmap."""
+        result = {}
+        for facet in facets or FACETS:
+            if facet not in FACETS:
+                raise ValueError(f"Unknown facet: {facet} (available: {', '.join(FACETS)})")
+            counted = []
+            for value, value_bits in self._bitmaps[facet].items():
+                count = (value_bits & bits).bit_count()
+                if count:
+                    counted.append((value, count))
+            counted.sort(key=lambda item: (-item[1], item[0]))
+            result[facet] = counted[:top]
+        return result
@@ -0,0 +1,553 @@
+#!/usr/bin/env python3
+"""
+Federation of several example roots into one catalog.
+
+Besides the examples directory, the server can serve examples from further
+roots, each under its own namespace (``team:csv-split``):
+
+- directories laid out like the examples directory,
+- zip and tar archives, read in place without unpacking,
+- git repositories, read from the object database at a ref (``git ls-tree``
+  and ``git cat-file``, which read loose objects and packfiles alike), so
+  neither a checkout nor a working tree is needed.
+
+Every root keeps its own catalog and search index; listings and searches
+merge them at query time. Roots marked ``lazy`` are not read at startup but
+the first time a query needs them. Files of archive and git examples are
+only written to disk when something needs them there (fixture reads and
+script runs), one example at a time.
+
+Roots are configured in a YAML file named by ``SAP_GROOVY_MCP_ROOTS``:
+
+    roots:
+      - name: team
+        path: /srv/team-examples
+      - name: vendor
+        path: /srv/vendor-examples.zip
+        lazy: true
+      - name: upstream
+        git: /srv/mirrors/cpi-groovy-examples.git
+        ref: main
+        lazy: true
+"""
+
+import asyncio
+import hashlib
+import heapq
+import logging
+import os
+import posixpath
+import re
+import shutil
+import subprocess
+import tarfile
+import threading
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import yaml
+
+from catalog import NAMESPACE_SEP, Example, ExampleCatalog, content_changed, is_indexed_file, make_example
+from index_cache import CatalogCache
+from metrics import note_file_read
+from search_index import SearchHit, SearchIndex
+
+logger = logging.getLogger("sap-groovy-mcp")
+
+# Name under which the examples directory itself can be selected as a root
+DEFAULT_ROOT = "local"
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+_ROOT_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+@dataclass
+class RootSpec:
+    """One configured root."""
+
+    name: str
+    location: Path
+    kind: str  # "directory", "archive" or "git"
+    ref: str = "HEAD"
+    lazy: bool = False
+
+
+def load_roots(config: Path) -> list[RootSpec]:
+    """Read root definitions from a YAML file; relative paths are resolved against its folder."""
+    config = Path(config)
+    try:
+        data = yaml.safe_load(config.read_text(encoding="utf-8")) or {}
+    except (OSError, yaml.YAMLError) as e:
+        raise ValueError(f"Cannot read roots file {config}: {e}")
+
+    specs = []
+    for entry in data.get("roots") or []:
+        if not isinstance(entry, dict) or not entry.get("name"):
+            raise ValueError(f"Every root in {config} needs a name")
+        name = str(entry["name"])
+        if "git" in entry:
+            kind, location = "git", str(entry["git"])
+        elif "path" in entry:
+            location = str(entry["path"])
+            kind = "archive" if location.lower().endswith(ARCHIVE_SUFFIXES) else "directory"
+        else:
+            raise ValueError(f"Root {name} needs 'path' or 'git'")
+        specs.append(RootSpec(
+            name=name,
+            location=(config.parent / Path(location).expanduser()).resolve(),
+            kind=kind,
+            ref=str(entry.get("ref", "HEAD")),
+            lazy=bool(entry.get("lazy", False)),
+        ))
+    check_roots(specs)
+    return specs
+
+
+def check_roots(specs: list[RootSpec]) -> None:
+    """Raise ValueError for invalid or duplicate root names."""
+    seen = set()
+    for spec in specs:
+        if not _ROOT_NAME_RE.match(spec.name) or spec.name == DEFAULT_ROOT:
+            raise ValueError(f"Invalid root name: {spec.name}")
+        if spec.name in seen:
+            raise ValueError(f"Duplicate root name: {spec.name}")
+        seen.add(spec.name)
+
+
+def _group_entries(entries: Iterable[tuple[str, object, int, object]]) -> dict[str, dict[str, tuple]]:
+    """Group (path, version, size, locator) entries into example folders.
+
+    Only files directly inside a top-level folder belong to an example, as
+    in the examples directory. A single folder wrapping the whole archive
+    (as in GitHub downloads) is skipped.
+    """
+    entries = [
+        (posixpath.normpath(path.lstrip("/")).split("/"), version, size, locator)
+        for path, version, size, locator in entries
+    ]
+    tops = {parts[0] for parts, _, _, _ in entries}
+    wrapped = (
+        len(tops) == 1
+        and all(len(parts) > 2 for parts, _, _, _ in entries if parts[-1].endswith(".groovy"))
+        and all(len(parts) > 1 for parts, _, _, _ in entries)
+    )
+    grouped: dict[str, dict[str, tuple]] = {}
+    for parts, version, size, locator in entries:
+        if wrapped:
+            parts = parts[1:]
+        if len(parts) == 2:
+            grouped.setdefault(parts[0], {})[parts[1]] = (version, size, locator)
+    return grouped
+
+
+class PackedCatalog(ExampleCatalog):
+    """Examples read from a single packed source instead of folders.
+
+    Subclasses list and read the source's files. Example paths point into
+    ``extract_dir``, where ``ensure_local`` writes an example's files when
+    they are first needed on disk.
+    """
+
+    def __init__(self, source: Path, namespace: str, extract_dir: Path):
+        super().__init__(source, None, namespace)
+        self.extract_dir = Path(extract_dir) / namespace
+        self._stamp = None
+        self._locators: dict[str, dict[str, object]] = {}
+        self._extract_lock = threading.Lock()
+
+    def _source_stamp(self) -> object:
+        """Cheap value that changes whenever the source changes."""
+        raise NotImplementedError
+
+    def _entries(self, stamp: object) -> list[tuple[str, object, int, object]]:
+        """All files of the source as (path, version, size, locator)."""
+        raise NotImplementedError
+
+    def _read(self, locators: list) -> dict[object, bytes]:
+        """Contents of the given files."""
+        raise NotImplementedError
+
+    def _extract(self, locators: dict[str, object], target: Path) -> None:
+        """Write the given files (name -> locator) into target."""
+        raise NotImplementedError
+
+    def _sync(self, known: dict[str, Example]) -> tuple[dict[str, Example], set[str], list[Example]]:
+        try:
+            stamp = self._source_stamp()
+            if stamp == self._stamp and known is self._examples:
+                return known, set(), []
+            listing = _group_entries(self._entries(stamp))
+        except OSError as e:
+            logger.warning(f"Cannot read {self.base_dir}: {e}")
+            stamp, listing = None, {}
+
+        examples = {}
+        locators = {}
+        stale = []
+        for folder, files in sorted(listing.items()):
+            if folder.startswith((".", "__")) or not any(f.endswith(".groovy") for f in files):
+                continue
+            name = self.prefix + folder
+            signature = tuple((f, version, size) for f, (version, size, _) in sorted(files.items()))
+            locators[name] = {f: locator for f, (_, _, locator) in files.items()}
+            current = known.get(name)
+            if current is not None and current.signature == signature:
+                examples[name] = current
+            else:
+                stale.append((folder, name, signature))
+
+        # One read for all stale examples; for git this is a single process
+        wanted = [
+            locators[name][f] for _, name, signature in stale for f, _, _ in signature if is_indexed_file(f)
+        ]
+        try:
+            contents = self._read(wanted) if wanted else {}
+        except OSError as e:
+            logger.warning(f"Cannot read {self.base_dir}: {e}")
+            return known, set(), []
+
+        changed = set()
+        reread = []
+        for folder, name, signature in stale:
+            digest = hashlib.sha1(repr(signature).encode("utf-8")).hexdigest()[:12]
+            files = locators[name]
+            example = make_example(
+                name, self.extract_dir / f"{folder}-{digest}", signature, lambda f: contents[files[f]]
+            )
+            examples[name] = example
+            reread.append(example)
+            current = known.get(name)
+            if content_changed(current, example):
+                changed.add(name)
+        changed.update(set(known) - set(examples))
+        self._locators = locators
+        self._stamp = stamp
+        return examples, changed, reread
+
+    def ensure_local(self, example: Example) -> Path:
+        """Extract the example's files (once per content version) and return their folder."""
+        current = self.find(example.name)
+        if current is None:
+            raise ValueError(f"Example not found: {example.name}")
+        if current.path.is_dir():
+            return current.path
+        with self._extract_lock:
+            if current.path.is_dir():
+                return current.path
+            locators = self._locators[current.name]
+            tmp = current.path.with_name(f".{current.path.name}.{os.getpid()}.tmp")
+            shutil.rmtree(tmp, ignore_errors=True)
+            tmp.mkdir(parents=True)
+            try:
+                self._extract({f: locators[f] for f in current.files}, tmp)
+                tmp.rename(current.path)
+            except OSError:
+                shutil.rmtree(tmp, ignore_errors=True)
+                # Another process may have extracted the same version first
+                if not current.path.is_dir():
+                    raise
+        return current.path
+
+
+class ArchiveCatalog(PackedCatalog):
+    """Examples inside a zip or tar archive."""
+
+    def _is_zip(self) -> bool:
+        return self.base_dir.name.lower().endswith(".zip")
+
+    def _source_stamp(self) -> object:
+        st = self.base_dir.stat()
+        return st.st_mtime_ns, st.st_size
+
+    def _entries(self, stamp: object) -> list[tuple[str, object, int, object]]:
+        try:
+            if self._is_zip():
+                with zipfile.ZipFile(self.base_dir) as zf:
+                    return [(i.filename, i.CRC, i.file_size, i.filename) for i in zf.infolist() if not i.is_dir()]
+            with tarfile.open(self.base_dir) as tf:
+                return [(m.name, m.mtime, m.size, m.name) for m in tf if m.isfile()]
+        except (zipfile.BadZipFile, tarfile.TarError) as e:
+            raise OSError(f"Invalid archive: {e}")
+
+    def _read(self, locators: list) -> dict[object, bytes]:
+        contents = {}
+        if self._is_zip():
+            with zipfile.ZipFile(self.base_dir) as zf:
+                for member in locators:
+                    contents[member] = zf.read(member)
+                    note_file_read(len(contents[member]))
+        else:
+            with tarfile.open(self.base_dir) as tf:
+                for member in locators:
+                    contents[member] = tf.extractfile(member).read()
+                    note_file_read(len(contents[member]))
+        return contents
+
+    def _extract(self, locators: dict[str, object], target: Path) -> None:
+        if self._is_zip():
+            with zipfile.ZipFile(self.base_dir) as zf:
+                for file_name, member in locators.items():
+                    with zf.open(member) as src, open(target / file_name, "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+        else:
+            with tarfile.open(self.base_dir) as tf:
+                for file_name, member in locators.items():
+                    with tf.extractfile(member) as src, open(target / file_name, "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+
+
+class GitCatalog(PackedCatalog):
+    """Examples in a git repository at a ref, read without a checkout."""
+
+    def __init__(self, repo: Path, namespace: str, extract_dir: Path, ref: str = "HEAD"):
+        super().__init__(repo, namespace, extract_dir)
+        self.ref = ref
+
+    def _git(self, *args: str, data: Optional[bytes] = None) -> bytes:
+        try:
+            proc = subprocess.run(
+                ["git", "-C", str(self.base_dir), *args], input=data, capture_output=True, check=True
+            )
+        except subprocess.CalledProcessError as e:
+            raise OSError(f"git {args[0]} failed: {e.stderr.decode('utf-8', errors='replace').strip()}")
+        return proc.stdout
+
+    def _source_stamp(self) -> object:
+        return self._git("rev-parse", "--verify", f"{self.ref}^{{commit}}").decode("ascii").strip()
+
+    def _entries(self, stamp: object) -> list[tuple[str, object, int, object]]:
+        entries = []
+        for record in self._git("ls-tree", "-r", "-l", "-z", str(stamp)).split(b"\0"):
+            if not record:
+                continue
+            meta, path = record.split(b"\t", 1)
+            mode, kind, sha, size = meta.decode("ascii").split()
+            # Skip submodules and symlinks
+            if kind != "blob" or mode == "120000":
+                continue
+            entries.append((path.decode("utf-8", errors="replace"), sha, int(size), sha))
+        return entries
+
+    def _read(self, locators: list) -> dict[object, bytes]:
+        shas = list(dict.fromkeys(locators))
+        out = self._git("cat-file", "--batch", data="".join(f"{sha}\n" for sha in shas).encode("ascii"))
+        contents = {}
+        pos = 0
+        for sha in shas:
+            end = out.index(b"\n", pos)
+            header = out[pos:end].split()
+            if len(header) != 3:
+                raise OSError(f"git object {sha} is missing")
+            size = int(header[2])
+            contents[sha] = out[end + 1:end + 1 + size]
+            note_file_read(size)
+            pos = end + 1 + size + 1
+        return contents
+
+    def _extract(self, locators: dict[str, object], target: Path) -> None:
+        for file_name, sha in locators.items():
+            with open(target / file_name, "wb") as dst:
+                # Streams the blob straight into the file
+                subprocess.run(["git", "-C", str(self.base_dir), "cat-file", "blob", str(sha)],
+                               stdout=dst, stderr=subprocess.DEVNULL, check=True)
+
+
+def open_root(spec: RootSpec, work_dir: Path, cache: bool = False) -> ExampleCatalog:
+    """Catalog for one root; archive and git roots extract into work_dir, directory roots cache there."""
+    if spec.kind == "git":
+        return GitCatalog(spec.location, spec.name, work_dir, spec.ref)
+    if spec.kind == "archive":
+        return ArchiveCatalog(spec.location, spec.name, work_dir)
+    if spec.kind == "directory":
+        return ExampleCatalog(spec.location, CatalogCache(work_dir / f"{spec.name}.sqlite") if cache else None,
+                              spec.name)
+    raise ValueError(f"Unknown root kind: {spec.kind}")
+
+
+class FederatedCatalog(ExampleCatalog):
+    """The examples directory plus namespaced roots, queried as one catalog.
+
+    Lazy roots stay empty until ``ensure_loaded`` (or a lookup of one of
+    their names) loads them; listeners are then told about all their
+    examples as if they had just been added.
+    """
+
+    def __init__(
+        self,
+        default: ExampleCatalog,
+        specs: Iterable[RootSpec] = (),
+        work_dir: Optional[Path] = None,
+        cache: bool = False,
+    ):
+        super().__init__(default.base_dir, default.cache)
+        specs = list(specs)
+        check_roots(specs)
+        if specs and work_dir is None:
+            raise ValueError("Additional roots need a work directory")
+        self.specs = {spec.name: spec for spec in specs}
+        self.roots: dict[str, ExampleCatalog] = {"": default}
+        for spec in specs:
+            self.roots[spec.name] = open_root(spec, Path(work_dir), cache)
+        self.lazy = {spec.name for spec in specs if spec.lazy}
+        self._loading: dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return sum(len(root) for root in self.roots.values())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.roots[self.namespace_of(name)]
+
+    def namespace_of(self, name: str) -> str:
+        """Root namespace of an example name ("" for the examples directory)."""
+        namespace, sep, _ = name.partition(NAMESPACE_SEP)
+        return namespace if sep and namespace in self.roots else ""
+
+    def root(self, name: str) -> ExampleCatalog:
+        """Catalog of a root by name (DEFAULT_ROOT for the examples directory)."""
+        catalog = self.roots.get("" if name == DEFAULT_ROOT else name)
+        if catalog is None:
+            raise ValueError(f"Unknown root: {name} (available: {', '.join(self.root_names())})")
+        return catalog
+
+    def root_names(self) -> list[str]:
+        return [DEFAULT_ROOT, *self.specs]
+
+    def names(self) -> list[str]:
+        """Sorted example names of all loaded roots."""
+        return list(heapq.merge(*(root.names() for root in self.roots.values())))
+
+    def examples(self) -> list[Example]:
+        """Examples of all loaded roots, sorted by name."""
+        return list(heapq.merge(*(root.examples() for root in self.roots.values()), key=lambda ex: ex.name))
+
+    def tagged(self, tag: str) -> list[Example]:
+        """Examples of all loaded roots with a tag, sorted by name."""
+        return list(heapq.merge(*(root.tagged(tag) for root in self.roots.values()), key=lambda ex: ex.name))
+
+    def tag_counts(self) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        for root in self.roots.values():
+            for tag, count in root.tag_counts().items():
+                counts[tag] = counts.get(tag, 0) + count
+        return counts
+
+    def find(self, name: str) -> Optional[Example]:
+        namespace = self.namespace_of(name)
+        if namespace in self.lazy:
+            self.roots[namespace].load()
+            self._loaded(namespace)
+        return self.roots[namespace].find(name)
+
+    def ensure_local(self, example: Example) -> Path:
+        return self.roots[self.namespace_of(example.name)].ensure_local(example)
+
+    def load(self) -> None:
+        """Load every root that is not lazy."""
+        for namespace, root in self.roots.items():
+            if namespace not in self.lazy:
+                root.load()
+
+    def _loaded(self, namespace: str) -> None:
+        self.lazy.discard(namespace)
+        self._notify(set(self.roots[namespace].names()))
+
+    async def ensure_loaded(self, namespaces: Optional[Iterable[str]] = None, run: Optional[Callable] = None) -> None:
+        """Load the given lazy roots (all of them if None), off the event loop when ``run`` is given."""
+        pending = set(self.lazy) if namespaces is None else self.lazy.intersection(namespaces)
+        for namespace in sorted(pending):
+            task = self._loading.get(namespace)
+            if task is None:
+                task = self._loading[namespace] = asyncio.create_task(self._load_lazy(namespace, run))
+            # A cancelled caller does not abort a load other calls may be waiting for
+            await asyncio.shield(task)
+
+    async def _load_lazy(self, namespace: str, run: Optional[Callable]) -> None:
+        try:
+            if namespace not in self.lazy:
+                return
+            root = self.roots[namespace]
+            if run is None:
+                root.load()
+            else:
+                await run(root.load)
+            self._loaded(namespace)
+        finally:
+            self._loading.pop(namespace, None)
+
+    def scan(self) -> tuple[dict[str, dict[str, Example]], set[str]]:
+        """Scan every loaded root; pass the result to ``apply``."""
+        results = {}
+        changed = set()
+        for namespace, root in list(self.roots.items()):
+            if namespace in self.lazy:
+                continue
+            results[namespace], root_changed = root.scan()
+            changed |= root_changed
+        return results, changed
+
+    def apply(self, examples: dict[str, dict[str, Example]], changed: set[str]) -> set[str]:
+        for namespace, root_examples in examples.items():
+            self.roots[namespace].apply(root_examples, set())
+        if changed:
+            logger.info(f"Catalog refreshed: {', '.join(sorted(changed))}")
+            self._notify(changed)
+        return changed
+
+
+class MergedSearchIndex:
+    """One SearchIndex per root, merged at query time.
+
+    Scores are BM25 within each root; hits from different roots are ranked
+    by those scores side by side.
+    """
+
+    def __init__(self, namespace_of: Callable[[str], str]):
+        self.namespace_of = namespace_of
+        self.indexes: dict[str, SearchIndex] = {}
+
+    def __len__(self) -> int:
+        return sum(len(index) for index in self.indexes.values())
+
+    def _by_root(self, names: Iterable[str]) -> dict[str, list[str]]:
+        groups: dict[str, list[str]] = {}
+        for name in names:
+            groups.setdefault(self.namespace_of(name), []).append(name)
+        return groups
+
+    def build(self, examples: Iterable[Example]) -> None:
+        examples = {ex.name: ex for ex in examples}
+        self.indexes = {}
+        for namespace, names in self._by_root(examples).items():
+            index = self.indexes[namespace] = SearchIndex()
+            index.build(examples[name] for name in names)
+
+    def update(self, examples: dict[str, Optional[Example]]) -> None:
+        for namespace, names in self._by_root(examples).items():
+            index = self.indexes.get(namespace)
+            if index is None:
+                index = self.indexes[namespace] = SearchIndex()
+            index.update({name: examples[name] for name in names})
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        roots: Optional[Iterable[str]] = None,
+    ) -> tuple[int, list[SearchHit]]:
+        """Total matches and one page of hits across the selected roots (all if None)."""
+        selected = set(roots) if roots is not None else None
+        indexes = [index for ns, index in self.indexes.items() if selected is None or ns in selected]
+        if len(indexes) == 1:
+            return indexes[0].search(query, limit=limit, offset=offset)
+        total = 0
+        hits: list[SearchHit] = []
+        for index in indexes:
+            count, page = index.search(query, limit=offset + limit)
+            total += count
+            hits.extend(page)
+        hits.sort(key=lambda hit: (-hit.score, hit.name))
+        return total, hits[offset:offset + limit]
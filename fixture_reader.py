@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Paged access to example fixture files without loading them whole.
+
+Files are memory-mapped, so a byte or line range only touches the pages it
+covers. Line positions are remembered in a sparse per-file index, so paging
+deep into a large file does not rescan it from the start on every call. XML
+fixtures can be sliced by a small XPath subset while streaming through the
+document with ``iterparse``; elements outside the selection are discarded as
+soon as they end.
+"""
+
+import mmap
+import os
+import re
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from catalog import Example
+from metrics import note_file_read
+
+# A line offset is remembered every LINE_INDEX_STEP lines
+LINE_INDEX_STEP = 1024
+LINE_INDEX_CACHE_SIZE = 64
+
+
+@dataclass
+class FixtureSlice:
+    """A range read from a fixture file."""
+
+    data: bytes
+    start: int  # first byte offset or line number of the range
+    end: int  # offset or line number just after the range
+    size: int  # file size in bytes
+    more: bool  # True when the file continues after the range
+
+    @property
+    def binary(self) -> bool:
+        return b"\0" in self.data
+
+    @property
+    def text(self) -> str:
+        return self.data.decode("utf-8", errors="replace")
+
+
+def fixture_path(example: Example, file_name: str) -> Path:
+    """Path of a fixture of an example; only listed fixture files are served."""
+    if file_name not in example.fixtures:
+        raise ValueError(f"Fixture not found: {example.name}/{file_name}")
+    return example.path / file_name
+
+
+class _Mapped:
+    """Read-only memory map of a file (empty files cannot be mapped)."""
+
+    def __init__(self, path: Path):
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        self.view = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+
+    def __enter__(self) -> "_Mapped":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if isinstance(self.view, mmap.mmap):
+            self.view.close()
+        self._file.close()
+
+
+def read_bytes(path: Path, offset: int = 0, length: int = 65536) -> FixtureSlice:
+    """Bytes [offset, offset + length) of a file."""
+    if offset < 0 or length < 0:
+        raise ValueError("offset and length must not be negative")
+    with _Mapped(path) as mapped:
+        start = min(offset, mapped.size)
+        end = min(start + length, mapped.size)
+        note_file_read(end - start)
+        return FixtureSlice(bytes(mapped.view[start:end]), start, end, mapped.size, end < mapped.size)
+
+
+class _LineIndex:
+    """Byte offsets of every LINE_INDEX_STEP-th line, filled in as lines are visited."""
+
+    def __init__(self):
+        self.checkpoints = [0]  # checkpoints[i] = offset of line i * STEP + 1
+        self.lock = threading.Lock()
+
+
+_line_indexes: "OrderedDict[tuple, _LineIndex]" = OrderedDict()
+_line_indexes_lock = threading.Lock()
+_line_index_stats = {"hits": 0, "misses": 0}
+
+
+def line_index_cache_info() -> dict:
+    """Hit/miss counters and fill level of the line index cache."""
+    with _line_indexes_lock:
+        return dict(_line_index_stats, size=len(_line_indexes), max_size=LINE_INDEX_CACHE_SIZE)
+
+
+def _line_index(path: Path) -> _LineIndex:
+    stat = os.stat(path)
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+    with _line_indexes_lock:
+        index = _line_indexes.get(key)
+        if index is None:
+            _line_index_stats["misses"] += 1
+            index = _LineIndex()
+            _line_indexes[key] = index
+            while len(_line_indexes) > LINE_INDEX_CACHE_SIZE:
+                _line_indexes.popitem(last=False)
+        else:
+            _line_index_stats["hits"] += 1
+            _line_indexes.move_to_end(key)
+        return index
+
+
+def read_lines(path: Path, start_line: int = 1, count: int = 100, max_bytes: Optional[int] = None) -> FixtureSlice:
+    """Lines start_line .. start_line + count - 1 (1-based) of a file.
+
+    The range is cut short at a line boundary once it exceeds ``max_bytes``.
+    """
+    if start_line < 1 or count < 0:
+        raise ValueError("start_line must be at least 1 and count not negative")
+    index = _line_index(path)
+    with _Mapped(path) as mapped, index.lock:
+        view, size = mapped.view, mapped.size
+        # Jump to the nearest known checkpoint, then scan forward
+        slot = min((start_line - 1) // LINE_INDEX_STEP, len(index.checkpoints) - 1)
+        line, pos = slot * LINE_INDEX_STEP + 1, index.checkpoints[slot]
+        while line < start_line and pos < size:
+            pos = _next_line(view, pos, size)
+            line += 1
+            _remember(index, line, pos)
+        first, begin = line, pos
+        while line < start_line + count and pos < size:
+            nxt = _next_line(view, pos, size)
+            if max_bytes is not None and nxt - begin > max_bytes and line > first:
+                break
+            pos = nxt
+            line += 1
+            _remember(index, line, pos)
+        note_file_read(pos - begin)
+        return FixtureSlice(bytes(view[begin:pos]), first, line, size, pos < size)
+
+
+def _next_line(view, pos: int, size: int) -> int:
+    newline = view.find(b"\n", pos)
+    return size if newline < 0 else newline + 1
+
+
+def _remember(index: _LineIndex, line: int, pos: int) -> None:
+    if (line - 1) % LINE_INDEX_STEP == 0 and (line - 1) // LINE_INDEX_STEP == len(index.checkpoints):
+        index.checkpoints.append(pos)
+
+
+def head(path: Path, count: int = 20, max_bytes: Optional[int] = None) -> FixtureSlice:
+    """First count lines of a file."""
+    return read_lines(path, 1, count, max_bytes)
+
+
+def tail(path: Path, count: int = 20, max_bytes: Optional[int] = None) -> FixtureSlice:
+    """Last count lines of a file, found by scanning backwards from its end.
+
+    Line numbers are not known without a full scan, so start/end are byte
+    offsets here.
+    """
+    if count < 0:
+        raise ValueError("count must not be negative")
+    with _Mapped(path) as mapped:
+        view, size = mapped.view, mapped.size
+        end = size
+        # A final newline terminates the last line rather than starting a new one
+        pos = size - 1 if size and view[size - 1:size] == b"\n" else size
+        start = size
+        for _ in range(count):
+            if pos <= 0:
+                start = 0
+                break
+            newline = view.rfind(b"\n", 0, pos)
+            candidate = newline + 1
+            if max_bytes is not None and end - candidate > max_bytes and start < end:
+                break
+            start = candidate
+            pos = newline
+        note_file_read(end - start)
+        return FixtureSlice(bytes(view[start:end]), start, end, size, start > 0)
+
+
+_STEP = re.compile(r"^(?P<name>[\w.\-]+:)?(?P<local>[\w.\-]+|\*)(?:\[(?P<pred>[^\]]+)\])?$")
+_ATTR_PRED = re.compile(r"""^@(?P<attr>[\w.\-:]+)(?:\s*=\s*(?P<quote>['"])(?P<value>.*)(?P=quote))?$""")
+
+
+@dataclass
+class _Step:
+    name: str  # local name or "*"
+    descendant: bool  # reached through "//"
+    position: Optional[int] = None
+    attr: Optional[str] = None
+    value: Optional[str] = None
+
+    def matches(self, node: tuple) -> bool:
+        name, attrs, position = node
+        if self.name != "*" and self.name != name:
+            return False
+        if self.position is not None and self.position != position:
+            return False
+        if self.attr is not None:
+            value = attrs.get(self.attr)
+            if value is None:
+                # Namespaced attributes are keyed "{uri}local" by ElementTree
+                value = next((v for k, v in attrs.items() if _local(k) == self.attr), None)
+            if value is None or (self.value is not None and value != self.value):
+                return False
+        return True
+
+
+def parse_xpath(expression: str) -> list[_Step]:
+    """Parse the supported XPath subset.
+
+    Location paths of element names or ``*`` separated by ``/`` or ``//``, each
+    optionally with one predicate: a position ``[2]``, ``[@attr]`` or
+    ``[@attr='value']``. Namespace prefixes are ignored (local names match).
+    A path not starting with ``/`` is searched anywhere, like ``//path``.
+    """
+    expression = expression.strip()
+    if not expression:
+        raise ValueError("Empty XPath expression")
+    if not expression.startswith("/"):
+        expression = "//" + expression
+    if not re.fullmatch(r"(//?[^/]+)+", expression):
+        raise ValueError(f"Unsupported XPath expression: {expression}")
+    steps = []
+    for descendant, text in re.findall(r"(//?)([^/]+)", expression):
+        match = _STEP.match(text.strip())
+        if match is None:
+            raise ValueError(f"Unsupported XPath step: {text}")
+        step = _Step(match.group("local"), descendant == "//")
+        pred = match.group("pred")
+        if pred:
+            pred = pred.strip()
+            if pred.isdigit():
+                step.position = int(pred)
+            else:
+                attr = _ATTR_PRED.match(pred)
+                if attr is None:
+                    raise ValueError(f"Unsupported XPath predicate: [{pred}]")
+                step.attr = attr.group("attr").split(":")[-1]
+                step.value = attr.group("value")
+        steps.append(step)
+    return steps
+
+
+def _path_matches(steps: list[_Step], nodes: list[tuple]) -> bool:
+    """Whether the element at the end of nodes (root first) is selected by steps."""
+
+    def match(si: int, ni: int) -> bool:
+        # steps[si:] must match a chain ending exactly at the last node, starting at or after ni
+        if si == len(steps):
+            return ni == len(nodes)
+        step = steps[si]
+        candidates = range(ni, len(nodes)) if step.descendant else range(ni, min(ni + 1, len(nodes)))
+        return any(step.matches(nodes[k]) and match(si + 1, k + 1) for k in candidates)
+
+    return match(0, 0)
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def xml_select(path: Path, expression: str, offset: int = 0, limit: int = 10) -> tuple[list[str], bool]:
+    """Serialized elements selected by an XPath expression, streamed with iterparse.
+
+    Returns up to limit elements after skipping offset matches, and whether
+    more matches follow. Parsing stops as soon as the page is complete.
+    """
+    steps = parse_xpath(expression)
+    last_name = steps[-1].name
+    results: list[str] = []
+    seen = 0
+    nodes: list[tuple] = []
+    elements: list[ET.Element] = []
+    counters: list[dict[str, int]] = [{}]
+    capture_depth: Optional[int] = None
+    with open(path, "rb") as f:
+        try:
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    name = _local(elem.tag)
+                    siblings = counters[-1]
+                    siblings[name] = siblings.get(name, 0) + 1
+                    nodes.append((name, elem.attrib, siblings[name]))
+                    elements.append(elem)
+                    counters.append({})
+                    if (
+                        capture_depth is None
+                        and last_name in ("*", name)
+                        and _path_matches(steps, nodes)
+                    ):
+                        capture_depth = len(nodes)
+                    continue
+
+                depth = len(nodes)
+                nodes.pop()
+                elements.pop()
+                counters.pop()
+                if capture_depth == depth:
+                    capture_depth = None
+                    if seen >= offset:
+                        if len(results) == limit:
+                            return results, True
+                        elem.tail = None
+                        results.append(ET.tostring(elem, encoding="unicode"))
+                    seen += 1
+                if capture_depth is None:
+                    # Drop finished elements so memory stays bounded by the open path
+                    elem.clear()
+                    if elements:
+                        elements[-1].remove(elem)
+        except ET.ParseError as e:
+            raise ValueError(f"Not well-formed XML: {e}")
+        finally:
+            note_file_read(f.tell())
+    return results, False
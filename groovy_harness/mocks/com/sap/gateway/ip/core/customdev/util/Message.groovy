@@ -0,0 +1,136 @@
+package com.sap.gateway.ip.core.customdev.util
+
+import javax.xml.parsers.DocumentBuilderFactory
+
+/**
+ * Local stand-in for the SAP Cloud Integration message.
+ *
+ * Supports the body conversions scripts commonly request through
+ * getBody(Class): String, byte[], InputStream, Reader and DOM Document.
+ */
+class Message {
+    private Object body
+    private Map<String, Object> headers = new LinkedHashMap<>()
+    private Map<String, Object> properties = new LinkedHashMap<>()
+    private Map<String, Object> attachments = new LinkedHashMap<>()
+
+    Object getBody() {
+        return body
+    }
+
+    def <T> T getBody(Class<T> type) {
+        if (body == null) {
+            return null
+        }
+        if (type == null || type.isInstance(body)) {
+            return (T) body
+        }
+        if (type == String || type == CharSequence) {
+            return (T) bodyAsString()
+        }
+        if (type == byte[].class) {
+            return (T) bodyAsBytes()
+        }
+        if (InputStream.isAssignableFrom(type)) {
+            return (T) new ByteArrayInputStream(bodyAsBytes())
+        }
+        if (Reader.isAssignableFrom(type)) {
+            return (T) new StringReader(bodyAsString())
+        }
+        if (type.name == "org.w3c.dom.Document" || type.name == "org.w3c.dom.Node") {
+            def factory = DocumentBuilderFactory.newInstance()
+            factory.namespaceAware = true
+            return (T) factory.newDocumentBuilder().parse(new ByteArrayInputStream(bodyAsBytes()))
+        }
+        return type.cast(body)
+    }
+
+    void setBody(Object body) {
+        this.body = body
+    }
+
+    private String bodyAsString() {
+        if (body instanceof byte[]) {
+            return new String((byte[]) body, "UTF-8")
+        }
+        if (body instanceof InputStream) {
+            body = ((InputStream) body).bytes
+            return new String((byte[]) body, "UTF-8")
+        }
+        if (body instanceof Reader) {
+            body = ((Reader) body).text
+        }
+        return body.toString()
+    }
+
+    private byte[] bodyAsBytes() {
+        if (body instanceof byte[]) {
+            return (byte[]) body
+        }
+        if (body instanceof InputStream) {
+            body = ((InputStream) body).bytes
+            return (byte[]) body
+        }
+        return bodyAsString().getBytes("UTF-8")
+    }
+
+    Map<String, Object> getHeaders() {
+        return headers
+    }
+
+    def <T> T getHeader(String name, Class<T> type) {
+        def value = headers.get(name)
+        if (value == null || type == null || type.isInstance(value)) {
+            return (T) value
+        }
+        return type == String ? (T) value.toString() : type.cast(value)
+    }
+
+    void setHeader(String name, Object value) {
+        headers.put(name, value)
+    }
+
+    void setHeaders(Map<String, Object> values) {
+        headers = new LinkedHashMap<>(values)
+    }
+
+    Map<String, Object> getProperties() {
+        return properties
+    }
+
+    /**
+     * The exchange property of that name. In a Groovy class this method also
+     * handles property-style access, so the declared bean properties
+     * (message.body, message.headers, ...) still go to their getters, as on
+     * the real Message.
+     */
+    Object getProperty(String name) {
+        MetaProperty declared = getMetaClass().hasProperty(this, name)
+        if (declared != null) {
+            return declared.getProperty(this)
+        }
+        return properties.get(name)
+    }
+
+    /** Sets an exchange property; assignments such as message.body = x use the setter. */
+    void setProperty(String name, Object value) {
+        MetaProperty declared = getMetaClass().hasProperty(this, name)
+        if (declared instanceof MetaBeanProperty && ((MetaBeanProperty) declared).setter != null) {
+            declared.setProperty(this, value)
+            return
+        }
+        properties.put(name, value)
+    }
+
+    void setProperties(Map<String, Object> values) {
+        properties = new LinkedHashMap<>(values)
+    }
+
+    Map<String, Object> getAttachments() {
+        return attachments
+    }
+
+    void addAttachmentObject(String id, Object content) {
+        attachments.put(id, content)
+    }
+}
@@ -0,0 +1,30 @@
+package com.sap.it.api
+
+/**
+ * Local stand-in for the factory scripts get SAP services from.
+ *
+ * The runner registers the services of each run (e.g. a SecureStoreService
+ * holding the example's input.credentials) before calling the script.
+ */
+class ITApiFactory {
+    private static final Map<Class, Object> services = [:]
+
+    static void register(Class type, Object service) {
+        services.put(type, service)
+    }
+
+    static void clear() {
+        services.clear()
+    }
+
+    static <T> T getService(Class<T> type, Object context) {
+        if (!services.containsKey(type)) {
+            throw new IllegalArgumentException("No local mock for service " + type.name)
+        }
+        return (T) services.get(type)
+    }
+
+    static <T> T getApi(Class<T> type, Object context) {
+        return getService(type, context)
+    }
+}
@@ -0,0 +1,54 @@
+package com.sap.it.api.msglog
+
+/**
+ * Local stand-in for the message processing log (MPL).
+ *
+ * Every call is recorded so the harness can report what a script logged.
+ */
+class MessageLog {
+    final List<Map<String, Object>> entries = []
+
+    private void record(String kind, String name, Object value, String type = null) {
+        def entry = [kind: kind, name: name, size: value == null ? 0 : value.toString().length()]
+        if (type != null) {
+            entry.type = type
+        }
+        entries << entry
+    }
+
+    void setStringProperty(String name, String value) {
+        record("property", name, value)
+    }
+
+    void setIntegerProperty(String name, Integer value) {
+        record("property", name, value)
+    }
+
+    void setLongProperty(String name, Long value) {
+        record("property", name, value)
+    }
+
+    void setBooleanProperty(String name, Boolean value) {
+        record("property", name, value)
+    }
+
+    void setFloatProperty(String name, Float value) {
+        record("property", name, value)
+    }
+
+    void setDoubleProperty(String name, Double value) {
+        record("property", name, value)
+    }
+
+    void setDateProperty(String name, Date value) {
+        record("property", name, value)
+    }
+
+    void addCustomHeaderProperty(String name, String value) {
+        record("customHeader", name, value)
+    }
+
+    void addAttachmentAsString(String name, String text, String mediaType) {
+        record("attachment", name, text, mediaType)
+    }
+}
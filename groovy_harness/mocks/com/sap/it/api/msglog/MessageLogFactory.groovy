@@ -0,0 +1,12 @@
+package com.sap.it.api.msglog
+
+/**
+ * Local stand-in for the injected messageLogFactory; one log per run.
+ */
+class MessageLogFactory {
+    final MessageLog log = new MessageLog()
+
+    MessageLog getMessageLog(Object message) {
+        return log
+    }
+}
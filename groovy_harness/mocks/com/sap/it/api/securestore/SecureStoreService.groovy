@@ -0,0 +1,22 @@
+package com.sap.it.api.securestore
+
+/**
+ * Local stand-in for the secure store, filled from an example's
+ * input.credentials fixture.
+ */
+class SecureStoreService {
+    private final Map<String, UserCredential> credentials
+
+    SecureStoreService(Map<String, UserCredential> credentials) {
+        this.credentials = credentials
+    }
+
+    /** The credential deployed under an alias, or null when there is none. */
+    UserCredential getUserCredential(String alias) {
+        if (alias == null) {
+            return null
+        }
+        // Externalized aliases often carry stray whitespace from a property file
+        return credentials.get(alias) ?: credentials.get(alias.trim())
+    }
+}
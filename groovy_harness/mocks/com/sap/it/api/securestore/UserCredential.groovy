@@ -0,0 +1,33 @@
+package com.sap.it.api.securestore
+
+/**
+ * Local stand-in for a deployed user credential; like the real one, the
+ * password is a char array.
+ */
+class UserCredential {
+    private final String alias
+    private final String username
+    private final char[] password
+
+    UserCredential(String alias, String username, String password) {
+        this.alias = alias
+        this.username = username
+        this.password = password == null ? null : password.toCharArray()
+    }
+
+    String getAlias() {
+        return alias
+    }
+
+    String getUsername() {
+        return username
+    }
+
+    char[] getPassword() {
+        return password
+    }
+
+    Map<String, String> getCredentialProperties() {
+        return [:]
+    }
+}
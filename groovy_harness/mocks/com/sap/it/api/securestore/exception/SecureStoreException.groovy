@@ -0,0 +1,10 @@
+package com.sap.it.api.securestore.exception
+
+/**
+ * Local stand-in for the secure store's checked exception.
+ */
+class SecureStoreException extends Exception {
+    SecureStoreException(String message) {
+        super(message)
+    }
+}
@@ -0,0 +1,234 @@
+/*
+ * Long-lived worker that runs CPI scripts against a mock Message.
+ *
+ * Protocol: one JSON request per line on stdin, one JSON response per line on
+ * stdout. Anything the script prints is captured and returned in "stdout", so
+ * it never corrupts the protocol stream. Compiled scripts are cached by hash
+ * (or path and modification time), keeping repeated runs warm. The cache keeps
+ * the most recently used SAP_GROOVY_MCP_COMPILED_SCRIPTS scripts (default 256),
+ * each in its own class loader so that evicted scripts can be unloaded.
+ *
+ * Request:  {"id", "script" | "source", "hash", "function", "body",
+ *            "bodyEncoding": "text" | "base64", "headers", "properties",
+ *            "credentials": {alias: {"username", "password"}}, "profile"}
+ * Response: {"id", "ok", "body", "bodyEncoding", "headers", "properties",
+ *            "log", "stdout", "elapsedMs", "error", "trace", "missing", "profile"}
+ *
+ * "missing" lists the classes a script imports that are not on the
+ * classpath (e.g. Apache POI or JSch), when that is why it failed to compile.
+ *
+ * With "profile": true the output body is measured but not returned, and
+ * "profile" holds the bytes allocated by the run, the heap before it, the
+ * peak heap (sum of the heap pools' peaks) and, on Linux, the peak resident
+ * set size of the worker during the run.
+ */
+
+import com.sap.gateway.ip.core.customdev.util.Message
+import com.sap.it.api.ITApiFactory
+import com.sap.it.api.msglog.MessageLogFactory
+import com.sap.it.api.securestore.SecureStoreService
+import com.sap.it.api.securestore.UserCredential
+import groovy.json.JsonOutput
+import groovy.json.JsonSlurper
+import org.codehaus.groovy.control.MultipleCompilationErrorsException
+import org.codehaus.groovy.runtime.InvokerHelper
+
+import java.lang.management.ManagementFactory
+import java.lang.management.MemoryType
+import javax.xml.transform.TransformerFactory
+import javax.xml.transform.dom.DOMSource
+import javax.xml.transform.stream.StreamResult
+
+/** Compiled script classes by key, least recently used evicted first. */
+class CompiledScripts extends LinkedHashMap<String, Class> {
+    final int limit
+
+    CompiledScripts(int limit) {
+        super(16, 0.75f, true)
+        this.limit = limit
+    }
+
+    @Override
+    protected boolean removeEldestEntry(Map.Entry<String, Class> eldest) {
+        if (size() <= limit) {
+            return false
+        }
+        unload(eldest.value)
+        return true
+    }
+
+    /** Cache a script compiled from a file, dropping older versions of the same file. */
+    void putFile(String path, String key, Class scriptClass) {
+        def stale = keySet().findAll { it.startsWith(path + ":") && it != key }
+        stale.each { unload(remove(it)) }
+        put(key, scriptClass)
+    }
+
+    static void unload(Class scriptClass) {
+        InvokerHelper.removeClass(scriptClass)
+        def owner = scriptClass.classLoader
+        if (owner instanceof GroovyClassLoader) {
+            ((GroovyClassLoader) owner).close()
+        }
+    }
+}
+
+PrintStream protocolOut = System.out
+def reader = new BufferedReader(new InputStreamReader(System.in, "UTF-8"))
+def slurper = new JsonSlurper()
+def parentLoader = this.class.classLoader
+def compiled = new CompiledScripts((System.getenv("SAP_GROOVY_MCP_COMPILED_SCRIPTS") ?: "256") as int)
+
+def encodeBody = { Object body ->
+    if (body == null) {
+        return [null, "text"]
+    }
+    if (body instanceof byte[]) {
+        return [((byte[]) body).encodeBase64().toString(), "base64"]
+    }
+    if (body instanceof InputStream) {
+        return [((InputStream) body).bytes.encodeBase64().toString(), "base64"]
+    }
+    if (body instanceof Reader) {
+        return [((Reader) body).text, "text"]
+    }
+    if (body.class.name.startsWith("org.w3c.dom.")) {
+        def writer = new StringWriter()
+        TransformerFactory.newInstance().newTransformer().transform(new DOMSource(body), new StreamResult(writer))
+        return [writer.toString(), "text"]
+    }
+    return [body.toString(), "text"]
+}
+
+def stringify = { Map values ->
+    values.collectEntries { k, v -> [(k.toString()): v == null ? null : v.toString()] }
+}
+
+def heapPools = ManagementFactory.memoryPoolMXBeans.findAll { it.type == MemoryType.HEAP }
+def threads = ManagementFactory.threadMXBean
+
+def allocatedBytes = { ->
+    threads instanceof com.sun.management.ThreadMXBean
+        ? ((com.sun.management.ThreadMXBean) threads).getThreadAllocatedBytes(Thread.currentThread().id)
+        : null
+}
+
+def peakRssBytes = { ->
+    def status = new File("/proc/self/status")
+    if (!status.exists()) {
+        return null
+    }
+    def line = status.readLines().find { it.startsWith("VmHWM:") }
+    line == null ? null : (line.split(/\s+/)[1] as long) * 1024
+}
+
+def startProfile = { ->
+    System.gc()
+    heapPools.each { it.resetPeakUsage() }
+    try {
+        // Linux: resets the peak resident set size (VmHWM) of this process
+        new File("/proc/self/clear_refs").text = "5"
+    } catch (Exception ignored) {
+    }
+    [allocatedBytes: allocatedBytes(), heapBaselineBytes: heapPools.sum { it.usage.used }]
+}
+
+def finishProfile = { Map profile ->
+    def allocated = allocatedBytes()
+    profile.allocatedBytes = allocated != null && profile.allocatedBytes != null ? allocated - profile.allocatedBytes : null
+    profile.peakHeapBytes = heapPools.sum { it.peakUsage.used }
+    profile.peakRssBytes = peakRssBytes()
+    profile
+}
+
+protocolOut.println(JsonOutput.toJson([ready: true]))
+protocolOut.flush()
+
+String line
+while ((line = reader.readLine()) != null) {
+    if (!line.trim()) {
+        continue
+    }
+    def request = slurper.parseText(line)
+    def response = [id: request.id]
+    def captured = new ByteArrayOutputStream()
+    Map profile = request.profile ? startProfile() : null
+    long started = System.nanoTime()
+    System.setOut(new PrintStream(captured, true, "UTF-8"))
+    try {
+        String key
+        File file = request.source != null ? null : new File(request.script as String)
+        if (file == null) {
+            key = "source:" + (request.hash ?: request.source.hashCode())
+        } else {
+            key = file.absolutePath + ":" + file.lastModified()
+        }
+        Class scriptClass = compiled[key]
+        if (scriptClass == null) {
+            // One loader per script, so the class can be unloaded once it is evicted
+            def loader = new GroovyClassLoader(parentLoader)
+            if (file == null) {
+                scriptClass = loader.parseClass(request.source as String, "Script_" + Math.abs(key.hashCode()) + ".groovy")
+                compiled[key] = scriptClass
+            } else {
+                scriptClass = loader.parseClass(file)
+                compiled.putFile(file.absolutePath, key, scriptClass)
+            }
+        }
+
+        def credentials = (request.credentials ?: [:]).collectEntries { alias, credential ->
+            [(alias as String): new UserCredential(alias as String, credential.username as String, credential.password as String)]
+        }
+        ITApiFactory.clear()
+        ITApiFactory.register(SecureStoreService, new SecureStoreService(credentials))
+
+        def factory = new MessageLogFactory()
+        def binding = new Binding()
+        binding.setVariable("messageLogFactory", factory)
+        Script script = InvokerHelper.createScript(scriptClass, binding)
+
+        def message = new Message()
+        def body = request.body
+        message.setBody(body != null && request.bodyEncoding == "base64" ? body.decodeBase64() : body)
+        (request.headers ?: [:]).each { k, v -> message.setHeader(k as String, v) }
+        (request.properties ?: [:]).each { k, v -> message.setProperty(k as String, v) }
+
+        def result = script.invokeMethod(request.function ?: "processData", message)
+        if (!(result instanceof Message)) {
+            result = message
+        }
+
+        def (outBody, encoding) = encodeBody(result.getBody())
+        response.ok = true
+        if (profile != null) {
+            profile.outputLength = outBody == null ? 0 : outBody.length()
+        } else {
+            response.body = outBody
+        }
+        response.bodyEncoding = encoding
+        response.headers = stringify(result.getHeaders())
+        response.properties = stringify(result.getProperties())
+        response.log = factory.log.entries
+    } catch (Throwable t) {
+        def trace = new StringWriter()
+        t.printStackTrace(new PrintWriter(trace))
+        response.ok = false
+        response.error = t.toString()
+        response.trace = trace.toString()
+        if (t instanceof MultipleCompilationErrorsException) {
+            def missing = (t.message =~ /unable to resolve class ([\w.]+)/).collect { it[1] }.unique()
+            if (missing) {
+                response.missing = missing
+            }
+        }
+    } finally {
+        System.setOut(protocolOut)
+        response.stdout = captured.toString("UTF-8")
+        response.elapsedMs = (System.nanoTime() - started) / 1.0e6
+        if (profile != null) {
+            response.profile = finishProfile(profile)
+        }
+    }
+    protocolOut.println(JsonOutput.toJson(response))
+    protocolOut.flush()
+}
@@ -0,0 +1,800 @@
+#!/usr/bin/env python3
+"""
+Lightweight Groovy lexer and structural parser.
+
+The parser does not build a full expression tree; it recognises the structure
+that matters for CPI scripts: imports, classes, method declarations with line
+ranges, closures, call sites (with SAP Cloud Integration API calls flagged)
+and object instantiations. Comments and string literals are lexed properly so
+that keywords inside them are never mistaken for code.
+
+Summaries are cached per content hash (see ``content_cache``), so every tool
+that needs the structure of a script shares one parse, whether the script is
+an example or pasted inline.
+"""
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from content_cache import ContentCache
+
+# Token kinds
+IDENT = "ident"
+NUMBER = "number"
+STRING = "string"
+OP = "op"
+
+KEYWORDS = {
+    "as", "assert", "break", "case", "catch", "class", "const", "continue", "def",
+    "default", "do", "else", "enum", "extends", "false", "finally", "for", "goto",
+    "if", "implements", "import", "in", "instanceof", "interface", "new", "null",
+    "package", "return", "super", "switch", "this", "throw", "throws", "trait",
+    "true", "try", "var", "while",
+}
+MODIFIERS = {
+    "public", "protected", "private", "static", "final", "abstract", "synchronized",
+    "native", "transient", "volatile", "strictfp", "default",
+}
+PRIMITIVES = {"void", "boolean", "byte", "char", "short", "int", "long", "float", "double"}
+CONTROL_KEYWORDS = {"if", "for", "while", "catch", "switch", "synchronized"}
+BLOCK_KEYWORDS = {"else", "try", "finally", "do", "static"}
+CLASS_KEYWORDS = {"class", "interface", "enum", "trait"}
+
+# Identifiers through which scripts reach the SAP Cloud Integration API
+SAP_ROOTS = {"message", "messageLogFactory", "ITApiFactory"}
+SAP_TYPES = {"Message", "MessageLog", "MessageLogFactory", "SecureStoreService", "UserCredential",
+             "ValueMappingApi", "PartnerDirectoryService", "KeystoreService", "DataStoreService"}
+# Calls whose result is itself an SAP API object
+SAP_FACTORY_METHODS = {"getMessageLog", "getApi", "getService"}
+# Result type of factory calls that do not take it as their first argument
+SAP_FACTORY_TYPES = {"getMessageLog": "MessageLog"}
+
+_OPERATORS = sorted(
+    [
+        ">>>=", "<<=", ">>=", "...", "?.", "*.", ".@", ".&", "?:", "->", "==~", "=~", "<=>",
+        "**", "++", "--", "&&", "||", "==", "!=", "<=", ">=", "+=", "-=", "*=", "/=",
+        "%=", "&=", "|=", "^=", "<<", "..", "::",
+    ],
+    key=len,
+    reverse=True,
+)
+# Java identifiers may use any Unicode letter or digit
+_IDENT_RE = re.compile(r"(?:[^\W\d]|\$)[\w$]*")
+_CAMEL_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z]|\d|\b)|[A-Z]?[a-z]+|[A-Z]+|\d+")
+_NUMBER_RE = re.compile(r"0[xX][0-9a-fA-F_]+[lLgG]?|\d[\d_]*(\.\d[\d_]*)?([eE][+-]?\d+)?[a-zA-Z]?")
+
+# A '/' after one of these starts a slashy string rather than a division
+_VALUE_END_KINDS = {IDENT, NUMBER, STRING}
+_VALUE_END_OPS = {")", "]", "}"}
+_VALUE_KEYWORDS = {"this", "super", "true", "false", "null"}
+
+
+def split_identifier(word: str) -> list[str]:
+    """Split ``getMessageLogFactory`` into ``['get', 'message', 'log', 'factory']``."""
+    parts = []
+    for chunk in word.replace("$", "_").split("_"):
+        parts.extend(p.lower() for p in _CAMEL_RE.findall(chunk))
+    return parts
+
+
+@dataclass
+class Token:
+    kind: str
+    value: str
+    line: int
+    end_line: int
+
+
+def _skip_gstring_expr(source: str, pos: int) -> int:
+    """Skip a ``${...}`` expression starting after ``${``; returns the index after ``}``."""
+    depth = 1
+    n = len(source)
+    while pos < n and depth:
+        ch = source[pos]
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+        elif ch in "'\"":
+            pos = _skip_string(source, pos)
+            continue
+        pos += 1
+    return pos
+
+
+def _skip_string(source: str, pos: int) -> int:
+    """Return the index just after the string literal starting at ``pos``."""
+    n = len(source)
+    quote = source[pos]
+    triple = source.startswith(quote * 3, pos)
+    delim = quote * 3 if triple else quote
+    pos += len(delim)
+    while pos < n:
+        ch = source[pos]
+        if ch == "\\":
+            pos += 2
+            continue
+        if quote == '"' and source.startswith("${", pos):
+            pos = _skip_gstring_expr(source, pos + 2)
+            continue
+        if source.startswith(delim, pos):
+            return pos + len(delim)
+        if ch == "\n" and not triple:
+            return pos
+        pos += 1
+    return n
+
+
+def tokenize(source: str) -> list[Token]:
+    """Split Groovy source into tokens, dropping comments and whitespace."""
+    tokens: list[Token] = []
+    pos = 0
+    line = 1
+    n = len(source)
+
+    if source.startswith("#!"):
+        pos = source.find("\n")
+        pos = n if pos < 0 else pos
+
+    while pos < n:
+        ch = source[pos]
+
+        if ch == "\n":
+            line += 1
+            pos += 1
+            continue
+        if ch.isspace():
+            pos += 1
+            continue
+
+        # Comments
+        if source.startswith("//", pos):
+            end = source.find("\n", pos)
+            pos = n if end < 0 else end
+            continue
+        if source.startswith("/*", pos):
+            end = source.find("*/", pos + 2)
+            end = n if end < 0 else end + 2
+            line += source.count("\n", pos, end)
+            pos = end
+            continue
+
+        start = pos
+        if ch in "'\"":
+            pos = _skip_string(source, pos)
+            kind = STRING
+        elif source.startswith("$/", pos):
+            end = source.find("/$", pos + 2)
+            pos = n if end < 0 else end + 2
+            kind = STRING
+        elif ch == "/" and not _is_value_end(tokens) and _slashy_end(source, pos) is not None:
+            pos = _slashy_end(source, pos)
+            kind = STRING
+        elif ch.isdigit():
+            # Digits the pattern does not accept (such as '²') become one-character tokens
+            match = _NUMBER_RE.match(source, pos)
+            pos = match.end() if match else pos + 1
+            kind = NUMBER
+        elif ch.isalpha() or ch in "_$":
+            match = _IDENT_RE.match(source, pos)
+            pos = match.end() if match else pos + 1
+            kind = IDENT
+        else:
+            for op in _OPERATORS:
+                if source.startswith(op, pos):
+                    pos += len(op)
+                    break
+            else:
+                pos += 1
+            kind = OP
+
+        value = source[start:pos]
+        end_line = line + value.count("\n")
+        tokens.append(Token(kind, value, line, end_line))
+        line = end_line
+
+    return tokens
+
+
+def match_brackets(tokens: list[Token]) -> dict[int, int]:
+    """Map every opening bracket index to its closing index and back."""
+    matching = {}
+    stack = []
+    pairs = {")": "(", "]": "[", "}": "{"}
+    for index, token in enumerate(tokens):
+        if token.kind != OP:
+            continue
+        if token.value in "([{":
+            stack.append(index)
+        elif token.value in pairs:
+            # Pop to the nearest opener of the right kind; tolerates broken code
+            for depth in range(len(stack) - 1, -1, -1):
+                if tokens[stack[depth]].value == pairs[token.value]:
+                    opener = stack[depth]
+                    del stack[depth:]
+                    matching[opener] = index
+                    matching[index] = opener
+                    break
+    return matching
+
+
+def _is_value_end(tokens: list[Token]) -> bool:
+    if not tokens:
+        return False
+    last = tokens[-1]
+    if last.kind == IDENT:
+        return last.value not in KEYWORDS or last.value in _VALUE_KEYWORDS
+    if last.kind in _VALUE_END_KINDS:
+        return True
+    return last.kind == OP and last.value in _VALUE_END_OPS
+
+
+def _slashy_end(source: str, pos: int) -> Optional[int]:
+    """End of a single-line slashy string starting at pos, or None if it is not one."""
+    n = len(source)
+    pos += 1
+    while pos < n:
+        ch = source[pos]
+        if ch == "\\":
+            pos += 2
+            continue
+        if ch == "/":
+            return pos + 1
+        if ch == "\n":
+            return None
+        pos += 1
+    return None
+
+
+@dataclass
+class Import:
+    name: str
+    line: int
+    static: bool = False
+    alias: Optional[str] = None
+
+    @property
+    def statement(self) -> str:
+        text = "import static " if self.static else "import "
+        text += self.name
+        if self.alias:
+            text += f" as {self.alias}"
+        return text
+
+    @property
+    def simple_name(self) -> str:
+        return self.alias or self.name.rsplit(".", 1)[-1]
+
+
+@dataclass
+class ClassInfo:
+    name: str
+    kind: str
+    start: int
+    end: int
+
+
+@dataclass
+class MethodInfo:
+    name: str
+    signature: str
+    start: int
+    end: int
+    return_type: str = "def"
+    params: list[str] = field(default_factory=list)
+    class_name: Optional[str] = None
+
+
+@dataclass
+class ClosureInfo:
+    start: int
+    end: int
+    params: list[str] = field(default_factory=list)
+
+
+@dataclass
+class CallSite:
+    receiver: Optional[str]
+    method: str
+    line: int
+    sap: bool = False
+
+    @property
+    def text(self) -> str:
+        return f"{self.receiver}.{self.method}" if self.receiver else self.method
+
+
+@dataclass
+class ScriptSummary:
+    """Structural summary of one Groovy script."""
+
+    content_hash: str
+    line_count: int
+    code_lines: int
+    package: Optional[str] = None
+    imports: list[Import] = field(default_factory=list)
+    classes: list[ClassInfo] = field(default_factory=list)
+    methods: list[MethodInfo] = field(default_factory=list)
+    closures: list[ClosureInfo] = field(default_factory=list)
+    calls: list[CallSite] = field(default_factory=list)
+    instantiations: list[tuple[str, int]] = field(default_factory=list)
+    # Variable and parameter name -> declared or inferred type, as written
+    variables: dict[str, str] = field(default_factory=dict)
+    identifiers: frozenset = frozenset()
+    identifier_counts: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def sap_calls(self) -> list[CallSite]:
+        return [call for call in self.calls if call.sap]
+
+    def method_at(self, line: int) -> Optional[MethodInfo]:
+        """Innermost method whose body contains the given line."""
+        found = None
+        for method in self.methods:
+            if method.start <= line <= method.end:
+                if found is None or method.start >= found.start:
+                    found = method
+        return found
+
+    def concepts(self) -> list[str]:
+        """Key SAP CPI concepts used by the script."""
+        sap_methods = {call.method for call in self.sap_calls}
+        words = set()
+        for name in self.identifiers | {imp.name for imp in self.imports}:
+            for segment in name.split("."):
+                words.update(split_identifier(segment))
+        concepts = []
+        if "Message" in self.identifiers:
+            concepts.append("Message manipulation")
+        if sap_methods & {"getBody", "setBody"}:
+            concepts.append("Body processing")
+        if sap_methods & {"getHeader", "getHeaders", "setHeader", "setHeaders"}:
+            concepts.append("Header manipulation")
+        if sap_methods & {"getProperty", "getProperties", "setProperty", "setProperties"}:
+            concepts.append("Property manipulation")
+        if self.identifiers & {"messageLog", "messageLogFactory", "MessageLog"}:
+            concepts.append("Message logging")
+        if "SecureStoreService" in self.identifiers:
+            concepts.append("Credential management")
+        if "xml" in words:
+            concepts.append("XML processing")
+        if "json" in words:
+            concepts.append("JSON processing")
+        if "csv" in words:
+            concepts.append("CSV processing")
+        return concepts
+
+
+class _Parser:
+    def __init__(self, tokens: list[Token]):
+        self.tokens = tokens
+        self.matching = match_brackets(tokens)
+        self.summary_imports: list[Import] = []
+        self.package: Optional[str] = None
+        self.classes: list[ClassInfo] = []
+        self.methods: list[MethodInfo] = []
+        self.closures: list[ClosureInfo] = []
+        self.calls: list[CallSite] = []
+        self.instantiations: list[tuple[str, int]] = []
+        self.variables: dict[str, str] = {}
+        self.sap_vars = set(SAP_ROOTS)
+        self.method_bodies: set[int] = set()
+
+    def _value(self, index: int) -> str:
+        if 0 <= index < len(self.tokens):
+            return self.tokens[index].value
+        return ""
+
+    def _is(self, index: int, kind: str, value: Optional[str] = None) -> bool:
+        if not 0 <= index < len(self.tokens):
+            return False
+        token = self.tokens[index]
+        return token.kind == kind and (value is None or token.value == value)
+
+    def _end_line(self, open_index: int) -> int:
+        close = self.matching.get(open_index)
+        if close is None:
+            return self.tokens[-1].end_line
+        return self.tokens[close].line
+
+    def _text(self, start: int, end: int) -> str:
+        """Source-like text for tokens[start:end]."""
+        out = ""
+        prev = None
+        for token in self.tokens[start:end]:
+            if prev is not None and _needs_space(prev, token):
+                out += " "
+            out += token.value
+            prev = token
+        return out
+
+    def _qualified_name(self, index: int) -> tuple[str, int]:
+        """Read ``a.b.C`` (or ``a.b.*``) starting at index; returns (name, next index)."""
+        parts = []
+        while index < len(self.tokens):
+            token = self.tokens[index]
+            if token.kind == IDENT or token.value == "*":
+                parts.append(token.value)
+                index += 1
+                if self._is(index, OP, "."):
+                    index += 1
+                    continue
+            break
+        return ".".join(parts), index
+
+    def parse(self) -> None:
+        tokens = self.tokens
+        class_stack: list[tuple[str, int]] = []
+        index = 0
+        while index < len(tokens):
+            token = tokens[index]
+            while class_stack and index > class_stack[-1][1]:
+                class_stack.pop()
+
+            if token.kind == IDENT:
+                if token.value == "import" and self._statement_start(index):
+                    index = self._parse_import(index)
+                    continue
+                if token.value == "package" and self._statement_start(index):
+                    self.package, index = self._qualified_name(index + 1)
+                    continue
+                if token.value in CLASS_KEYWORDS and self._is(index + 1, IDENT) and \
+                        not self._is(index - 1, OP, "."):
+                    body = self._find_body(index + 2)
+                    if body is not None:
+                        name = tokens[index + 1].value
+                        self.classes.append(
+                            ClassInfo(name, token.value, token.line, self._end_line(body))
+                        )
+                        class_stack.append((name, self.matching.get(body, len(tokens))))
+                        index = body + 1
+                        continue
+                if token.value == "new" and self._is(index + 1, IDENT):
+                    name, _ = self._qualified_name(index + 1)
+                    self.instantiations.append((name, token.line))
+                    if self._is(index - 1, OP, "=") and self._is(index - 2, IDENT):
+                        # def builder = new StringBuilder()
+                        self.variables[tokens[index - 2].value] = name
+                elif self._is(index + 1, IDENT) and token.value in SAP_TYPES:
+                    # Typed declaration such as "Message message" or "MessageLog log"
+                    self.sap_vars.add(tokens[index + 1].value)
+                    if not self._is(index + 2, OP, "("):
+                        self.variables[tokens[index + 1].value] = token.value
+                elif self._is(index + 1, IDENT) and token.value[:1].isupper() and \
+                        self._value(index + 2) in {"=", ";", ","} and not self._is(index - 1, OP, "."):
+                    # Typed declaration such as "StringBuilder out = ..."
+                    self.variables[tokens[index + 1].value] = token.value
+
+                if self._is(index + 1, OP, "("):
+                    method_end = self._try_method(index, class_stack[-1][0] if class_stack else None)
+                    if method_end is None:
+                        self._record_call(index)
+
+            elif token.kind == OP and token.value == "{":
+                self._record_closure(index)
+
+            index += 1
+
+        self.summary_imports.sort(key=lambda imp: imp.line)
+
+    def _statement_start(self, index: int) -> bool:
+        if index == 0:
+            return True
+        prev = self.tokens[index - 1]
+        return prev.value in {";", "}"} or prev.end_line < self.tokens[index].line
+
+    def _parse_import(self, index: int) -> int:
+        line = self.tokens[index].line
+        index += 1
+        static = False
+        if self._is(index, IDENT, "static"):
+            static = True
+            index += 1
+        name, index = self._qualified_name(index)
+        alias = None
+        if self._is(index, IDENT, "as") and self._is(index + 1, IDENT):
+            alias = self.tokens[index + 1].value
+            index += 2
+        if name:
+            self.summary_imports.append(Import(name, line, static, alias))
+        return index
+
+    def _find_body(self, index: int) -> Optional[int]:
+        """Find the '{' opening a class body after its header (extends/implements/generics)."""
+        while index < len(self.tokens):
+            token = self.tokens[index]
+            if token.kind == OP and token.value == "{":
+                return index
+            if token.kind == OP and token.value in {";", "(", ")", "}", "="}:
+                return None
+            index += 1
+        return None
+
+    def _declaration_prefix(self, name_index: int) -> Optional[int]:
+        """Return the index where a method declaration's modifiers/type begin.
+
+        Returns None when the tokens before ``name(`` are not a declaration
+        (e.g. a call such as ``foo.bar(`` or ``return baz(``).
+        """
+        index = name_index - 1
+        if index < 0 or self.tokens[index].value in {".", "?.", "new"}:
+            return None
+        start = None
+        while index >= 0:
+            token = self.tokens[index]
+            if token.end_line < self.tokens[index + 1].line:
+                # Declarations do not continue across lines
+                break
+            if token.kind == IDENT and (token.value not in KEYWORDS or token.value == "def"):
+                if self._is(index - 1, OP, "@"):
+                    # Annotation on the same line, e.g. "@Override def foo()"
+                    break
+                start = index
+                index -= 1
+                continue
+            if token.kind == OP and token.value == "." and start is not None:
+                # Qualified type such as groovy.util.Node
+                index -= 1
+                continue
+            if token.kind == OP and token.value in {"]", ">", ">>"}:
+                opener = self._generic_or_array_start(index)
+                if opener is None:
+                    return None
+                start = opener
+                index = opener - 1
+                continue
+            break
+        if start is None or self.tokens[start].kind != IDENT:
+            return None
+        if not self._statement_start(start) and not self._is(start - 1, OP, ")"):
+            # Only an annotation such as @Foo(...) may precede a declaration
+            return None
+        return start
+
+    def _generic_or_array_start(self, index: int) -> Optional[int]:
+        token = self.tokens[index]
+        if token.value == "]":
+            opener = self.matching.get(index)
+            if opener is None or opener != index - 1:
+                return None
+            return opener
+        depth = 0
+        while index >= 0:
+            value = self.tokens[index].value
+            if value == ">":
+                depth += 1
+            elif value == ">>":
+                depth += 2
+            elif value == "<":
+                depth -= 1
+                if depth == 0:
+                    return index
+            elif value not in {",", ".", "?", "extends", "super", "[", "]"} and \
+                    self.tokens[index].kind != IDENT:
+                return None
+            index -= 1
+        return None
+
+    def _try_method(self, name_index: int, class_name: Optional[str]) -> Optional[int]:
+        """Record a method declaration at name_index; returns the body index or None."""
+        name = self.tokens[name_index].value
+        if name in KEYWORDS:
+            return None
+        start = self._declaration_prefix(name_index)
+        if start is None:
+            return None
+        open_paren = name_index + 1
+        close_paren = self.matching.get(open_paren)
+        if close_paren is None:
+            return None
+        body = close_paren + 1
+        if self._is(body, IDENT, "throws"):
+            body += 1
+            while body < len(self.tokens) and (self.tokens[body].kind == IDENT or
+                                               self.tokens[body].value in {",", "."}):
+                body += 1
+        if not self._is(body, OP, "{"):
+            return None
+
+        type_tokens = [
+            t for t in self.tokens[start:name_index]
+            if t.value not in MODIFIERS and t.value != "def"
+        ]
+        return_type = "".join(t.value for t in type_tokens) or "def"
+        params = self._split_params(open_paren + 1, close_paren)
+        for param in params:
+            words = param.split()
+            if len(words) >= 2 and words[-2] in SAP_TYPES:
+                self.sap_vars.add(words[-1])
+            if len(words) >= 2 and words[-2][:1].isupper():
+                self.variables[words[-1]] = words[-2]
+        self.methods.append(
+            MethodInfo(
+                name=name,
+                signature=self._text(start, close_paren + 1),
+                start=self.tokens[start].line,
+                end=self._end_line(body),
+                return_type=return_type,
+                params=params,
+                class_name=class_name,
+            )
+        )
+        # Mark the body so it is not taken for a closure
+        self.method_bodies.add(body)
+        return body
+
+    def _split_params(self, start: int, end: int) -> list[str]:
+        params = []
+        current = start
+        index = start
+        while index < end:
+            token = self.tokens[index]
+            if token.kind == OP and token.value in "([{" and index in self.matching:
+                index = self.matching[index] + 1
+                continue
+            if token.kind == OP and token.value == ",":
+                params.append(self._text(current, index))
+                current = index + 1
+            index += 1
+        if current < end:
+            params.append(self._text(current, end))
+        return [p for p in params if p]
+
+    def _receiver(self, dot_index: int) -> tuple[Optional[str], Optional[str], list[str]]:
+        """Describe the expression before ``.method(``.
+
+        Returns (display text, root variable, methods called along the chain).
+        The root is None when the chain starts with a bare call like ``foo()``.
+        """
+        parts: list[str] = []
+        chain: list[str] = []
+        index = dot_index - 1
+        root = None
+        while index >= 0:
+            token = self.tokens[index]
+            if token.kind == IDENT:
+                parts.append(token.value)
+                root = token.value
+                index -= 1
+            elif token.kind == OP and token.value == ")":
+                opener = self.matching.get(index)
+                if opener is None or not self._is(opener - 1, IDENT):
+                    return None, None, chain
+                method = self.tokens[opener - 1].value
+                parts.append(method + "()")
+                chain.append(method)
+                root = None
+                index = opener - 2
+            else:
+                break
+            if self._is(index, OP, ".") or self._is(index, OP, "?."):
+                index -= 1
+                continue
+            break
+        if not parts:
+            return None, None, chain
+        return ".".join(reversed(parts)), root, chain
+
+    def _record_call(self, name_index: int) -> None:
+        token = self.tokens[name_index]
+        name = token.value
+        if name in KEYWORDS or self._is(name_index - 1, IDENT, "new"):
+            return
+        receiver = root = None
+        chain: list[str] = []
+        if self._is(name_index - 1, OP, ".") or self._is(name_index - 1, OP, "?."):
+            receiver, root, chain = self._receiver(name_index - 1)
+        sap = root in self.sap_vars and all(method in SAP_FACTORY_METHODS for method in chain)
+        self.calls.append(CallSite(receiver, name, token.line, sap))
+
+        # Remember variables holding SAP API objects: x = messageLogFactory.getMessageLog(...)
+        if sap and name in SAP_FACTORY_METHODS:
+            index = name_index - 1
+            while index >= 0 and (self.tokens[index].kind == IDENT or
+                                  self.tokens[index].value in {".", "?.", ")", "("}):
+                index -= 1
+            if self._is(index, OP, "=") and self._is(index - 1, IDENT):
+                self.sap_vars.add(self.tokens[index - 1].value)
+                result_type = SAP_FACTORY_TYPES.get(name)
+                if result_type is None and self._is(name_index + 2, IDENT):
+                    # ITApiFactory.getApi(SecureStoreService.class, null)
+                    result_type = self.tokens[name_index + 2].value
+                if result_type is not None:
+                    self.variables[self.tokens[index - 1].value] = result_type
+
+    def _record_closure(self, index: int) -> None:
+        if index in self.method_bodies or index == 0:
+            return
+        prev = self.tokens[index - 1]
+        if prev.kind == IDENT and prev.value in BLOCK_KEYWORDS:
+            return
+        if prev.kind == OP and prev.value in {"{", "}", ";", "->"}:
+            # Nested block or instance initializer
+            return
+        if prev.kind == OP and prev.value == ")":
+            opener = self.matching.get(index - 1)
+            if opener is not None and opener > 0:
+                before = self.tokens[opener - 1]
+                if before.value in CONTROL_KEYWORDS or before.value in {">", ">>"}:
+                    return
+                if before.kind == IDENT and self._is(opener - 2, IDENT, "new"):
+                    # Anonymous class body
+                    return
+
+        params = []
+        close = self.matching.get(index)
+        probe = index + 1
+        while close is not None and probe < close:
+            token = self.tokens[probe]
+            if token.kind == OP and token.value == "->":
+                params = self._split_params(index + 1, probe)
+                break
+            if token.kind != IDENT and token.value not in {",", ".", "<", ">", "[", "]"}:
+                break
+            probe += 1
+        self.closures.append(ClosureInfo(self.tokens[index].line, self._end_line(index), params))
+
+
+def _needs_space(prev: Token, token: Token) -> bool:
+    if prev.kind in {IDENT, NUMBER} and token.kind in {IDENT, NUMBER, STRING}:
+        return True
+    if prev.kind == OP and prev.value == ",":
+        return True
+    if token.kind == IDENT and prev.kind == OP and prev.value in {"]", ">"}:
+        return True
+    return False
+
+
+def parse(source: str) -> ScriptSummary:
+    """Parse Groovy source into a ScriptSummary (uncached)."""
+    tokens = tokenize(source)
+    parser = _Parser(tokens)
+    parser.parse()
+    lines = source.split("\n")
+    code_lines = len({token.line for token in tokens})
+    counts: dict[str, int] = {}
+    for token in tokens:
+        if token.kind == IDENT and token.value not in KEYWORDS:
+            counts[token.value] = counts.get(token.value, 0) + 1
+    return ScriptSummary(
+        content_hash=content_hash(source),
+        line_count=len(lines),
+        code_lines=code_lines,
+        package=parser.package,
+        imports=parser.summary_imports,
+        classes=parser.classes,
+        methods=parser.methods,
+        closures=parser.closures,
+        calls=parser.calls,
+        instantiations=parser.instantiations,
+        variables=parser.variables,
+        identifiers=frozenset(t.value for t in tokens if t.kind == IDENT),
+        identifier_counts=counts,
+    )
+
+
+def content_hash(source: str) -> str:
+    return hashlib.sha1(source.encode("utf-8", errors="replace")).hexdigest()
+
+
+def source_bytes(source: str) -> int:
+    """UTF-8 size of a source, the weight of its entries in the analysis caches."""
+    return len(source.encode("utf-8", errors="replace"))
+
+
+# Parsed summaries keyed by content hash, weighed by source size (in bytes)
+SUMMARY_CACHE_BYTES = int(float(os.environ.get("SAP_GROOVY_MCP_ANALYSIS_CACHE_MB", "32")) * 1024 * 1024)
+_SUMMARY_CACHE: ContentCache[ScriptSummary] = ContentCache(SUMMARY_CACHE_BYTES)
+
+
+def summary_cache_info() -> dict:
+    """Hit/miss counters and fill level of the summary cache."""
+    return _SUMMARY_CACHE.info()
+
+
+def summarize(source: str) -> ScriptSummary:
+    """Return the (cached) summary for a script's source. Thread-safe."""
+    return _SUMMARY_CACHE.get_or_compute(content_hash(source), source_bytes(source), lambda: parse(source))
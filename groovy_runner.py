@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+"""
+Run example scripts locally against their input/expected fixtures.
+
+Scripts execute in long-lived Groovy worker processes (see
+groovy_harness/runner/Runner.groovy) that keep the JVM and compiled scripts
+warm, so only the first run of each worker pays the JVM start-up cost. The
+workers use local mocks of the CPI Message, messageLogFactory, ITApiFactory
+and secure store APIs. An example that imports classes the workers do not
+have (e.g. Apache POI or JSch) is reported as skipped rather than failed.
+
+Fixture files recognised in an example folder:
+
+- ``input.body.*`` (``*.base64.txt`` is decoded and passed as bytes)
+- ``input.header`` / ``input.headers`` and ``input.properties``
+- ``input.credentials``: the secure store, as ``<alias>.username`` and
+  ``<alias>.password`` properties
+- ``expected.body.*``, ``expected.header*`` and ``expected.properties*``
+
+Usage: python groovy_runner.py [NAME ...] [--all] [--workers N] [--groovy PATH]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from catalog import Example
+from groovy_parser import content_hash
+from metrics import note_file_read
+
+logger = logging.getLogger("sap-groovy-mcp")
+
+HARNESS_DIR = Path(__file__).parent / "groovy_harness"
+RUNNER_SCRIPT = HARNESS_DIR / "runner" / "Runner.groovy"
+MOCKS_DIR = HARNESS_DIR / "mocks"
+
+# Groovy launcher and number of warm JVM workers
+GROOVY_COMMAND = os.environ.get("SAP_GROOVY_MCP_GROOVY", "groovy")
+JVM_WORKERS = int(os.environ.get("SAP_GROOVY_MCP_JVM_WORKERS", "2"))
+
+# Seconds allowed for a JVM to start and for one script run
+WORKER_START_TIMEOUT = 60.0
+RUN_TIMEOUT = float(os.environ.get("SAP_GROOVY_MCP_RUN_TIMEOUT", "20"))
+
+# Largest response line accepted from a worker
+MAX_RESPONSE_BYTES = 64 * 1024 * 1024
+
+
+def parse_properties(text: str) -> dict[str, str]:
+    """Parse Java ``.properties`` content.
+
+    Handles ``#``/``!`` comments, ``=``/``:``/whitespace separators, backslash
+    line continuations and escapes. Trailing whitespace of values is kept, as
+    the fixtures rely on it.
+    """
+    result: dict[str, str] = {}
+    lines = text.splitlines()
+    i = 0
+    while i < len(lines):
+        line = lines[i].lstrip()
+        i += 1
+        if not line or line[0] in "#!":
+            continue
+        # Join continuation lines (odd number of trailing backslashes)
+        while _continues(line) and i < len(lines):
+            line = line[:-1] + lines[i].lstrip()
+            i += 1
+        if _continues(line):
+            line = line[:-1]
+        key, value = _split_property(line)
+        result[_unescape(key)] = _unescape(value)
+    return result
+
+
+def _continues(line: str) -> bool:
+    return (len(line) - len(line.rstrip("\\"))) % 2 == 1
+
+
+def _split_property(line: str) -> tuple[str, str]:
+    i = 0
+    while i < len(line):
+        ch = line[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch in "=: \t\f":
+            break
+        i += 1
+    key = line[:i]
+    rest = line[i:].lstrip(" \t\f")
+    if rest[:1] in ("=", ":"):
+        rest = rest[1:].lstrip(" \t\f")
+    return key, rest
+
+
+_ESCAPES = {"t": "\t", "n": "\n", "r": "\r", "f": "\f"}
+
+
+def _unescape(text: str) -> str:
+    if "\\" not in text:
+        return text
+    out = []
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch == "\\" and i + 1 < len(text):
+            nxt = text[i + 1]
+            if nxt == "u" and i + 6 <= len(text):
+                try:
+                    out.append(chr(int(text[i + 2:i + 6], 16)))
+                    i += 6
+                    continue
+                except ValueError:
+                    pass
+            out.append(_ESCAPES.get(nxt, nxt))
+            i += 2
+            continue
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+@dataclass
+class Fixtures:
+    """Input message and expected output of an example."""
+
+    body: Optional[str] = None
+    body_encoding: str = "text"
+    body_file: Optional[str] = None
+    headers: dict[str, str] = field(default_factory=dict)
+    properties: dict[str, str] = field(default_factory=dict)
+    credentials: dict[str, dict[str, str]] = field(default_factory=dict)
+    expected_body: Optional[str] = None
+    expected_headers: Optional[dict[str, str]] = None
+    expected_properties: Optional[dict[str, str]] = None
+
+    @property
+    def has_expectations(self) -> bool:
+        return (
+            self.expected_body is not None
+            or self.expected_headers is not None
+            or self.expected_properties is not None
+        )
+
+
+def is_fixture_name(name: str) -> bool:
+    """Whether a file name is an input/expected fixture the runner uses."""
+    return name.startswith(("input.body.", "expected.body.", "expected.header", "expected.properties")) \
+        or name in ("input.header", "input.headers", "input.properties", "input.credentials")
+
+
+def parse_fixtures(files: dict[str, str]) -> Fixtures:
+    """Build Fixtures from fixture file names and their text contents."""
+    fixtures = Fixtures()
+    for name in sorted(files):
+        text = files[name]
+        if name.startswith("input.body."):
+            fixtures.body_file = name
+            if name.endswith(".base64.txt"):
+                # Binary payload; the worker decodes it back to bytes
+                fixtures.body = "".join(text.split())
+                fixtures.body_encoding = "base64"
+            else:
+                fixtures.body = text
+        elif name in ("input.header", "input.headers"):
+            fixtures.headers = parse_properties(text)
+        elif name == "input.properties":
+            fixtures.properties = parse_properties(text)
+        elif name == "input.credentials":
+            for key, value in parse_properties(text).items():
+                alias, _, part = key.rpartition(".")
+                if part not in ("username", "password") or not alias:
+                    raise ValueError(f"input.credentials: expected <alias>.username or <alias>.password, got '{key}'")
+                fixtures.credentials.setdefault(alias, {})[part] = value
+        elif name.startswith("expected.body."):
+            fixtures.expected_body = text
+        elif name.startswith("expected.header"):
+            fixtures.expected_headers = parse_properties(text)
+        elif name.startswith("expected.properties"):
+            fixtures.expected_properties = parse_properties(text)
+    return fixtures
+
+
+def load_fixtures(example_dir: Path) -> Fixtures:
+    """Read the input/expected fixture files of an example folder."""
+    files = {}
+    for path in sorted(example_dir.iterdir()):
+        if not path.is_file() or not is_fixture_name(path.name):
+            continue
+        note_file_read(path.stat().st_size)
+        encoding = "ascii" if path.name.endswith(".base64.txt") else "utf-8"
+        files[path.name] = path.read_text(encoding=encoding)
+    return parse_fixtures(files)
+
+
+def _normalize_text(text: str) -> str:
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def _canonical_xml(text: str) -> Optional[str]:
+    try:
+        return ET.canonicalize(text.strip(), strip_text=True)
+    except (ET.ParseError, ValueError):
+        return None
+
+
+def bodies_match(expected: str, actual: str) -> bool:
+    """Compare bodies ignoring line endings, trailing whitespace and XML formatting."""
+    if _normalize_text(expected) == _normalize_text(actual):
+        return True
+    canonical = _canonical_xml(expected)
+    return canonical is not None and canonical == _canonical_xml(actual)
+
+
+def compare_values(kind: str, expected: dict[str, str], actual: dict[str, Optional[str]]) -> list[str]:
+    """Differences for every expected header/property (extra keys are allowed)."""
+    failures = []
+    for key, value in expected.items():
+        if key not in actual:
+            failures.append(f"{kind} '{key}' missing (expected {value!r})")
+        elif actual[key] != value:
+            failures.append(f"{kind} '{key}' is {actual[key]!r}, expected {value!r}")
+    return failures
+
+
+@dataclass
+class RunResult:
+    """Outcome of running an example's script once."""
+
+    name: str
+    status: str  # passed, failed, error, unchecked or skipped
+    elapsed_ms: float = 0.0
+    failures: list[str] = field(default_factory=list)
+    body: Optional[str] = None
+    body_encoding: str = "text"
+    headers: dict[str, Optional[str]] = field(default_factory=dict)
+    properties: dict[str, Optional[str]] = field(default_factory=dict)
+    log: list[dict] = field(default_factory=list)
+    stdout: str = ""
+    error: Optional[str] = None
+    trace: Optional[str] = None
+    profile: Optional[dict] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("passed", "unchecked")
+
+
+def check_result(name: str, fixtures: Fixtures, response: dict) -> RunResult:
+    """Turn a worker response into a RunResult judged against the fixtures."""
+    result = RunResult(
+        name=name,
+        status="error",
+        elapsed_ms=float(response.get("elapsedMs") or 0.0),
+        body=response.get("body"),
+        body_encoding=response.get("bodyEncoding") or "text",
+        headers=response.get("headers") or {},
+        properties=response.get("properties") or {},
+        log=response.get("log") or [],
+        stdout=response.get("stdout") or "",
+        error=response.get("error"),
+        trace=response.get("trace"),
+        profile=response.get("profile"),
+    )
+    if not response.get("ok"):
+        if response.get("missing"):
+            result.status = "skipped"
+            result.error = f"Needs classes that are not on the classpath: {', '.join(response['missing'])}"
+        return result
+    if not fixtures.has_expectations:
+        result.status = "unchecked"
+        return result
+
+    if fixtures.expected_body is not None:
+        actual = result.body or ""
+        if result.body_encoding == "base64":
+            actual = base64.b64decode(actual).decode("utf-8", errors="replace")
+        if not bodies_match(fixtures.expected_body, actual):
+            result.failures.append("body differs from expected")
+    if fixtures.expected_headers is not None:
+        result.failures.extend(compare_values("header", fixtures.expected_headers, result.headers))
+    if fixtures.expected_properties is not None:
+        result.failures.extend(compare_values("property", fixtures.expected_properties, result.properties))
+    result.status = "failed" if result.failures else "passed"
+    return result
+
+
+def find_groovy(command: str = GROOVY_COMMAND) -> str:
+    """Resolve the groovy launcher or raise ValueError when it is not installed."""
+    resolved = shutil.which(command)
+    if resolved is None:
+        raise ValueError(
+            f"Groovy runtime not found ('{command}'). Install Groovy or set SAP_GROOVY_MCP_GROOVY."
+        )
+    return resolved
+
+
+class GroovyWorker:
+    """One warm JVM speaking the JSON-lines protocol of Runner.groovy.
+
+    ``jvm_options`` (e.g. a heap cap) are passed through ``JAVA_OPTS``,
+    after any set in the environment so that they take precedence.
+    """
+
+    def __init__(self, groovy: str, jvm_options: tuple[str, ...] = ()):
+        self.groovy = groovy
+        self.jvm_options = jvm_options
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self._next_id = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self) -> None:
+        env = None
+        if self.jvm_options:
+            env = dict(os.environ, JAVA_OPTS=" ".join([os.environ.get("JAVA_OPTS", ""), *self.jvm_options]).strip())
+        self.process = await asyncio.create_subprocess_exec(
+            self.groovy, "-cp", str(MOCKS_DIR), str(RUNNER_SCRIPT),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=MAX_RESPONSE_BYTES,
+            env=env,
+        )
+        try:
+            ready = await asyncio.wait_for(self._read(), WORKER_START_TIMEOUT)
+        except BaseException:
+            await self.close()
+            raise
+        if not ready.get("ready"):
+            await self.close()
+            raise RuntimeError(f"Groovy worker failed to start: {ready}")
+
+    async def _read(self) -> dict:
+        assert self.process is not None and self.process.stdout is not None
+        line = await self.process.stdout.readline()
+        if not line:
+            raise RuntimeError(f"Groovy worker exited (code {self.process.returncode})")
+        return json.loads(line)
+
+    async def call(self, request: dict, timeout: float = RUN_TIMEOUT) -> dict:
+        """Send one request and wait for its response."""
+        assert self.process is not None and self.process.stdin is not None
+        self._next_id += 1
+        request = dict(request, id=self._next_id)
+        self.process.stdin.write(json.dumps(request).encode("utf-8") + b"\n")
+        await self.process.stdin.drain()
+        response = await asyncio.wait_for(self._read(), timeout)
+        if response.get("id") != request["id"]:
+            raise RuntimeError("Groovy worker answered out of order")
+        return response
+
+    async def close(self) -> None:
+        if self.process is None:
+            return
+        if self.process.returncode is None:
+            self.process.kill()
+            await self.process.wait()
+        self.process = None
+
+
+class GroovyWorkerPool:
+    """A fixed number of warm workers, started on demand.
+
+    A worker that times out, crashes or runs out of memory is discarded and
+    replaced by a fresh one on the next request, so a runaway script cannot
+    block the pool.
+    """
+
+    def __init__(self, size: int = JVM_WORKERS, groovy: str = GROOVY_COMMAND, jvm_options: tuple[str, ...] = ()):
+        self.size = max(1, size)
+        self.groovy = groovy
+        self.jvm_options = tuple(jvm_options)
+        self._idle: asyncio.Queue[GroovyWorker] = asyncio.Queue()
+        self._workers: set[GroovyWorker] = set()
+        self._slots = asyncio.Semaphore(self.size)
+
+    async def _acquire(self) -> GroovyWorker:
+        await self._slots.acquire()
+        try:
+            if not self._idle.empty():
+                return self._idle.get_nowait()
+            worker = GroovyWorker(find_groovy(self.groovy), self.jvm_options)
+            await worker.start()
+            self._workers.add(worker)
+            return worker
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def call(self, request: dict, timeout: float = RUN_TIMEOUT) -> dict:
+        worker = await self._acquire()
+        healthy = False
+        try:
+            response = await worker.call(request, timeout)
+            # A JVM that ran out of memory may be left in a broken state
+            healthy = "OutOfMemoryError" not in (response.get("error") or "")
+            return response
+        finally:
+            if healthy and worker.alive:
+                self._idle.put_nowait(worker)
+            else:
+                self._workers.discard(worker)
+                await worker.close()
+            self._slots.release()
+
+    async def close(self) -> None:
+        workers = list(self._workers)
+        self._workers.clear()
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for worker in workers:
+            await worker.close()
+
+
+class ExampleRunner:
+    """Runs examples on a worker pool and checks them against their fixtures.
+
+    ``run`` is an awaitable executor (e.g. ``AsyncFileAccess.run``) used to read
+    the fixture files off the event loop.
+    """
+
+    def __init__(self, pool: GroovyWorkerPool, run: Optional[Callable] = None):
+        self.pool = pool
+        self._run_blocking = run or asyncio.to_thread
+
+    async def run(
+        self,
+        example: Example,
+        function: str = "processData",
+        timeout: float = RUN_TIMEOUT,
+        fixtures: Optional[Fixtures] = None,
+        profile: bool = False,
+    ) -> RunResult:
+        """Run an example against its own fixtures, or the given ones.
+
+        With ``profile`` the worker measures allocation, heap and RSS and
+        returns the output size instead of the body.
+        """
+        if fixtures is None:
+            fixtures = await self._run_blocking(load_fixtures, example.path)
+        request = {"script": str(example.path / example.script_name), "profile": profile}
+        return await self._call(example.name, request, fixtures, function, timeout)
+
+    async def run_source(
+        self,
+        name: str,
+        source: str,
+        fixtures: Fixtures,
+        function: str = "processData",
+        timeout: float = RUN_TIMEOUT,
+    ) -> RunResult:
+        """Run Groovy source that is not in the catalog; workers cache it by content hash."""
+        request = {"source": source, "hash": content_hash(source)}
+        return await self._call(name, request, fixtures, function, timeout)
+
+    async def _call(self, name: str, request: dict, fixtures: Fixtures, function: str, timeout: float) -> RunResult:
+        request.update({
+            "function": function,
+            "body": fixtures.body,
+            "bodyEncoding": fixtures.body_encoding,
+            "headers": fixtures.headers,
+            "properties": fixtures.properties,
+            "credentials": fixtures.credentials,
+        })
+        started = time.perf_counter()
+        try:
+            response = await self.pool.call(request, timeout)
+        except asyncio.TimeoutError:
+            return RunResult(name, "error", (time.perf_counter() - started) * 1000,
+                             error=f"Timed out after {timeout:g}s")
+        except RuntimeError as e:
+            return RunResult(name, "error", (time.perf_counter() - started) * 1000, error=str(e))
+        return check_result(name, fixtures, response)
+
+    async def run_many(self, examples: Iterable[Example]) -> list[RunResult]:
+        """Run examples concurrently, one per pool worker at a time."""
+        return list(await asyncio.gather(*(self.run(example) for example in examples)))
+
+
+def has_fixtures(example: Example) -> bool:
+    return any(f.startswith(("input.", "expected.")) for f in example.fixtures)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from catalog import ExampleCatalog
+
+    parser = argparse.ArgumentParser(description="Run SAP CPI Groovy examples against their fixtures")
+    parser.add_argument("names", nargs="*", help="examples to run")
+    parser.add_argument("--all", action="store_true", help="run every example that ships fixtures")
+    parser.add_argument("--base-dir", type=Path, default=Path(__file__).parent)
+    parser.add_argument("--workers", type=int, default=JVM_WORKERS, help="warm JVM workers")
+    parser.add_argument("--groovy", default=GROOVY_COMMAND, help="groovy launcher")
+    args = parser.parse_args(argv)
+
+    catalog = ExampleCatalog(args.base_dir)
+    catalog.load()
+    if args.all:
+        examples = [e for e in catalog.examples() if has_fixtures(e)]
+    elif args.names:
+        examples = [catalog.get(name) for name in args.names]
+    else:
+        parser.error("give example names or --all")
+
+    async def run_all() -> list[RunResult]:
+        pool = GroovyWorkerPool(args.workers, args.groovy)
+        try:
+            return await ExampleRunner(pool).run_many(examples)
+        finally:
+            await pool.close()
+
+    try:
+        find_groovy(args.groovy)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    results = asyncio.run(run_all())
+    for result in results:
+        print(f"{result.status.upper():9} {result.name} ({result.elapsed_ms:.0f} ms)")
+        for failure in result.failures:
+            print(f"          - {failure}")
+        if result.error:
+            print(f"          - {result.error}")
+    failed = sum(1 for r in results if r.status in ("failed", "error"))
+    skipped = sum(1 for r in results if r.status == "skipped")
+    print(f"{len(results) - failed - skipped}/{len(results)} ok, {skipped} skipped "
+          f"in {time.perf_counter() - started:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
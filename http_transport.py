@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Streamable HTTP transport for serving many MCP sessions from one process.
+
+All sessions share the server's catalog and indexes. Requests are admitted
+through a limiter: at most ``max_active`` POST requests are processed at a
+time, up to ``max_queued`` more wait for a slot, and anything beyond that is
+answered immediately with 503 and ``Retry-After`` so clients back off instead
+of piling up. GET (server-to-client stream) and DELETE requests bypass the
+limiter.
+
+Requires the MCP SDK's streamable HTTP support (mcp >= 1.8), which brings in
+starlette and uvicorn.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+from typing import TYPE_CHECKING
+
+import uvicorn
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+if TYPE_CHECKING:
+    from mcp_server import SAPGroovyMCPServer
+
+logger = logging.getLogger("sap-groovy-mcp")
+
+
+class RequestLimiter:
+    """ASGI middleware bounding concurrently processed requests."""
+
+    def __init__(self, app, max_active: int, max_queued: int, retry_after: int = 1):
+        self.app = app
+        self.max_active = max_active
+        self.max_queued = max_queued
+        self.retry_after = retry_after
+        self.active = 0
+        self.queued = 0
+        self.rejected = 0
+        self._slots = asyncio.Semaphore(max_active)
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        if self.active >= self.max_active and self.queued >= self.max_queued:
+            self.rejected += 1
+            await self._reject(send)
+            return
+        self.queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.queued -= 1
+        self.active += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.active -= 1
+            self._slots.release()
+
+    async def _reject(self, send) -> None:
+        body = json.dumps({
+            "jsonrpc": "2.0",
+            "id": None,
+            "error": {"code": -32000, "message": "Server busy, retry later"},
+        }).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"retry-after", str(self.retry_after).encode("ascii")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def create_app(
+    server: "SAPGroovyMCPServer",
+    stateless: bool = False,
+    max_active: int = 128,
+    max_queued: int = 512,
+) -> Starlette:
+    """ASGI app serving MCP at /mcp and a health check at /healthz."""
+    manager = StreamableHTTPSessionManager(app=server.server, stateless=stateless)
+    limiter = RequestLimiter(manager.handle_request, max_active, max_queued)
+
+    async def health(request: Request) -> JSONResponse:
+        return JSONResponse({
+            "status": "ok",
+            "examples": len(server.catalog.names()),
+            "active_requests": limiter.active,
+            "queued_requests": limiter.queued,
+            "rejected_requests": limiter.rejected,
+        })
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette):
+        async with manager.run():
+            logger.info("Streamable HTTP transport ready")
+            yield
+        logger.info("Streamable HTTP sessions closed")
+
+    app = Starlette(
+        routes=[Route("/mcp", endpoint=limiter), Route("/healthz", endpoint=health)],
+        lifespan=lifespan,
+    )
+    app.state.limiter = limiter
+    return app
+
+
+def create_uvicorn_server(app: Starlette, host: str, port: int, shutdown_timeout: float) -> uvicorn.Server:
+    """Uvicorn server that drains in-flight requests for up to shutdown_timeout on SIGINT/SIGTERM."""
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        log_level="warning",
+        timeout_graceful_shutdown=shutdown_timeout,
+    )
+    return uvicorn.Server(config)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk snapshot of the example catalog.
+
+The snapshot is a versioned SQLite file holding, per example, the file
+signature (name, mtime, size), content hashes, text contents and parsed
+metadata. At startup the catalog reuses every record whose signature still
+matches the folder on disk and only re-reads the stale ones. Examples are
+stored by folder name, relative to the examples directory, so a cache built
+elsewhere (e.g. in CI) is reused wherever the examples are deployed.
+
+Prebuild the cache (e.g. in CI) with:
+
+    python index_cache.py build [--base-dir DIR] [--cache FILE]
+"""
+
+import argparse
+import json
+import logging
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from catalog import Example, ExampleCatalog
+from metadata import Metadata
+
+logger = logging.getLogger("sap-groovy-mcp")
+
+# Bump whenever the stored record layout changes
+CACHE_VERSION = "2"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_info (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS examples (
+    name TEXT PRIMARY KEY,
+    signature TEXT NOT NULL,
+    hashes TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    meta_text TEXT,
+    readme TEXT,
+    scripts TEXT NOT NULL
+);
+"""
+
+
+class CatalogCache:
+    """SQLite-backed store of Example records."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _is_current(self, conn: sqlite3.Connection) -> bool:
+        info = dict(conn.execute("SELECT key, value FROM cache_info"))
+        return info.get("version") == CACHE_VERSION
+
+    def load(self, base_dir: Path, prefix: str = "") -> dict[str, Example]:
+        """Return cached examples, or an empty dict if the cache is missing or outdated.
+
+        ``prefix`` is the namespace prefix of the stored names, which is not
+        part of the folder names.
+        """
+        if not self.path.exists():
+            return {}
+        try:
+            conn = sqlite3.connect(self.path)
+            try:
+                conn.executescript(_SCHEMA)
+                if not self._is_current(conn):
+                    logger.info(f"Ignoring outdated index cache {self.path}")
+                    return {}
+                rows = conn.execute(
+                    "SELECT name, signature, hashes, metadata, meta_text, readme, scripts FROM examples"
+                ).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read index cache {self.path}: {e}")
+            return {}
+
+        examples = {}
+        for name, signature, hashes, metadata, meta_text, readme, scripts in rows:
+            signature = tuple(tuple(entry) for entry in json.loads(signature))
+            examples[name] = Example(
+                name=name,
+                path=base_dir / name[len(prefix):],
+                scripts=json.loads(scripts),
+                readme=readme,
+                meta_text=meta_text,
+                metadata=Metadata.from_dict(json.loads(metadata)),
+                files=[entry[0] for entry in signature],
+                signature=signature,
+                hashes=json.loads(hashes),
+            )
+        return examples
+
+    def save(self, examples: list[Example], removed: Optional[set[str]] = None, replace: bool = False) -> None:
+        """Write changed examples (and drop removed ones) to the cache."""
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    if replace or not self._is_current(conn):
+                        conn.execute("DELETE FROM examples")
+                        conn.execute("DELETE FROM cache_info")
+                        conn.executemany(
+                            "INSERT INTO cache_info (key, value) VALUES (?, ?)",
+                            [("version", CACHE_VERSION)],
+                        )
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO examples VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (
+                                ex.name,
+                                json.dumps(ex.signature),
+                                json.dumps(ex.hashes),
+                                json.dumps(ex.metadata.to_dict(), default=str),
+                                ex.meta_text,
+                                ex.readme,
+                                json.dumps(ex.scripts),
+                            )
+                            for ex in examples
+                        ],
+                    )
+                    if removed:
+                        conn.executemany("DELETE FROM examples WHERE name = ?", [(n,) for n in removed])
+            finally:
+                conn.close()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Failed to write index cache {self.path}: {e}")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command line entry point."""
+    from mcp_server import BASE_DIR, INDEX_CACHE_PATH
+
+    parser = argparse.ArgumentParser(description="Manage the SAP Groovy MCP index cache")
+    parser.add_argument("command", choices=["build"], help="build: (re)create the cache from scratch")
+    parser.add_argument("--base-dir", type=Path, default=BASE_DIR, help="Examples directory")
+    parser.add_argument("--cache", type=Path, default=INDEX_CACHE_PATH, help="Cache file to write")
+    args = parser.parse_args(argv)
+
+    if args.cache is None:
+        parser.error("no cache path configured; pass --cache")
+
+    start = time.perf_counter()
+    base_dir = args.base_dir.resolve()
+    catalog = ExampleCatalog(base_dir)
+    catalog.load()
+    CatalogCache(args.cache).save(catalog.examples(), replace=True)
+    elapsed = time.perf_counter() - start
+    print(f"Cached {len(catalog)} examples in {args.cache} ({elapsed:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
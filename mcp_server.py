@@ -5,11 +5,14 @@ SAP Cloud Integration Groovy Examples MCP Server
 This MCP server provides tools to explore and understand SAP CPI Groovy script examples.
 """
 
+import argparse
 import asyncio
+import base64
 import json
 import logging
+import os
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 import yaml
 
 from mcp.server.models import InitializationOptions
@@ -21,98 +24,358 @@ from mcp.types import (
     TextContent,
     ImageContent,
     EmbeddedResource,
-    LoggingLevel
+    ListResourcesRequest,
+    ListResourcesResult,
+    LoggingLevel,
+    ServerCapabilities,
+    SubscribeRequest,
 )
 
+from async_io import AsyncFileAccess
+from catalog import Example, ExampleCatalog
+from content_cache import ContentCache
+from facet_index import FACETS, FacetIndex
+from federation import DEFAULT_ROOT, FederatedCatalog, MergedSearchIndex, RootSpec, load_roots
+import fixture_reader
+import paging
+import payload_generator
+import profiler
+from groovy_parser import content_hash, source_bytes, summarize, summary_cache_info
+from groovy_runner import (
+    ExampleRunner, Fixtures, GroovyWorkerPool, JVM_WORKERS, find_groovy, is_fixture_name, load_fixtures, parse_fixtures,
+)
+from index_cache import CatalogCache
+from metrics import Metrics, serve_prometheus, write_prometheus_file
+from script_diff import diff_cache_info, diff_scripts
+from script_lint import RULES, SEVERITIES, lint_cache_info, lint_example, method_name
+from similarity import SimilarityIndex
+from subscriptions import ResourceSubscriptions, resource_changes
+from xref_index import KINDS as SYMBOL_KINDS, CrossReferenceIndex
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("sap-groovy-mcp")
 
 # Base directory for examples
-BASE_DIR = Path(__file__).parent
+BASE_DIR = Path(os.environ.get("SAP_GROOVY_MCP_EXAMPLES_DIR") or Path(__file__).parent)
+
+# Seconds between checks of the examples for changed files
+CATALOG_POLL_INTERVAL = float(os.environ.get("SAP_GROOVY_MCP_POLL_INTERVAL", "2.0"))
+
+# On-disk catalog snapshot; set SAP_GROOVY_MCP_CACHE to an empty string to disable
+_cache_setting = os.environ.get("SAP_GROOVY_MCP_CACHE", str(BASE_DIR / ".cache" / "catalog.sqlite"))
+INDEX_CACHE_PATH = Path(_cache_setting) if _cache_setting else None
+
+# Additional example roots (YAML file, see federation.py) and the folder their
+# extracted files and caches are kept in
+ROOTS_FILE = os.environ.get("SAP_GROOVY_MCP_ROOTS")
+ROOTS_WORK_DIR = Path(os.environ.get("SAP_GROOVY_MCP_ROOTS_DIR") or BASE_DIR / ".cache" / "roots")
+
+# Folder generate_payload writes its files to
+PAYLOAD_DIR = Path(os.environ.get("SAP_GROOVY_MCP_PAYLOAD_DIR") or BASE_DIR / ".cache" / "payloads")
+
+# Worker threads for blocking file I/O and the per-request time limit in seconds
+IO_WORKERS = int(os.environ.get("SAP_GROOVY_MCP_IO_WORKERS", "8"))
+REQUEST_TIMEOUT = float(os.environ.get("SAP_GROOVY_MCP_REQUEST_TIMEOUT", "30"))
+# Time limit in seconds for building a lazily built index over the whole corpus
+INDEX_BUILD_TIMEOUT = float(os.environ.get("SAP_GROOVY_MCP_INDEX_BUILD_TIMEOUT", "600"))
+
+# Tool calls executed at once across all sessions; further calls wait (within their timeout)
+TOOL_CONCURRENCY = int(os.environ.get("SAP_GROOVY_MCP_TOOL_CONCURRENCY", "32"))
+
+# Transport: "stdio" (one client) or "http" (streamable HTTP, many sessions)
+TRANSPORT = os.environ.get("SAP_GROOVY_MCP_TRANSPORT", "stdio")
+HTTP_HOST = os.environ.get("SAP_GROOVY_MCP_HTTP_HOST", "127.0.0.1")
+HTTP_PORT = int(os.environ.get("SAP_GROOVY_MCP_HTTP_PORT", "8000"))
+HTTP_STATELESS = os.environ.get("SAP_GROOVY_MCP_HTTP_STATELESS", "").lower() in ("1", "true", "yes")
+HTTP_MAX_ACTIVE = int(os.environ.get("SAP_GROOVY_MCP_HTTP_MAX_ACTIVE", "128"))
+HTTP_MAX_QUEUED = int(os.environ.get("SAP_GROOVY_MCP_HTTP_MAX_QUEUED", "512"))
+SHUTDOWN_TIMEOUT = float(os.environ.get("SAP_GROOVY_MCP_SHUTDOWN_TIMEOUT", "10"))
+
+# Maximum unified diff lines shown by compare_examples
+COMPARE_MAX_DIFF_LINES = 400
+
+# Batch tools: parallel workers, examples per call and default output cap
+BATCH_CONCURRENCY = int(os.environ.get("SAP_GROOVY_MCP_BATCH_CONCURRENCY", "8"))
+BATCH_MAX_EXAMPLES = 100
+BATCH_MAX_CHARS = 200_000
+
+# list_examples paging and output cap; examples per resources/list page
+LIST_DEFAULT_LIMIT = 100
+LIST_MAX_LIMIT = 1000
+LIST_MAX_CHARS = 100_000
+LIST_FIELDS = ("name", "description", "author", "tags")
+RESOURCES_PAGE_SIZE = 50
+
+# Optional Prometheus export: file rewritten every METRICS_INTERVAL seconds, and/or a local HTTP port
+METRICS_FILE = os.environ.get("SAP_GROOVY_MCP_METRICS_FILE")
+METRICS_PORT = int(os.environ.get("SAP_GROOVY_MCP_METRICS_PORT", "0"))
+METRICS_INTERVAL = 15.0
+
+# Largest fixture range returned by read_fixture or a fixture resource
+FIXTURE_MAX_BYTES = 256 * 1024
+
+# Largest inline script (and total inline fixtures) accepted in place of an example
+INLINE_SCRIPT_MAX_BYTES = 1024 * 1024
+INLINE_FIXTURES_MAX_BYTES = 8 * 1024 * 1024
+
+# run_example executes pasted Groovy with the server's privileges, so it is off
+# unless the operator enables it
+ALLOW_PASTED_SCRIPTS = os.environ.get("SAP_GROOVY_MCP_ALLOW_PASTED_SCRIPTS", "").lower() in ("1", "true", "yes")
+
+# Memory budget for rendered get_example/analyze_script/compare_examples responses
+RESPONSE_CACHE_BYTES = int(float(os.environ.get("SAP_GROOVY_MCP_RESPONSE_CACHE_MB", "32")) * 1024 * 1024)
+
+class SubscribableServer(Server):
+    """Server that advertises resource subscriptions and list_changed
+    notifications, which the SDK always reports as unsupported."""
+    
+    def get_capabilities(
+        self,
+        notification_options: NotificationOptions,
+        experimental_capabilities: dict[str, dict[str, Any]],
+    ) -> ServerCapabilities:
+        capabilities = super().get_capabilities(notification_options, experimental_capabilities)
+        if capabilities.resources is not None and SubscribeRequest in self.request_handlers:
+            capabilities.resources.subscribe = True
+            capabilities.resources.listChanged = True
+        return capabilities
 
 class SAPGroovyMCPServer:
-    def __init__(self):
-        self.server = Server("sap-groovy-mcp")
+    def __init__(
+        self,
+        base_dir: Path = BASE_DIR,
+        cache_path: Optional[Path] = INDEX_CACHE_PATH,
+        roots: Optional[list[RootSpec]] = None,
+        roots_dir: Path = ROOTS_WORK_DIR,
+    ):
+        self.server = SubscribableServer("sap-groovy-mcp")
+        self.metrics = Metrics()
+        self.tool_slots = asyncio.Semaphore(TOOL_CONCURRENCY)
+        self.metrics.add_cache("script_summaries", summary_cache_info)
+        self.metrics.add_cache("script_diffs", diff_cache_info)
+        self.metrics.add_cache("script_lints", lint_cache_info)
+        self.metrics.add_cache("fixture_line_indexes", fixture_reader.line_index_cache_info)
+        self.responses: ContentCache[str] = ContentCache(RESPONSE_CACHE_BYTES)
+        self.metrics.add_cache("tool_responses", self.responses.info)
+        self.io = AsyncFileAccess(IO_WORKERS, REQUEST_TIMEOUT)
+        cache = CatalogCache(cache_path) if cache_path is not None else None
+        if roots is None:
+            roots = load_roots(Path(ROOTS_FILE)) if ROOTS_FILE else []
+        self.catalog = FederatedCatalog(ExampleCatalog(base_dir, cache), roots, roots_dir, cache_path is not None)
+        self.catalog.load()
+        self.search_index = MergedSearchIndex(self.catalog.namespace_of)
+        self.search_index.build(self.catalog.examples())
+        # Built on first use; parsing every script is not needed to start serving
+        self.similarity: Optional[SimilarityIndex] = None
+        self.facets: Optional[FacetIndex] = None
+        self.xref: Optional[CrossReferenceIndex] = None
+        # Builds in progress, shared by concurrent first callers, and the
+        # examples changed while each one runs
+        self._index_builds: dict[str, asyncio.Future] = {}
+        self._index_pending: dict[str, set[str]] = {}
+        # JVM workers are only started when run_example is first used
+        self.runner: Optional[ExampleRunner] = None
+        # profile_script gets its own heap-capped worker
+        self.profile_runner: Optional[ExampleRunner] = None
+        # Records last announced to subscribers, to tell which resources changed
+        self.subscriptions = ResourceSubscriptions()
+        self.published = {ex.name: ex for ex in self.catalog.examples()}
+        self.catalog.add_listener(self._on_catalog_change)
         self.setup_handlers()
+    
+    def _on_catalog_change(self, names: set[str]) -> None:
+        """Keep derived indexes in sync with changed examples."""
+        changes = {name: self.catalog.find(name) for name in names}
+        self.search_index.update(changes)
+        for pending in self._index_pending.values():
+            pending |= names
+        if self.similarity is not None:
+            self.similarity.update(changes)
+        if self.facets is not None:
+            self.facets.update(changes)
+        if self.xref is not None:
+            self.xref.update(changes)
+        updated, list_changed = set(), False
+        for name, example in changes.items():
+            uris, listing = resource_changes(self.published.pop(name, None), example)
+            if example is not None:
+                self.published[name] = example
+            updated |= uris
+            list_changed = list_changed or listing
+        self.subscriptions.publish(updated, list_changed)
+    
+    async def _lazy_index(self, attr: str, create: Callable[[], Any]) -> Any:
+        """The index stored in ``attr``, built in a worker thread on first use."""
+        index = getattr(self, attr)
+        if index is not None:
+            return index
+        build = self._index_builds.get(attr)
+        if build is None:
+            build = self._index_builds[attr] = asyncio.ensure_future(self._build_index(attr, create))
+        # A caller that times out must not cancel the build others wait for
+        return await asyncio.shield(build)
+    
+    async def _build_index(self, attr: str, create: Callable[[], Any]) -> Any:
+        pending = self._index_pending[attr] = set()
+        try:
+            index = create()
+            await self.io.run(index.build, self.catalog.examples(), timeout=INDEX_BUILD_TIMEOUT)
+            if pending:
+                # Catalog changes applied while the build ran
+                index.update({name: self.catalog.find(name) for name in pending})
+            setattr(self, attr, index)
+            return index
+        finally:
+            del self._index_pending[attr]
+            del self._index_builds[attr]
+    
+    async def _similarity_index(self) -> SimilarityIndex:
+        return await self._lazy_index("similarity", SimilarityIndex)
+    
+    async def _facet_index(self) -> FacetIndex:
+        return await self._lazy_index("facets", FacetIndex)
+    
+    async def _xref_index(self) -> CrossReferenceIndex:
+        return await self._lazy_index("xref", CrossReferenceIndex)
+    
+    def _example_runner(self) -> ExampleRunner:
+        if self.runner is None:
+            find_groovy()
+            self.runner = ExampleRunner(GroovyWorkerPool(JVM_WORKERS), self.io.run)
+        return self.runner
+    
+    def _profile_runner(self) -> ExampleRunner:
+        if self.profile_runner is None:
+            find_groovy()
+            self.profile_runner = ExampleRunner(profiler.profiling_pool(), self.io.run)
+        return self.profile_runner
         
-    def setup_handlers(self):
-        @self.server.list_resources()
-        async def handle_list_resources() -> list[Resource]:
-            """List all available Groovy example resources."""
-            resources = []
+    def list_resources_page(self, cursor: Optional[str] = None) -> ListResourcesResult:
+        """One page of resources, cursor-paginated by example name."""
+        examples = self.catalog.examples()
+        start = paging.page_start([ex.name for ex in examples], cursor)
+        page = examples[start:start + RESOURCES_PAGE_SIZE]
+        resources = []
+        
+        for example in page:
+            example_name = example.name
+            
+            # Add script resource
+            resources.append(
+                Resource(
+                    uri=f"groovy://examples/{example_name}/script",
+                    name=f"{example_name} - Script",
+                    description=f"Groovy script for {example_name}",
+                    mimeType="text/x-groovy"
+                )
+            )
             
-            # Scan all directories for script.groovy files
-            for groovy_file in BASE_DIR.glob("**/script.groovy"):
-                example_dir = groovy_file.parent
-                example_name = example_dir.name
-                
-                # Add script resource
+            # Add README if exists
+            if example.readme is not None:
                 resources.append(
                     Resource(
-                        uri=f"groovy://examples/{example_name}/script",
-                        name=f"{example_name} - Script",
-                        description=f"Groovy script for {example_name}",
-                        mimeType="text/x-groovy"
+                        uri=f"groovy://examples/{example_name}/readme",
+                        name=f"{example_name} - Documentation",
+                        description=f"Documentation for {example_name}",
+                        mimeType="text/markdown"
                     )
                 )
-                
-                # Add README if exists
-                readme_path = example_dir / "README.md"
-                if readme_path.exists():
-                    resources.append(
-                        Resource(
-                            uri=f"groovy://examples/{example_name}/readme",
-                            name=f"{example_name} - Documentation",
-                            description=f"Documentation for {example_name}",
-                            mimeType="text/markdown"
-                        )
-                    )
-                
-                # Add metadata if exists
-                meta_path = example_dir / "meta.yaml"
-                if meta_path.exists():
-                    resources.append(
-                        Resource(
-                            uri=f"groovy://examples/{example_name}/meta",
-                            name=f"{example_name} - Metadata",
-                            description=f"Metadata for {example_name}",
-                            mimeType="application/yaml"
-                        )
+            
+            # Add metadata if exists
+            if example.meta_text is not None:
+                resources.append(
+                    Resource(
+                        uri=f"groovy://examples/{example_name}/meta",
+                        name=f"{example_name} - Metadata",
+                        description=f"Metadata for {example_name}",
+                        mimeType="application/yaml"
                     )
+                )
             
-            return resources
+            # Fixtures are served in pages; the resource holds the first page
+            for file_name in example.fixtures:
+                resources.append(
+                    Resource(
+                        uri=f"groovy://examples/{example_name}/fixtures/{file_name}",
+                        name=f"{example_name} - {file_name}",
+                        description=f"Fixture {file_name} of {example_name} (first {FIXTURE_MAX_BYTES // 1024} KiB)",
+                        mimeType="text/plain"
+                    )
+                )
+        
+        next_cursor = None
+        if start + len(page) < len(examples):
+            next_cursor = paging.encode_cursor(page[-1].name)
+        return ListResourcesResult(resources=resources, nextCursor=next_cursor)
+    
+    async def read_resource(self, uri: str) -> str:
+        """Read a specific Groovy example resource."""
+        if not uri.startswith("groovy://examples/"):
+            raise ValueError(f"Unknown resource: {uri}")
+        
+        # Parse URI: groovy://examples/{example_name}/{type}
+        parts = uri.replace("groovy://examples/", "").split("/")
+        if len(parts) == 3 and parts[1] == "fixtures":
+            await self.catalog.ensure_loaded([self.catalog.namespace_of(parts[0])], self.io.run)
+            example = self.catalog.get(parts[0])
+            path = fixture_reader.fixture_path(example, parts[2])
+            await self.io.run(self.catalog.ensure_local, example)
+            chunk = await self.io.run(fixture_reader.read_bytes, path, 0, FIXTURE_MAX_BYTES)
+            return chunk.text
+        if len(parts) != 2:
+            raise ValueError(f"Invalid resource URI: {uri}")
+        
+        example_name, resource_type = parts
+        await self.catalog.ensure_loaded([self.catalog.namespace_of(example_name)], self.io.run)
+        example = self.catalog.get(example_name)
+        
+        if resource_type == "script":
+            content = example.script
+        elif resource_type == "readme":
+            content = example.readme
+        elif resource_type == "meta":
+            content = example.meta_text
+        else:
+            raise ValueError(f"Unknown resource type: {resource_type}")
+        
+        if content is None:
+            raise ValueError(f"Resource file not found: {uri}")
+        
+        return content
+    
+    def setup_handlers(self):
+        @self.server.list_resources()
+        async def handle_list_resources(request: ListResourcesRequest) -> ListResourcesResult:
+            """List Groovy example resources, RESOURCES_PAGE_SIZE examples per page."""
+            cursor = request.params.cursor if request.params else None
+            with self.metrics.resource_read("list", "groovy://examples/") as outcome:
+                await self.catalog.ensure_loaded(None, self.io.run)
+                outcome["result"] = self.list_resources_page(cursor)
+            self.subscriptions.watch_list(self.server.request_context.session)
+            return outcome["result"]
+        
+        @self.server.subscribe_resource()
+        async def handle_subscribe(uri) -> None:
+            """Notify the calling session when the resource changes."""
+            uri = str(uri)
+            if not uri.startswith("groovy://examples/"):
+                raise ValueError(f"Unknown resource: {uri}")
+            self.subscriptions.subscribe(self.server.request_context.session, uri)
+        
+        @self.server.unsubscribe_resource()
+        async def handle_unsubscribe(uri) -> None:
+            self.subscriptions.unsubscribe(self.server.request_context.session, str(uri))
         
         @self.server.read_resource()
         async def handle_read_resource(uri: str) -> str:
             """Read a specific Groovy example resource."""
-            if not uri.startswith("groovy://examples/"):
-                raise ValueError(f"Unknown resource: {uri}")
-            
-            # Parse URI: groovy://examples/{example_name}/{type}
+            uri = str(uri)
             parts = uri.replace("groovy://examples/", "").split("/")
-            if len(parts) != 2:
-                raise ValueError(f"Invalid resource URI: {uri}")
-            
-            example_name, resource_type = parts
-            example_dir = BASE_DIR / example_name
-            
-            if not example_dir.exists():
-                raise ValueError(f"Example not found: {example_name}")
-            
-            if resource_type == "script":
-                file_path = example_dir / "script.groovy"
-            elif resource_type == "readme":
-                file_path = example_dir / "README.md"
-            elif resource_type == "meta":
-                file_path = example_dir / "meta.yaml"
-            else:
-                raise ValueError(f"Unknown resource type: {resource_type}")
-            
-            if not file_path.exists():
-                raise ValueError(f"Resource file not found: {file_path}")
-            
-            return file_path.read_text(encoding="utf-8")
+            kind = parts[1] if len(parts) > 1 else "unknown"
+            with self.metrics.resource_read(kind, uri) as outcome:
+                outcome["result"] = await self.read_resource(uri)
+            return outcome["result"]
         
         @self.server.list_tools()
         async def handle_list_tools() -> list[Tool]:
@@ -127,6 +390,28 @@ class SAPGroovyMCPServer:
                             "tag": {
                                 "type": "string",
                                 "description": "Filter examples by tag (e.g., 'beginner', 'xml', 'csv')"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": f"Maximum examples per page (default {LIST_DEFAULT_LIMIT})"
+                            },
+                            "cursor": {
+                                "type": "string",
+                                "description": "Cursor from the previous page"
+                            },
+                            "fields": {
+                                "type": "array",
+                                "items": {"type": "string", "enum": list(LIST_FIELDS)},
+                                "description": "Fields to include (name is always included)"
+                            },
+                            "format": {
+                                "type": "string",
+                                "enum": ["markdown", "json"],
+                                "description": "Output format (default markdown); json is compact and includes nextCursor"
+                            },
+                            "root": {
+                                "type": "string",
+                                "description": f"Only list examples of this root ('{DEFAULT_ROOT}' for the built-in examples)"
                             }
                         }
                     }
@@ -139,7 +424,7 @@ class SAPGroovyMCPServer:
                         "properties": {
                             "example_name": {
                                 "type": "string",
-                                "description": "Name of the example (e.g., 'basic', 'mpl-payload-log')"
+                                "description": "Name of the example (e.g., 'basic', 'mpl-payload-log', or 'team:csv-split' in another root)"
                             }
                         },
                         "required": ["example_name"]
@@ -147,13 +432,25 @@ class SAPGroovyMCPServer:
                 ),
                 Tool(
                     name="search_examples",
-                    description="Search for examples by keyword in documentation and scripts",
+                    description="Search for examples by keyword in documentation and scripts, ranked by relevance",
                     inputSchema={
                         "type": "object",
                         "properties": {
                             "query": {
                                 "type": "string",
-                                "description": "Search query"
+                                "description": "Search query (words or partial identifiers, e.g. 'MessageLog')"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum number of examples to return (default 20)"
+                            },
+                            "offset": {
+                                "type": "integer",
+                                "description": "Number of ranked examples to skip (default 0)"
+                            },
+                            "root": {
+                                "type": "string",
+                                "description": f"Only search this root ('{DEFAULT_ROOT}' for the built-in examples)"
                             }
                         },
                         "required": ["query"]
@@ -161,21 +458,67 @@ class SAPGroovyMCPServer:
                 ),
                 Tool(
                     name="analyze_script",
-                    description="Analyze a Groovy script to extract imports, functions, and key concepts",
+                    description="Analyze an example's Groovy script, or a pasted one, to extract imports, functions, and key concepts",
                     inputSchema={
                         "type": "object",
                         "properties": {
                             "example_name": {
                                 "type": "string",
                                 "description": "Name of the example to analyze"
+                            },
+                            "script": {
+                                "type": "string",
+                                "description": "Groovy source to analyze instead of an example"
                             }
-                        },
-                        "required": ["example_name"]
+                        }
+                    }
+                ),
+                Tool(
+                    name="lint_script",
+                    description="Check Groovy scripts for performance anti-patterns (whole-payload reads, full DOM parsing, "
+                                "unbounded log attachments, ...) with severities, line numbers and streaming alternatives. "
+                                "Lints an example or pasted source; without either, lints the whole catalog (or a tag/root) "
+                                "and summarizes by rule",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "example_name": {
+                                "type": "string",
+                                "description": "Example to lint; omit to lint the corpus"
+                            },
+                            "script": {
+                                "type": "string",
+                                "description": "Groovy source to lint instead of an example"
+                            },
+                            "tag": {
+                                "type": "string",
+                                "description": "Corpus mode: only examples with this tag"
+                            },
+                            "root": {
+                                "type": "string",
+                                "description": f"Corpus mode: only examples of this root ('{DEFAULT_ROOT}' for the built-in examples)"
+                            },
+                            "min_severity": {
+                                "type": "string",
+                                "enum": list(SEVERITIES),
+                                "description": "Lowest severity to report (default info)"
+                            },
+                            "rules": {
+                                "type": "array",
+                                "items": {"type": "string", "enum": sorted(RULES)},
+                                "description": "Only report these rules"
+                            },
+                            "format": {
+                                "type": "string",
+                                "enum": ["markdown", "json"],
+                                "description": "Output format (default markdown)"
+                            }
+                        }
                     }
                 ),
                 Tool(
                     name="compare_examples",
-                    description="Compare two examples to understand differences and similarities",
+                    description="Compare two examples, or an example and a pasted script, to understand differences and similarities",
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -186,9 +529,355 @@ class SAPGroovyMCPServer:
                             "example2": {
                                 "type": "string",
                                 "description": "Second example name"
+                            },
+                            "script1": {
+                                "type": "string",
+                                "description": "Groovy source to use instead of example1"
+                            },
+                            "script2": {
+                                "type": "string",
+                                "description": "Groovy source to use instead of example2"
+                            }
+                        }
+                    }
+                ),
+                Tool(
+                    name="query_examples",
+                    description="Find examples by boolean combinations of facets (tags, imported classes, SAP APIs, "
+                                "input formats, expected fixtures, ...) and count the facet values of the matches",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "all": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Terms every match must have, e.g. 'tag:xml' or "
+                                               "'import:com.sap.it.api.securestore.SecureStoreService'. "
+                                               + "; ".join(f"{facet}: {meaning}" for facet, meaning in FACETS.items())
+                            },
+                            "any": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Terms of which a match must have at least one"
+                            },
+                            "none": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Terms no match may have"
+                            },
+                            "root": {
+                                "type": "string",
+                                "description": f"Only query this root ('{DEFAULT_ROOT}' for the built-in examples)"
+                            },
+                            "facets": {
+                                "type": "array",
+                                "items": {"type": "string", "enum": list(FACETS)},
+                                "description": "Facets to count (default all)"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum example names to return (default 50)"
+                            },
+                            "format": {
+                                "type": "string",
+                                "enum": ["markdown", "json"],
+                                "description": "Output format (default markdown)"
+                            }
+                        }
+                    }
+                ),
+                Tool(
+                    name="find_usages",
+                    description="Find every line where a Java/SAP class or method is used across the example scripts, "
+                                "resolved through each script's imports (e.g. who calls ITApiFactory.getApi)",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "symbol": {
+                                "type": "string",
+                                "description": "A class ('com.sap.it.api.ITApiFactory', or 'ITApiFactory' in any package), "
+                                               "a method ('MessageLog#setStringProperty'), or a prefix ending in '*' "
+                                               "('com.sap.it.api.*'). A class includes the methods called on it."
+                            },
+                            "root": {
+                                "type": "string",
+                                "description": f"Only search this root ('{DEFAULT_ROOT}' for the built-in examples)"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum locations to return (default 100)"
+                            },
+                            "format": {
+                                "type": "string",
+                                "enum": ["markdown", "json"],
+                                "description": "Output format (default markdown)"
+                            }
+                        },
+                        "required": ["symbol"]
+                    }
+                ),
+                Tool(
+                    name="list_symbols",
+                    description="List the Java/SAP classes and methods the example scripts use, most used first",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "prefix": {
+                                "type": "string",
+                                "description": "Only symbols starting with this, e.g. 'com.sap.it.api.'"
+                            },
+                            "kind": {
+                                "type": "string",
+                                "enum": list(SYMBOL_KINDS),
+                                "description": "Only classes or only methods"
+                            },
+                            "root": {
+                                "type": "string",
+                                "description": f"Only count this root ('{DEFAULT_ROOT}' for the built-in examples)"
+                            },
+                            "limit": {
+                                "type": "integer",
+                                "description": "Maximum symbols to return (default 50)"
+                            },
+                            "format": {
+                                "type": "string",
+                                "enum": ["markdown", "json"],
+                                "description": "Output format (default markdown)"
+                            }
+                        }
+                    }
+                ),
+                Tool(
+                    name="find_similar",
+                    description="Find the examples whose scripts are most similar to an example or to a pasted Groovy snippet",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "example_name": {
+                                "type": "string",
+                                "description": "Example to find neighbours of"
+                            },
+                            "script": {
+                                "type": "string",
+                                "description": "Groovy source to find similar examples for"
+                            },
+                            "top_k": {
+                                "type": "integer",
+                                "description": "Number of examples to return (default 5)"
+                            }
+                        }
+                    }
+                ),
+                Tool(
+                    name="read_fixture",
+                    description="Read part of a fixture file (input/expected payloads) by byte range, line range, head/tail, or XML elements selected by an XPath subset",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "example_name": {
+                                "type": "string",
+                                "description": "Name of the example"
+                            },
+                            "file": {
+                                "type": "string",
+                                "description": "Fixture file name, e.g. input.body.xml"
+                            },
+                            "mode": {
+                                "type": "string",
+                                "enum": ["head", "tail", "lines", "bytes", "xpath"],
+                                "description": "How to select the content (default head)"
+                            },
+                            "offset": {
+                                "type": "integer",
+                                "description": "bytes: first byte offset; xpath: number of matches to skip"
+                            },
+                            "length": {
+                                "type": "integer",
+                                "description": f"bytes: number of bytes (default and maximum {FIXTURE_MAX_BYTES})"
+                            },
+                            "start_line": {
+                                "type": "integer",
+                                "description": "lines: first line, 1-based"
+                            },
+                            "count": {
+                                "type": "integer",
+                                "description": "head/tail/lines: number of lines (default 50); xpath: number of elements (default 10)"
+                            },
+                            "xpath": {
+                                "type": "string",
+                                "description": "xpath: element path such as //Item, /Root/Item[2] or //Item[@id='4']"
+                            }
+                        },
+                        "required": ["example_name", "file"]
+                    }
+                ),
+                Tool(
+                    name="run_example",
+                    description="Run an example's script, or a pasted one, locally against input fixtures and check the "
+                                "output against the expected fixtures",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "example_name": {
+                                "type": "string",
+                                "description": "Example to run, or whose fixtures a pasted script runs against"
+                            },
+                            "script": {
+                                "type": "string",
+                                "description": "Groovy source to run instead of the example's script (only when the "
+                                               "server sets SAP_GROOVY_MCP_ALLOW_PASTED_SCRIPTS)"
+                            },
+                            "fixtures": {
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "name": {"type": "string"},
+                                        "content": {"type": "string"}
+                                    },
+                                    "required": ["name", "content"]
+                                },
+                                "description": "Fixtures for a pasted script, named like example files "
+                                               "(input.body.xml, input.headers, expected.body.xml, ...)"
+                            },
+                            "function": {
+                                "type": "string",
+                                "description": "Script function to call (default processData)"
+                            }
+                        }
+                    }
+                ),
+                Tool(
+                    name="profile_script",
+                    description="Measure how an example's run time and memory grow with payload size: runs its script "
+                                "against its input body scaled 1x/10x/100x/1000x and fits a complexity estimate",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "example_name": {
+                                "type": "string",
+                                "description": "Example to profile (needs an input.body.* fixture)"
+                            },
+                            "factors": {
+                                "type": "array",
+                                "items": {"type": "integer"},
+                                "description": "Input scale factors (default [1, 10, 100, 1000])"
+                            },
+                            "repeat": {
+                                "type": "integer",
+                                "description": "Runs per size; the fastest is kept (default 3)"
+                            },
+                            "function": {
+                                "type": "string",
+                                "description": "Script function to call (default processData)"
+                            }
+                        },
+                        "required": ["example_name"]
+                    }
+                ),
+                Tool(
+                    name="generate_payload",
+                    description="Generate a large synthetic input payload from an example's input fixture by repeating its "
+                                "records (XML elements, EDI messages, CSV rows, JSON array items, base64 binary), for load tests",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "example_name": {
+                                "type": "string",
+                                "description": "Example whose input.body.* fixture is the template"
+                            },
+                            "size": {
+                                "type": "string",
+                                "description": f"Approximate payload size, e.g. '64M' or '1G' (at most "
+                                               f"{payload_generator.PAYLOAD_MAX_BYTES // (1024 * 1024)} MiB)"
+                            },
+                            "records": {
+                                "type": "integer",
+                                "description": "Number of records to write (with size, whichever limit is reached first)"
+                            },
+                            "mode": {
+                                "type": "string",
+                                "enum": ["file", "chunk"],
+                                "description": "file: write the payload to a file on the server and return its path; "
+                                               "chunk: return the bytes at offset..offset+length without storing anything "
+                                               "(default file)"
+                            },
+                            "offset": {
+                                "type": "integer",
+                                "description": "chunk: first byte to return (default 0)"
+                            },
+                            "length": {
+                                "type": "integer",
+                                "description": f"chunk: number of bytes (default and maximum {FIXTURE_MAX_BYTES})"
                             }
                         },
-                        "required": ["example1", "example2"]
+                        "required": ["example_name"]
+                    }
+                ),
+                Tool(
+                    name="server_stats",
+                    description="Show server metrics: per-tool latency percentiles, errors, bytes returned, files read, cache hit rates and the slowest examples",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "format": {
+                                "type": "string",
+                                "enum": ["markdown", "json", "prometheus"],
+                                "description": "Output format (default markdown)"
+                            }
+                        }
+                    }
+                ),
+                Tool(
+                    name="get_examples_batch",
+                    description="Get several examples in one call, selected by names, tag or search query",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "names": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Example names"
+                            },
+                            "tag": {
+                                "type": "string",
+                                "description": "Select all examples with this tag"
+                            },
+                            "query": {
+                                "type": "string",
+                                "description": "Select the examples matching this search query"
+                            },
+                            "max_chars": {
+                                "type": "integer",
+                                "description": f"Overall output size cap in characters (default {BATCH_MAX_CHARS})"
+                            }
+                        }
+                    }
+                ),
+                Tool(
+                    name="analyze_scripts_batch",
+                    description="Analyze the scripts of several examples in one call, selected by names, tag or search query",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "names": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Example names"
+                            },
+                            "tag": {
+                                "type": "string",
+                                "description": "Select all examples with this tag"
+                            },
+                            "query": {
+                                "type": "string",
+                                "description": "Select the examples matching this search query"
+                            },
+                            "max_chars": {
+                                "type": "integer",
+                                "description": f"Overall output size cap in characters (default {BATCH_MAX_CHARS})"
+                            }
+                        }
                     }
                 )
             ]
@@ -196,241 +885,446 @@ class SAPGroovyMCPServer:
         @self.server.call_tool()
         async def handle_call_tool(name: str, arguments: dict) -> list[TextContent]:
             """Handle tool execution."""
-            
-            if name == "list_examples":
-                return await self.list_examples(arguments.get("tag"))
-            elif name == "get_example":
-                return await self.get_example(arguments["example_name"])
-            elif name == "search_examples":
-                return await self.search_examples(arguments["query"])
-            elif name == "analyze_script":
-                return await self.analyze_script(arguments["example_name"])
-            elif name == "compare_examples":
-                return await self.compare_examples(arguments["example1"], arguments["example2"])
-            else:
-                raise ValueError(f"Unknown tool: {name}")
+            arguments = arguments or {}
+            try:
+                with self.metrics.tool_call(name, arguments) as outcome:
+                    outcome["result"] = await asyncio.wait_for(self._limited_call(name, arguments), REQUEST_TIMEOUT)
+                return outcome["result"]
+            except asyncio.TimeoutError:
+                raise ValueError(f"Tool {name} timed out after {REQUEST_TIMEOUT:g}s")
+    
+    async def _limited_call(self, name: str, arguments: dict) -> list[TextContent]:
+        async with self.tool_slots:
+            return await self.call_tool(name, arguments)
+    
+    def _roots_needed(self, name: str, arguments: dict) -> Optional[set[str]]:
+        """Namespaces a tool call reads from (None for all roots)."""
+        if name == "server_stats":
+            return set()
+        if name in ("list_examples", "search_examples", "query_examples", "find_usages", "list_symbols") or (name == "lint_script" and not arguments.keys() & {"example_name", "script"}):
+            root = arguments.get("root")
+            return None if root is None else {"" if root == DEFAULT_ROOT else root}
+        if name == "find_similar" or arguments.get("tag") or arguments.get("query"):
+            return None
+        names = [arguments.get(key) for key in ("example_name", "example1", "example2")]
+        names += arguments.get("names") or []
+        return {self.catalog.namespace_of(n) for n in names if isinstance(n, str)}
+    
+    async def call_tool(self, name: str, arguments: dict) -> list[TextContent]:
+        """Dispatch a tool call to its implementation."""
+        # Lazy roots are loaded by the first call that needs them
+        await self.catalog.ensure_loaded(self._roots_needed(name, arguments), self.io.run)
+        if name == "list_examples":
+            return await self.list_examples(
+                arguments.get("tag"),
+                limit=arguments.get("limit", LIST_DEFAULT_LIMIT),
+                cursor=arguments.get("cursor"),
+                fields=arguments.get("fields"),
+                format=arguments.get("format", "markdown"),
+                root=arguments.get("root"),
+            )
+        elif name == "get_example":
+            return await self.get_example(arguments["example_name"])
+        elif name == "search_examples":
+            return await self.search_examples(
+                arguments["query"],
+                arguments.get("limit", 20),
+                arguments.get("offset", 0),
+                root=arguments.get("root"),
+            )
+        elif name == "analyze_script":
+            return await self.analyze_script(arguments.get("example_name"), arguments.get("script"))
+        elif name == "lint_script":
+            return await self.lint_script(
+                arguments.get("example_name"),
+                script=arguments.get("script"),
+                tag=arguments.get("tag"),
+                root=arguments.get("root"),
+                min_severity=arguments.get("min_severity", "info"),
+                rules=arguments.get("rules"),
+                format=arguments.get("format", "markdown"),
+            )
+        elif name == "compare_examples":
+            return await self.compare_examples(
+                arguments.get("example1"),
+                arguments.get("example2"),
+                script1=arguments.get("script1"),
+                script2=arguments.get("script2"),
+            )
+        elif name == "query_examples":
+            return await self.query_examples(
+                all_of=arguments.get("all") or [],
+                any_of=arguments.get("any") or [],
+                none_of=arguments.get("none") or [],
+                root=arguments.get("root"),
+                facets=arguments.get("facets"),
+                limit=arguments.get("limit", 50),
+                format=arguments.get("format", "markdown"),
+            )
+        elif name == "find_usages":
+            return await self.find_usages(
+                arguments["symbol"],
+                root=arguments.get("root"),
+                limit=arguments.get("limit", 100),
+                format=arguments.get("format", "markdown"),
+            )
+        elif name == "list_symbols":
+            return await self.list_symbols(
+                prefix=arguments.get("prefix", ""),
+                kind=arguments.get("kind"),
+                root=arguments.get("root"),
+                limit=arguments.get("limit", 50),
+                format=arguments.get("format", "markdown"),
+            )
+        elif name == "find_similar":
+            return await self.find_similar(
+                arguments.get("example_name"),
+                arguments.get("script"),
+                arguments.get("top_k", 5),
+            )
+        elif name == "read_fixture":
+            return await self.read_fixture(
+                arguments["example_name"],
+                arguments["file"],
+                mode=arguments.get("mode", "head"),
+                offset=arguments.get("offset", 0),
+                length=arguments.get("length", FIXTURE_MAX_BYTES),
+                start_line=arguments.get("start_line", 1),
+                count=arguments.get("count"),
+                xpath=arguments.get("xpath"),
+            )
+        elif name == "run_example":
+            return await self.run_example(
+                arguments.get("example_name"),
+                arguments.get("function", "processData"),
+                script=arguments.get("script"),
+                fixtures=arguments.get("fixtures"),
+            )
+        elif name == "profile_script":
+            return await self.profile_script(
+                arguments["example_name"],
+                factors=arguments.get("factors") or list(profiler.DEFAULT_FACTORS),
+                repeat=arguments.get("repeat", 3),
+                function=arguments.get("function", "processData"),
+            )
+        elif name == "generate_payload":
+            return await self.generate_payload(
+                arguments["example_name"],
+                size=arguments.get("size"),
+                records=arguments.get("records"),
+                mode=arguments.get("mode", "file"),
+                offset=arguments.get("offset", 0),
+                length=arguments.get("length", FIXTURE_MAX_BYTES),
+            )
+        elif name == "server_stats":
+            return await self.server_stats(arguments.get("format", "markdown"))
+        elif name in ("get_examples_batch", "analyze_scripts_batch"):
+            render = self._render_example if name == "get_examples_batch" else self._render_analysis
+            return await self.run_batch(
+                render,
+                names=arguments.get("names"),
+                tag=arguments.get("tag"),
+                query=arguments.get("query"),
+                max_chars=arguments.get("max_chars", BATCH_MAX_CHARS),
+            )
+        else:
+            raise ValueError(f"Unknown tool: {name}")
     
-    async def list_examples(self, tag: Optional[str] = None) -> list[TextContent]:
-        """List all examples with their metadata."""
-        examples = []
+    async def list_examples(
+        self,
+        tag: Optional[str] = None,
+        limit: int = LIST_DEFAULT_LIMIT,
+        cursor: Optional[str] = None,
+        fields: Optional[list[str]] = None,
+        format: str = "markdown",
+        root: Optional[str] = None,
+    ) -> list[TextContent]:
+        """List examples with their metadata, one page at a time."""
+        fields = list(fields) if fields else list(LIST_FIELDS)
+        unknown = [f for f in fields if f not in LIST_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(LIST_FIELDS)})")
+        if format not in ("markdown", "json"):
+            raise ValueError(f"Unknown format: {format}")
+        limit = max(1, min(limit, LIST_MAX_LIMIT))
         
-        for example_dir in sorted(BASE_DIR.iterdir()):
-            if not example_dir.is_dir() or example_dir.name.startswith("."):
-                continue
-            
-            script_path = example_dir / "script.groovy"
-            if not script_path.exists():
-                # Check for other groovy files
-                groovy_files = list(example_dir.glob("*.groovy"))
-                if not groovy_files:
-                    continue
-            
-            # Read metadata if available
-            meta_path = example_dir / "meta.yaml"
-            metadata = {}
-            if meta_path.exists():
-                try:
-                    metadata = yaml.safe_load(meta_path.read_text(encoding="utf-8"))
-                except Exception as e:
-                    logger.warning(f"Failed to parse metadata for {example_dir.name}: {e}")
-            
-            # Filter by tag if specified
+        source = self.catalog.root(root) if root is not None else self.catalog
+        examples = source.tagged(tag) if tag else source.examples()
+        start = paging.page_start([ex.name for ex in examples], cursor)
+        writer = paging.ResponseWriter(LIST_MAX_CHARS)
+        
+        if format == "json":
+            writer.write(f'{{"total":{len(examples)},"examples":[')
+        else:
+            writer.write("# SAP CPI Groovy Examples\n\n")
+            if root is not None:
+                writer.write(f"Root: **{root}**\n\n")
             if tag:
-                tags = metadata.get("tags", [])
-                if tag not in tags:
-                    continue
-            
-            # Get first line of README as description
-            readme_path = example_dir / "README.md"
-            description = ""
-            if readme_path.exists():
-                try:
-                    first_line = readme_path.read_text(encoding="utf-8").split("\n")[0]
-                    description = first_line.lstrip("# ").strip()
-                except Exception:
-                    pass
-            
-            examples.append({
-                "name": example_dir.name,
-                "description": description,
-                "author": metadata.get("author", "Unknown"),
-                "tags": metadata.get("tags", [])
-            })
-        
-        result = "# SAP CPI Groovy Examples\n\n"
-        if tag:
-            result += f"Filtered by tag: **{tag}**\n\n"
-        
-        for ex in examples:
-            result += f"## {ex['name']}\n"
-            if ex['description']:
-                result += f"{ex['description']}\n"
-            result += f"- **Author:** {ex['author']}\n"
-            if ex['tags']:
-                result += f"- **Tags:** {', '.join(ex['tags'])}\n"
-            result += "\n"
+                writer.write(f"Filtered by tag: **{tag}**\n\n")
         
-        return [TextContent(type="text", text=result)]
+        shown = 0
+        for example in examples[start:start + limit]:
+            if format == "json":
+                item = {"name": example.name}
+                if "description" in fields:
+                    item["description"] = example.description
+                if "author" in fields:
+                    item["author"] = example.author
+                if "tags" in fields:
+                    item["tags"] = example.tags
+                text = ("," if shown else "") + paging.compact_json(item)
+            else:
+                text = f"## {example.name}\n"
+                if "description" in fields and example.description:
+                    text += f"{example.description}\n"
+                if "author" in fields:
+                    text += f"- **Author:** {example.author}\n"
+                if "tags" in fields and example.tags:
+                    text += f"- **Tags:** {', '.join(example.tags)}\n"
+                text += "\n"
+            # Always return at least one example, even if it alone exceeds the budget
+            if shown and not writer.fits(text):
+                break
+            writer.write(text)
+            shown += 1
+        
+        next_cursor = None
+        if start + shown < len(examples):
+            next_cursor = paging.encode_cursor(examples[start + shown - 1].name) if shown else cursor
+        
+        if format == "json":
+            writer.write(f'],"nextCursor":{paging.compact_json(next_cursor)}}}')
+        elif next_cursor:
+            writer.write(f"Showing {start + 1}-{start + shown} of {len(examples)} examples. Next page: cursor=`{next_cursor}`\n")
+        
+        return [TextContent(type="text", text=writer.getvalue())]
     
     async def get_example(self, example_name: str) -> list[TextContent]:
         """Get detailed information about an example."""
-        example_dir = BASE_DIR / example_name
-        
-        if not example_dir.exists() or not example_dir.is_dir():
-            raise ValueError(f"Example not found: {example_name}")
+        return [TextContent(type="text", text=self._render_example(example_name))]
+    
+    def _memoized(self, kind: str, examples: tuple[Example, ...], render: Callable[[], str]) -> str:
+        """Render a response once per version of the examples it shows.
         
-        result = f"# {example_name}\n\n"
+        Keys hold the file list and content hashes of every example involved,
+        so an edited example gets new keys and its stale responses age out.
+        """
+        key = (kind,) + tuple((ex.name, tuple(ex.files), tuple(sorted(ex.hashes.items()))) for ex in examples)
+        return self.responses.get_or_compute(key, source_bytes, render)
+    
+    def _render_example(self, example_name: str) -> str:
+        """Markdown for get_example."""
+        example = self.catalog.get(example_name)
+        return self._memoized("get_example", (example,), lambda: self._format_example(example))
+    
+    def _format_example(self, example: Example) -> str:
+        result = f"# {example.name}\n\n"
         
-        # Read README
-        readme_path = example_dir / "README.md"
-        if readme_path.exists():
+        # README
+        if example.readme is not None:
             result += "## Documentation\n\n"
-            result += readme_path.read_text(encoding="utf-8") + "\n\n"
+            result += example.readme + "\n\n"
         
-        # Read metadata
-        meta_path = example_dir / "meta.yaml"
-        if meta_path.exists():
-            try:
-                metadata = yaml.safe_load(meta_path.read_text(encoding="utf-8"))
-                result += "## Metadata\n\n"
-                result += f"```yaml\n{yaml.dump(metadata, default_flow_style=False)}```\n\n"
-            except Exception as e:
-                logger.warning(f"Failed to parse metadata: {e}")
-        
-        # Read script
-        script_path = example_dir / "script.groovy"
-        if script_path.exists():
+        # Metadata
+        if example.metadata:
+            result += "## Metadata\n\n"
+            result += f"```yaml\n{yaml.dump(example.metadata.to_dict(), default_flow_style=False)}```\n\n"
+        
+        # Script
+        if "script.groovy" in example.scripts:
             result += "## Groovy Script\n\n"
-            result += f"```groovy\n{script_path.read_text(encoding='utf-8')}\n```\n\n"
+            result += f"```groovy\n{example.scripts['script.groovy']}\n```\n\n"
         else:
-            # Find any groovy file
-            groovy_files = list(example_dir.glob("*.groovy"))
-            if groovy_files:
-                for gf in groovy_files:
-                    result += f"## Groovy Script: {gf.name}\n\n"
-                    result += f"```groovy\n{gf.read_text(encoding='utf-8')}\n```\n\n"
+            for script_name, content in example.scripts.items():
+                result += f"## Groovy Script: {script_name}\n\n"
+                result += f"```groovy\n{content}\n```\n\n"
         
         # List input/output files
         result += "## Files\n\n"
-        for file in sorted(example_dir.iterdir()):
-            if file.is_file() and file.suffix not in [".groovy", ".md", ".yaml"]:
-                result += f"- `{file.name}`\n"
+        for file_name in example.fixtures:
+            result += f"- `{file_name}`\n"
+        if example.fixtures:
+            result += "\nUse `read_fixture` to view fixture contents.\n"
         
-        return [TextContent(type="text", text=result)]
+        return result
     
-    async def search_examples(self, query: str) -> list[TextContent]:
-        """Search for examples by keyword."""
-        query_lower = query.lower()
-        results = []
+    async def read_fixture(
+        self,
+        example_name: str,
+        file_name: str,
+        mode: str = "head",
+        offset: int = 0,
+        length: int = FIXTURE_MAX_BYTES,
+        start_line: int = 1,
+        count: Optional[int] = None,
+        xpath: Optional[str] = None,
+    ) -> list[TextContent]:
+        """Read a page of a fixture file off the event loop."""
+        example = self.catalog.get(example_name)
+        path = fixture_reader.fixture_path(example, file_name)
+        await self.io.run(self.catalog.ensure_local, example)
+        result = f"# {example_name}/{file_name}\n\n"
         
-        for example_dir in sorted(BASE_DIR.iterdir()):
-            if not example_dir.is_dir() or example_dir.name.startswith("."):
-                continue
-            
-            matches = []
-            
-            # Search in README
-            readme_path = example_dir / "README.md"
-            if readme_path.exists():
-                try:
-                    content = readme_path.read_text(encoding="utf-8")
-                    if query_lower in content.lower():
-                        matches.append("README")
-                except Exception:
-                    pass
-            
-            # Search in script
-            for groovy_file in example_dir.glob("*.groovy"):
-                try:
-                    content = groovy_file.read_text(encoding="utf-8")
-                    if query_lower in content.lower():
-                        matches.append(f"Script: {groovy_file.name}")
-                except Exception:
-                    pass
-            
-            if matches:
-                results.append({
-                    "name": example_dir.name,
-                    "matches": matches
-                })
+        if mode == "xpath":
+            if not xpath:
+                raise ValueError("Provide 'xpath' for mode 'xpath'")
+            limit = count or 10
+            elements, more = await self.io.run(fixture_reader.xml_select, path, xpath, offset, limit)
+            if not elements:
+                return [TextContent(type="text", text=result + f"No elements matching `{xpath}`.\n")]
+            result += f"Elements matching `{xpath}`: {offset + 1}-{offset + len(elements)}"
+            result += " (more follow)\n\n" if more else "\n\n"
+            for element in elements:
+                result += f"```xml\n{element}\n```\n\n"
+            if more:
+                result += f"Next page: offset={offset + len(elements)}\n"
+            return [TextContent(type="text", text=result)]
+        
+        length = min(length, FIXTURE_MAX_BYTES)
+        lines = count or 50
+        if mode == "bytes":
+            chunk = await self.io.run(fixture_reader.read_bytes, path, offset, length)
+            where = f"bytes {chunk.start}-{chunk.end}"
+            next_page = f"offset={chunk.end}"
+        elif mode == "lines":
+            chunk = await self.io.run(fixture_reader.read_lines, path, start_line, lines, FIXTURE_MAX_BYTES)
+            where = f"lines {chunk.start}-{chunk.end - 1}"
+            next_page = f"start_line={chunk.end}"
+        elif mode == "head":
+            chunk = await self.io.run(fixture_reader.head, path, lines, FIXTURE_MAX_BYTES)
+            where = f"lines 1-{chunk.end - 1}"
+            next_page = f"mode=lines, start_line={chunk.end}"
+        elif mode == "tail":
+            chunk = await self.io.run(fixture_reader.tail, path, lines, FIXTURE_MAX_BYTES)
+            where = f"last {chunk.end - chunk.start} bytes"
+            next_page = None
+        else:
+            raise ValueError(f"Unknown mode: {mode}")
+        
+        result += f"**Size:** {chunk.size} bytes, showing {where}\n\n"
+        if chunk.binary:
+            result += "Binary content (base64):\n\n"
+            result += f"```\n{base64.b64encode(chunk.data).decode('ascii')}\n```\n"
+        else:
+            text = chunk.text.rstrip("\n")
+            result += f"```\n{text}\n```\n"
+        if chunk.more and next_page:
+            result += f"\nNext page: {next_page}\n"
         
-        if not results:
+        return [TextContent(type="text", text=result)]
+    
+    async def search_examples(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        root: Optional[str] = None,
+    ) -> list[TextContent]:
+        """Search for examples by keyword, across all roots or in one."""
+        roots = None if root is None else {self.catalog.root(root).namespace}
+        total, hits = self.search_index.search(query, limit=limit, offset=offset, roots=roots)
+        
+        if not total:
             return [TextContent(type="text", text=f"No examples found matching '{query}'")]
         
         result = f"# Search Results for '{query}'\n\n"
-        result += f"Found {len(results)} example(s):\n\n"
+        result += f"Found {total} example(s)"
+        if offset or len(hits) < total:
+            result += f", showing {offset + 1}-{offset + len(hits)}"
+        result += ":\n\n"
         
-        for res in results:
-            result += f"## {res['name']}\n"
-            result += f"Matches in: {', '.join(res['matches'])}\n\n"
+        for hit in hits:
+            example = self.catalog.get(hit.name)
+            result += f"## {hit.name}\n"
+            result += f"Matches in: {', '.join(hit.matches)} (score {hit.score:.2f})\n"
+            for file_name, line_number, line in hit.snippets:
+                result += f"- `{file_name}:{line_number}` `{line}`"
+                if file_name in example.scripts:
+                    method = summarize(example.scripts[file_name]).method_at(line_number)
+                    if method is not None:
+                        result += f" in `{method.name}`"
+                result += "\n"
+            result += "\n"
         
         return [TextContent(type="text", text=result)]
     
-    async def analyze_script(self, example_name: str) -> list[TextContent]:
-        """Analyze a Groovy script."""
-        example_dir = BASE_DIR / example_name
-        
-        if not example_dir.exists():
-            raise ValueError(f"Example not found: {example_name}")
-        
-        # Find groovy file
-        script_path = example_dir / "script.groovy"
-        if not script_path.exists():
-            groovy_files = list(example_dir.glob("*.groovy"))
-            if not groovy_files:
-                raise ValueError(f"No Groovy script found in {example_name}")
-            script_path = groovy_files[0]
-        
-        content = script_path.read_text(encoding="utf-8")
-        lines = content.split("\n")
-        
-        # Extract imports
-        imports = [line.strip() for line in lines if line.strip().startswith("import ")]
-        
-        # Extract functions
-        functions = []
-        for i, line in enumerate(lines):
-            if "def " in line and "(" in line:
-                functions.append(line.strip())
-        
-        # Extract key SAP CPI concepts
-        concepts = []
-        if "Message" in content:
-            concepts.append("Message manipulation")
-        if "getBody" in content or "setBody" in content:
-            concepts.append("Body processing")
-        if "getHeader" in content or "setHeader" in content:
-            concepts.append("Header manipulation")
-        if "getProperty" in content or "setProperty" in content:
-            concepts.append("Property manipulation")
-        if "messageLog" in content:
-            concepts.append("Message logging")
-        if "SecureStoreService" in content:
-            concepts.append("Credential management")
-        if "xml" in content.lower():
-            concepts.append("XML processing")
-        if "csv" in content.lower():
-            concepts.append("CSV processing")
-        
-        result = f"# Script Analysis: {example_name}\n\n"
+    def _example_or_script(
+        self,
+        example_name: Optional[str],
+        script: Optional[str],
+        keys: tuple[str, str] = ("example_name", "script"),
+        label: str = "pasted script",
+    ) -> Example:
+        """The named example, or a transient one holding pasted Groovy source.
+        
+        Pasted scripts go through the same content-hash caches as catalog
+        scripts, so analyzing the same text twice parses it once.
+        """
+        if example_name:
+            return self.catalog.get(example_name)
+        if not script:
+            raise ValueError(f"Provide '{keys[0]}' or '{keys[1]}'")
+        if len(script.encode("utf-8")) > INLINE_SCRIPT_MAX_BYTES:
+            raise ValueError(f"'{keys[1]}' is larger than {INLINE_SCRIPT_MAX_BYTES // 1024} KiB")
+        return Example(
+            name=label,
+            path=Path(),
+            scripts={"script.groovy": script},
+            files=["script.groovy"],
+            hashes={"script.groovy": content_hash(script)},
+        )
+    
+    async def analyze_script(self, example_name: Optional[str] = None, script: Optional[str] = None) -> list[TextContent]:
+        """Analyze an example's Groovy script or a pasted one."""
+        # Parsing a large pasted script is CPU work; keep it off the event loop
+        text = await self.io.run(self._render_analysis, example_name, script)
+        return [TextContent(type="text", text=text)]
+    
+    def _render_analysis(self, example_name: Optional[str], script: Optional[str] = None) -> str:
+        """Markdown for analyze_script."""
+        example = self._example_or_script(example_name, script)
+        return self._memoized("analyze_script", (example,), lambda: self._format_analysis(example))
+    
+    def _format_analysis(self, example: Example) -> str:
+        summary = summarize(example.script)
+        
+        result = f"# Script Analysis: {example.name}\n\n"
+        if example.script_name != "script.groovy":
+            result += f"Script: `{example.script_name}`\n\n"
         
         result += "## Imports\n\n"
-        if imports:
-            for imp in imports:
-                result += f"- `{imp}`\n"
+        if summary.imports:
+            for imp in summary.imports:
+                result += f"- `{imp.statement}`\n"
         else:
             result += "No imports found.\n"
         result += "\n"
         
+        if summary.classes:
+            result += "## Classes\n\n"
+            for cls in summary.classes:
+                result += f"- `{cls.kind} {cls.name}` (lines {cls.start}-{cls.end})\n"
+            result += "\n"
+        
         result += "## Functions\n\n"
-        if functions:
-            for func in functions:
-                result += f"- `{func}`\n"
+        if summary.methods:
+            for method in summary.methods:
+                owner = f" in `{method.class_name}`" if method.class_name else ""
+                result += f"- `{method.signature}` (lines {method.start}-{method.end}){owner}\n"
         else:
             result += "No functions found.\n"
         result += "\n"
         
+        result += "## SAP API Calls\n\n"
+        if summary.sap_calls:
+            for call in summary.sap_calls:
+                result += f"- `{call.text}()` (line {call.line})\n"
+        else:
+            result += "No SAP API calls found.\n"
+        result += "\n"
+        
         result += "## Key Concepts\n\n"
+        concepts = summary.concepts()
         if concepts:
             for concept in concepts:
                 result += f"- {concept}\n"
@@ -439,28 +1333,145 @@ class SAPGroovyMCPServer:
         result += "\n"
         
         result += f"## Statistics\n\n"
-        result += f"- Lines of code: {len(lines)}\n"
-        result += f"- Import statements: {len(imports)}\n"
-        result += f"- Functions: {len(functions)}\n"
+        result += f"- Lines of code: {summary.line_count}\n"
+        result += f"- Non-blank, non-comment lines: {summary.code_lines}\n"
+        result += f"- Import statements: {len(summary.imports)}\n"
+        result += f"- Functions: {len(summary.methods)}\n"
+        result += f"- Closures: {len(summary.closures)}\n"
+        result += f"- SAP API calls: {len(summary.sap_calls)}\n"
         
-        return [TextContent(type="text", text=result)]
+        return result
     
-    async def compare_examples(self, example1: str, example2: str) -> list[TextContent]:
-        """Compare two examples."""
-        result = f"# Comparing Examples: {example1} vs {example2}\n\n"
+    async def lint_script(
+        self,
+        example_name: Optional[str] = None,
+        tag: Optional[str] = None,
+        root: Optional[str] = None,
+        min_severity: str = "info",
+        rules: Optional[list[str]] = None,
+        format: str = "markdown",
+        script: Optional[str] = None,
+    ) -> list[TextContent]:
+        """Lint one example's scripts, a pasted script, or the corpus, for performance anti-patterns."""
+        if format not in ("markdown", "json"):
+            raise ValueError(f"Unknown format: {format}")
+        single = example_name is not None or script is not None
+        if single:
+            examples = [self._example_or_script(example_name, script)]
+        else:
+            source = self.catalog.root(root) if root is not None else self.catalog
+            examples = source.tagged(tag) if tag else source.examples()
         
-        # Get both examples
-        ex1_dir = BASE_DIR / example1
-        ex2_dir = BASE_DIR / example2
+        def lint_all() -> list[tuple[str, list[dict]]]:
+            report = []
+            for example in examples:
+                findings = [
+                    {
+                        "file": script_name,
+                        "line": finding.line,
+                        "method": method_name(example.scripts[script_name], finding.line),
+                        "rule": finding.rule,
+                        "severity": finding.severity,
+                        "message": finding.message,
+                        "suggestion": finding.suggestion,
+                    }
+                    for script_name, finding in lint_example(example, min_severity, rules)
+                ]
+                report.append((example.name, findings))
+            return report
         
-        if not ex1_dir.exists():
-            raise ValueError(f"Example not found: {example1}")
-        if not ex2_dir.exists():
-            raise ValueError(f"Example not found: {example2}")
+        # Parsing a large corpus is CPU work; keep it off the event loop
+        report = await self.io.run(lint_all)
+        scripts = sum(len(ex.scripts) for ex in examples)
+        counts = {severity: 0 for severity in SEVERITIES}
+        for _, findings in report:
+            for finding in findings:
+                counts[finding["severity"]] += 1
+        
+        if format == "json":
+            data = {
+                "scripts": scripts,
+                "counts": counts,
+                "examples": {name: findings for name, findings in report if findings or single},
+            }
+            return [TextContent(type="text", text=paging.compact_json(data))]
+        
+        totals = f"{counts['error']} errors, {counts['warning']} warnings, {counts['info']} info"
+        if single:
+            findings = report[0][1]
+            result = f"# Lint: {examples[0].name}\n\n"
+            result += f"**Findings:** {totals}\n\n"
+            if not findings:
+                return [TextContent(type="text", text=result + "No performance issues found.\n")]
+            for script_name in dict.fromkeys(f["file"] for f in findings):
+                result += f"## {script_name}\n\n"
+                for finding in findings:
+                    if finding["file"] != script_name:
+                        continue
+                    where = f"Line {finding['line']}"
+                    if finding["method"]:
+                        where += f" in `{finding['method']}`"
+                    result += f"- {where}: **{finding['severity']}** `{finding['rule']}` {finding['message']}\n"
+                    result += f"  - Suggestion: {finding['suggestion']}\n"
+                result += "\n"
+            return [TextContent(type="text", text=result)]
+        
+        writer = paging.ResponseWriter(LIST_MAX_CHARS)
+        writer.write("# Lint Report\n\n")
+        writer.write(f"Linted {scripts} scripts in {len(examples)} examples: {totals}\n\n")
+        by_rule: dict[str, list[int]] = {}
+        for _, findings in report:
+            for rule in {f["rule"] for f in findings}:
+                by_rule.setdefault(rule, [0, 0])[1] += 1
+            for finding in findings:
+                by_rule.setdefault(finding["rule"], [0, 0])[0] += 1
+        if by_rule:
+            writer.write("## Rules\n\n")
+            writer.write("| Rule | Severity | Findings | Examples | Suggestion |\n")
+            writer.write("| --- | --- | ---: | ---: | --- |\n")
+            for rule, (found, in_examples) in sorted(by_rule.items(), key=lambda item: -item[1][0]):
+                writer.write(f"| `{rule}` | {RULES[rule][0]} | {found} | {in_examples} | {RULES[rule][2]} |\n")
+            writer.write("\n## Examples\n\n")
+        
+        def rank(entry: tuple[str, list[dict]]) -> tuple:
+            name, findings = entry
+            return tuple(-sum(f["severity"] == s for f in findings) for s in SEVERITIES) + (name,)
+        
+        flagged = sorted((entry for entry in report if entry[1]), key=rank)
+        for shown, (name, findings) in enumerate(flagged):
+            text = f"### {name}\n"
+            for finding in findings:
+                text += f"- `{finding['file']}:{finding['line']}` **{finding['severity']}** `{finding['rule']}`\n"
+            text += "\n"
+            if shown and not writer.fits(text):
+                writer.write(f"{len(flagged) - shown} more examples with findings not shown; "
+                             f"use `example_name`, `tag` or `min_severity` to narrow the report.\n")
+                break
+            writer.write(text)
+        return [TextContent(type="text", text=writer.getvalue())]
+    
+    async def compare_examples(
+        self,
+        example1: Optional[str] = None,
+        example2: Optional[str] = None,
+        script1: Optional[str] = None,
+        script2: Optional[str] = None,
+    ) -> list[TextContent]:
+        """Compare two examples, either of which may be a pasted script."""
+        ex1 = self._example_or_script(example1, script1, ("example1", "script1"), "script1")
+        ex2 = self._example_or_script(example2, script2, ("example2", "script2"), "script2")
+        # Diffing large scripts is CPU heavy; keep it off the event loop
+        text = await self.io.run(self._memoized, "compare_examples", (ex1, ex2), lambda: self._render_comparison(ex1, ex2))
+        return [TextContent(type="text", text=text)]
+    
+    def _render_comparison(self, ex1: Example, ex2: Example) -> str:
+        """Markdown for compare_examples."""
+        example1, example2 = ex1.name, ex2.name
+        result = f"# Comparing Examples: {example1} vs {example2}\n\n"
         
         # Compare file structures
-        ex1_files = set(f.name for f in ex1_dir.iterdir() if f.is_file())
-        ex2_files = set(f.name for f in ex2_dir.iterdir() if f.is_file())
+        ex1_files = set(ex1.files)
+        ex2_files = set(ex2.files)
         
         result += "## File Structure\n\n"
         result += f"### Common files\n"
@@ -487,49 +1498,605 @@ class SAPGroovyMCPServer:
             result += "None\n"
         result += "\n"
         
-        # Compare scripts
-        script1_path = ex1_dir / "script.groovy"
-        script2_path = ex2_dir / "script.groovy"
+        # Compare the main scripts (script.groovy or the example's own *.groovy)
+        content1 = ex1.script
+        content2 = ex2.script
         
-        if script1_path.exists() and script2_path.exists():
-            content1 = script1_path.read_text(encoding="utf-8")
-            content2 = script2_path.read_text(encoding="utf-8")
-            
-            # Extract imports for comparison
-            imports1 = set(line.strip() for line in content1.split("\n") if line.strip().startswith("import "))
-            imports2 = set(line.strip() for line in content2.split("\n") if line.strip().startswith("import "))
-            
-            result += "## Imports Comparison\n\n"
-            result += f"### Common imports\n"
-            common_imports = imports1 & imports2
-            if common_imports:
-                for imp in sorted(common_imports):
-                    result += f"- `{imp}`\n"
+        # Compare imports from the parsed scripts
+        imports1 = set(imp.statement for imp in summarize(content1).imports)
+        imports2 = set(imp.statement for imp in summarize(content2).imports)
+        
+        result += "## Imports Comparison\n\n"
+        result += f"### Common imports\n"
+        common_imports = imports1 & imports2
+        if common_imports:
+            for imp in sorted(common_imports):
+                result += f"- `{imp}`\n"
+        else:
+            result += "None\n"
+        result += "\n"
+        
+        result += f"### Only in {example1}\n"
+        only_imports1 = imports1 - imports2
+        if only_imports1:
+            for imp in sorted(only_imports1):
+                result += f"- `{imp}`\n"
+        else:
+            result += "None\n"
+        result += "\n"
+        
+        result += f"### Only in {example2}\n"
+        only_imports2 = imports2 - imports1
+        if only_imports2:
+            for imp in sorted(only_imports2):
+                result += f"- `{imp}`\n"
+        else:
+            result += "None\n"
+        result += "\n"
+        
+        diff = diff_scripts(content1, content2)
+        name1 = f"{example1}/{ex1.script_name}"
+        name2 = f"{example2}/{ex2.script_name}"
+        
+        result += "## Similarity\n\n"
+        result += f"- **Overall:** {diff.similarity:.0%}\n"
+        result += f"- Lines: {diff.line_similarity:.0%}\n"
+        result += f"- Imports: {diff.import_similarity:.0%}\n"
+        result += f"- SAP API calls: {diff.api_similarity:.0%}\n"
+        result += f"- Changed lines: -{diff.removed_lines} +{diff.added_lines}\n\n"
+        
+        result += "## Methods\n\n"
+        if diff.methods:
+            for change in diff.methods:
+                detail = f" ({change.similarity:.0%} similar)" if change.status == "changed" else ""
+                result += f"- **{change.status}** `{change.signature}`{detail}\n"
+        else:
+            result += "None\n"
+        result += "\n"
+        
+        result += f"## Script Diff: {name1} vs {name2}\n\n"
+        unified = diff.unified(name1, name2)
+        if not unified:
+            result += "Scripts are identical (ignoring whitespace).\n"
+        else:
+            shown = unified[:COMPARE_MAX_DIFF_LINES]
+            result += "```diff\n" + "\n".join(shown) + "\n```\n"
+            if len(unified) > len(shown):
+                result += f"\n({len(unified) - len(shown)} more diff lines not shown)\n"
+        
+        return result
+    
+    async def query_examples(
+        self,
+        all_of: list[str] = (),
+        any_of: list[str] = (),
+        none_of: list[str] = (),
+        root: Optional[str] = None,
+        facets: Optional[list[str]] = None,
+        limit: int = 50,
+        format: str = "markdown",
+    ) -> list[TextContent]:
+        """Examples matching a boolean facet query, with facet counts."""
+        if format not in ("markdown", "json"):
+            raise ValueError(f"Unknown format: {format}")
+        index = await self._facet_index()
+        within = self.catalog.root(root).names() if root is not None else None
+        bits = index.query(all_of, any_of, none_of, within)
+        names = index.names(bits)
+        counts = index.counts(bits, facets)
+        limit = max(1, min(limit, LIST_MAX_LIMIT))
+        
+        if format == "json":
+            data = {
+                "total": len(names),
+                "examples": names[:limit],
+                "facets": {facet: dict(values) for facet, values in counts.items()},
+            }
+            return [TextContent(type="text", text=paging.compact_json(data))]
+        
+        writer = paging.ResponseWriter(LIST_MAX_CHARS)
+        writer.write("# Example Query\n\n")
+        for label, terms in (("All of", all_of), ("Any of", any_of), ("None of", none_of)):
+            if terms:
+                writer.write(f"- **{label}:** {', '.join(f'`{term}`' for term in terms)}\n")
+        if root is not None:
+            writer.write(f"- **Root:** {root}\n")
+        writer.write(f"\n**Matches:** {len(names)}\n\n")
+        
+        if any(counts.values()):
+            writer.write("## Facets\n\n")
+            for facet, values in counts.items():
+                if values:
+                    writer.write(f"- **{facet}:** {', '.join(f'`{value}` ({count})' for value, count in values)}\n")
+            writer.write("\n")
+        
+        if names:
+            writer.write("## Examples\n\n")
+        for shown, name in enumerate(names[:limit]):
+            example = self.catalog.get(name)
+            text = f"- **{name}**" + (f": {example.description}" if example.description else "") + "\n"
+            if shown and not writer.fits(text):
+                writer.write(f"\n{len(names) - shown} more matches not shown; narrow the query.\n")
+                break
+            writer.write(text)
+        else:
+            if len(names) > limit:
+                writer.write(f"\n{len(names) - limit} more matches not shown; raise `limit` or narrow the query.\n")
+        return [TextContent(type="text", text=writer.getvalue())]
+    
+    async def find_usages(
+        self,
+        symbol: str,
+        root: Optional[str] = None,
+        limit: int = 100,
+        format: str = "markdown",
+    ) -> list[TextContent]:
+        """File/line locations where a class or method is used."""
+        if format not in ("markdown", "json"):
+            raise ValueError(f"Unknown format: {format}")
+        index = await self._xref_index()
+        within = set(self.catalog.root(root).names()) if root is not None else None
+        usages = index.usages(symbol, within)
+        limit = max(1, min(limit, LIST_MAX_LIMIT))
+        
+        if format == "json":
+            data = {
+                "symbols": sorted({found for _, _, _, found in usages}),
+                "total": len(usages),
+                "usages": [
+                    {"example": example, "file": file_name, "line": line, "symbol": found}
+                    for example, file_name, line, found in usages[:limit]
+                ],
+            }
+            return [TextContent(type="text", text=paging.compact_json(data))]
+        
+        writer = paging.ResponseWriter(LIST_MAX_CHARS)
+        writer.write(f"# Usages of `{symbol}`\n\n")
+        if root is not None:
+            writer.write(f"- **Root:** {root}\n")
+        examples = {example for example, _, _, _ in usages}
+        writer.write(f"**Found:** {len(usages)} usages in {len(examples)} examples\n\n")
+        if not usages:
+            writer.write("No script uses this symbol. Try `list_symbols` to see the indexed names.\n")
+        
+        current = None
+        lines: list[str] = []
+        for shown, (example, file_name, line, found) in enumerate(usages[:limit]):
+            text = ""
+            if (example, file_name) != current:
+                current = (example, file_name)
+                # Usages are listed even if the example was removed since the lookup
+                ex = self.catalog.find(example)
+                lines = ex.scripts.get(file_name, "").split("\n") if ex is not None else []
+                text += f"## {example}/{file_name}\n\n"
+            code = lines[line - 1].strip() if line <= len(lines) else ""
+            text += f"- Line {line}: `{code}` ({found})\n"
+            if shown and not writer.fits(text):
+                writer.write(f"\n{len(usages) - shown} more usages not shown; narrow the symbol.\n")
+                break
+            writer.write(text)
+        else:
+            if len(usages) > limit:
+                writer.write(f"\n{len(usages) - limit} more usages not shown; raise `limit` or narrow the symbol.\n")
+        return [TextContent(type="text", text=writer.getvalue())]
+    
+    async def list_symbols(
+        self,
+        prefix: str = "",
+        kind: Optional[str] = None,
+        root: Optional[str] = None,
+        limit: int = 50,
+        format: str = "markdown",
+    ) -> list[TextContent]:
+        """Indexed classes and methods with their usage counts."""
+        if format not in ("markdown", "json"):
+            raise ValueError(f"Unknown format: {format}")
+        index = await self._xref_index()
+        within = set(self.catalog.root(root).names()) if root is not None else None
+        counted = index.counts(prefix, kind, within)
+        limit = max(1, min(limit, LIST_MAX_LIMIT))
+        
+        if format == "json":
+            data = {
+                "total": len(counted),
+                "symbols": [
+                    {"symbol": symbol, "uses": uses, "examples": examples}
+                    for symbol, uses, examples in counted[:limit]
+                ],
+            }
+            return [TextContent(type="text", text=paging.compact_json(data))]
+        
+        writer = paging.ResponseWriter(LIST_MAX_CHARS)
+        writer.write("# Symbols\n\n")
+        if prefix:
+            writer.write(f"- **Prefix:** `{prefix}`\n")
+        if kind:
+            writer.write(f"- **Kind:** {kind}\n")
+        if root is not None:
+            writer.write(f"- **Root:** {root}\n")
+        writer.write(f"\n**Symbols:** {len(counted)}\n\n")
+        if counted:
+            writer.write("| Symbol | Uses | Examples |\n|---|---|---|\n")
+        for shown, (symbol, uses, examples) in enumerate(counted[:limit]):
+            text = f"| `{symbol}` | {uses} | {examples} |\n"
+            if shown and not writer.fits(text):
+                writer.write(f"\n{len(counted) - shown} more symbols not shown; use a longer prefix.\n")
+                break
+            writer.write(text)
+        else:
+            if len(counted) > limit:
+                writer.write(f"\n{len(counted) - limit} more symbols not shown; raise `limit` or use a longer prefix.\n")
+        return [TextContent(type="text", text=writer.getvalue())]
+    
+    async def find_similar(
+        self,
+        example_name: Optional[str] = None,
+        script: Optional[str] = None,
+        top_k: int = 5,
+    ) -> list[TextContent]:
+        """Find the examples nearest to an example or a snippet."""
+        index = await self._similarity_index()
+        if example_name:
+            matches = await self.io.run(index.similar_to_example, example_name, top_k)
+            result = f"# Examples Similar to {example_name}\n\n"
+        elif script:
+            matches = await self.io.run(index.similar_to_source, script, top_k)
+            result = "# Examples Similar to the Given Script\n\n"
+        else:
+            raise ValueError("Provide 'example_name' or 'script'")
+        
+        if not matches:
+            return [TextContent(type="text", text=result + "No similar examples found.\n")]
+        
+        for match in matches:
+            example = self.catalog.get(match.name)
+            result += f"## {match.name} ({match.score:.0%})\n"
+            if example.description:
+                result += f"{example.description}\n"
+            if match.shared:
+                values = dict.fromkeys(feature.split(":", 1)[1] for feature in match.shared)
+                shared = ", ".join(f"`{value}`" for value in values)
+                result += f"- **Shared:** {shared}\n"
+            result += "\n"
+        
+        return [TextContent(type="text", text=result)]
+    
+    def _inline_fixtures(self, fixtures: list[dict]) -> Fixtures:
+        """Fixtures for a pasted script from ``{name, content}`` items."""
+        files = {}
+        for item in fixtures:
+            name, content = item.get("name"), item.get("content")
+            if not isinstance(name, str) or not isinstance(content, str):
+                raise ValueError("Each fixture needs a string 'name' and 'content'")
+            if not is_fixture_name(name):
+                raise ValueError(f"Not a fixture file name: {name} (use input.body.*, input.headers, "
+                                 f"input.properties, input.credentials, expected.body.*, expected.headers or "
+                                 f"expected.properties)")
+            files[name] = content
+        if sum(len(content.encode("utf-8")) for content in files.values()) > INLINE_FIXTURES_MAX_BYTES:
+            raise ValueError(f"Fixtures are larger than {INLINE_FIXTURES_MAX_BYTES // (1024 * 1024)} MiB")
+        return parse_fixtures(files)
+
+    async def run_example(
+        self,
+        example_name: Optional[str] = None,
+        function: str = "processData",
+        script: Optional[str] = None,
+        fixtures: Optional[list[dict]] = None,
+    ) -> list[TextContent]:
+        """Execute an example's script, or a pasted one, against fixtures."""
+        if script is not None and not ALLOW_PASTED_SCRIPTS:
+            raise ValueError("Running pasted scripts is disabled on this server "
+                             "(set SAP_GROOVY_MCP_ALLOW_PASTED_SCRIPTS=1 to enable it)")
+        if script is None:
+            if not example_name:
+                raise ValueError("Provide 'example_name' or 'script'")
+            example = self.catalog.get(example_name)
+            await self.io.run(self.catalog.ensure_local, example)
+            outcome = await self._example_runner().run(example, function)
+        else:
+            pasted = self._example_or_script(None, script)
+            if fixtures is not None:
+                inputs = self._inline_fixtures(fixtures)
+                label = pasted.name
+            elif example_name:
+                example = self.catalog.get(example_name)
+                await self.io.run(self.catalog.ensure_local, example)
+                inputs = await self.io.run(load_fixtures, example.path)
+                label = f"pasted script on {example_name}"
             else:
-                result += "None\n"
+                raise ValueError("A pasted script needs 'fixtures' or an 'example_name' to take them from")
+            outcome = await self._example_runner().run_source(label, script, inputs, function)
+        
+        result = f"# Run: {outcome.name}\n\n"
+        result += f"**Status:** {outcome.status}\n"
+        result += f"**Time:** {outcome.elapsed_ms:.0f} ms\n\n"
+        
+        if outcome.error:
+            result += f"## Error\n\n{outcome.error}\n\n"
+            if outcome.trace:
+                result += "```\n" + "\n".join(outcome.trace.splitlines()[:30]) + "\n```\n\n"
+            return [TextContent(type="text", text=result)]
+        
+        if outcome.failures:
+            result += "## Differences\n\n"
+            for failure in outcome.failures:
+                result += f"- {failure}\n"
             result += "\n"
-            
-            result += f"### Only in {example1}\n"
-            only_imports1 = imports1 - imports2
-            if only_imports1:
-                for imp in sorted(only_imports1):
-                    result += f"- `{imp}`\n"
+        elif outcome.status == "unchecked":
+            result += "No expected fixtures; the script ran without errors.\n\n"
+        
+        if outcome.body is not None:
+            result += "## Output Body\n\n"
+            if outcome.body_encoding == "base64":
+                result += f"({len(outcome.body)} base64 characters of binary output)\n\n"
             else:
-                result += "None\n"
+                result += f"```\n{outcome.body}\n```\n\n"
+        for title, values in (("Headers", outcome.headers), ("Properties", outcome.properties)):
+            if values:
+                result += f"## Output {title}\n\n"
+                for key, value in values.items():
+                    result += f"- `{key}`: {value}\n"
+                result += "\n"
+        if outcome.log:
+            result += "## Message Log\n\n"
+            for entry in outcome.log:
+                result += f"- {entry.get('kind')} `{entry.get('name')}` ({entry.get('size')} chars)\n"
             result += "\n"
-            
-            result += f"### Only in {example2}\n"
-            only_imports2 = imports2 - imports1
-            if only_imports2:
-                for imp in sorted(only_imports2):
-                    result += f"- `{imp}`\n"
+        if outcome.stdout:
+            result += f"## Console Output\n\n```\n{outcome.stdout.rstrip()}\n```\n"
+        
+        return [TextContent(type="text", text=result)]
+    
+    async def profile_script(
+        self,
+        example_name: str,
+        factors: list[int] = profiler.DEFAULT_FACTORS,
+        repeat: int = 3,
+        function: str = "processData",
+    ) -> list[TextContent]:
+        """Profile an example's time and memory against scaled inputs."""
+        factors = profiler.check_factors(factors)
+        example = self.catalog.get(example_name)
+        await self.io.run(self.catalog.ensure_local, example)
+        fixtures = await self.io.run(load_fixtures, example.path)
+        # Leave headroom to report what was measured before the request times out
+        report = await profiler.profile_example(
+            self._profile_runner(), example, fixtures, factors, repeat, function,
+            budget=REQUEST_TIMEOUT * 0.8, run=self.io.run,
+        )
+        
+        size = profiler.format_bytes
+        result = f"# Profile: {example_name}\n\n"
+        result += f"Input `{report.input_file}` scaled {', '.join(f'{f}x' for f in factors)}; fastest of {repeat} runs each.\n\n"
+        result += "| Scale | Input | Time ms | Allocated | Heap growth | Peak RSS | Output chars |\n"
+        result += "| ---: | ---: | ---: | ---: | ---: | ---: | ---: |\n"
+        for point in report.points:
+            if point.error is not None:
+                result += f"| {point.factor}x | {size(point.input_bytes)} | error: {point.error} | | | | |\n"
+                continue
+            result += (
+                f"| {point.factor}x | {size(point.input_bytes)} | {point.elapsed_ms:.1f} "
+                f"| {size(point.allocated_bytes)} | {size(point.heap_growth_bytes)} | {size(point.peak_rss_bytes)} "
+                f"| {'-' if point.output_length is None else point.output_length} |\n"
+            )
+        result += "\n"
+        for factor, reason in report.skipped:
+            result += f"- {factor}x skipped: {reason}\n"
+        if report.skipped:
+            result += "\n"
+        
+        result += "## Growth\n\n"
+        labels = {"time": "Time", "allocation": "Allocation", "heap": "Heap growth"}
+        for series, exponent in report.exponents.items():
+            shown = "" if exponent is None else f" ~ n^{exponent:.2f}"
+            result += f"- **{labels[series]}:**{shown} ({profiler.classify(exponent)})\n"
+        return [TextContent(type="text", text=result)]
+    
+    async def generate_payload(
+        self,
+        example_name: str,
+        size: Optional[str] = None,
+        records: Optional[int] = None,
+        mode: str = "file",
+        offset: int = 0,
+        length: int = FIXTURE_MAX_BYTES,
+    ) -> list[TextContent]:
+        """Write or page through a synthetic payload built from an example's input fixture."""
+        if mode not in ("file", "chunk"):
+            raise ValueError(f"Unknown mode: {mode}")
+        if size is None and records is None:
+            raise ValueError("Provide 'size' or 'records'")
+        if records is not None and records < 1:
+            raise ValueError("'records' must be at least 1")
+        limit = payload_generator.PAYLOAD_MAX_BYTES
+        size = payload_generator.parse_size(size) if size is not None else None
+        if size is not None and size > limit:
+            raise ValueError(f"Payloads are limited to {limit // (1024 * 1024)} MiB here; "
+                             f"use `python payload_generator.py {example_name} --size ...` for larger ones")
+        example = self.catalog.get(example_name)
+        await self.io.run(self.catalog.ensure_local, example)
+        fixtures = await self.io.run(load_fixtures, example.path)
+        template = payload_generator.fixture_template(fixtures)
+        source = f"`{fixtures.body_file}` ({template.kind}"
+        source += f", {len(template.records)} record templates)" if template.records else ")"
+        
+        if mode == "chunk":
+            length = max(0, min(length, FIXTURE_MAX_BYTES))
+            data = await self.io.run(payload_generator.payload_slice, template, offset, length, size or limit, records)
+            result = f"# Payload: {example_name}\n\n"
+            result += f"Generated from {source}, showing bytes {offset}-{offset + len(data)}\n\n"
+            result += f"```\n{data.decode('utf-8', errors='replace').rstrip(chr(10))}\n```\n"
+            if len(data) == length:
+                result += f"\nNext chunk: offset={offset + len(data)}\n"
+            return [TextContent(type="text", text=result)]
+        
+        label = f"{records}x" if size is None else profiler.format_bytes(size).replace(" ", "")
+        key = payload_generator.payload_key(template, size or limit, records)
+        path = PAYLOAD_DIR / f"{example_name.replace('/', '__')}.{label}.{key}.{template.suffix}"
+        written, count = payload_generator.measure_payload(template, size or limit, records)
+        reused = await self.io.run(payload_generator.reuse_payload, path, written)
+        if not reused:
+            await self.io.run(payload_generator.prune_payloads, PAYLOAD_DIR,
+                              payload_generator.PAYLOAD_DIR_MAX_BYTES, written)
+            written, count = await self.io.run(payload_generator.save_payload, template, path, size or limit, records)
+        result = f"# Payload: {example_name}\n\n"
+        result += f"- **Template:** {source}\n"
+        result += f"- **File:** `{path}`" + (" (already generated)\n" if reused else "\n")
+        result += f"- **Size:** {written} bytes ({profiler.format_bytes(written)})\n"
+        result += f"- **Records:** {count}\n"
+        if records is not None and count < records:
+            result += f"\nStopped at the {profiler.format_bytes(size or limit)} size limit before {records} records.\n"
+        return [TextContent(type="text", text=result)]
+    
+    async def server_stats(self, format: str = "markdown") -> list[TextContent]:
+        """Report the metrics collected since startup."""
+        if format == "prometheus":
+            return [TextContent(type="text", text=self.metrics.render_prometheus())]
+        stats = self.metrics.snapshot()
+        if format == "json":
+            return [TextContent(type="text", text=json.dumps(stats, indent=2))]
+        if format != "markdown":
+            raise ValueError(f"Unknown format: {format}")
+        
+        def ms(value: Optional[float]) -> str:
+            return "-" if value is None else f"{value * 1000:.1f}"
+        
+        result = "# Server Statistics\n\n"
+        result += f"**Uptime:** {stats['uptime_s']:.0f}s\n\n"
+        for title, series in (("Tools", stats["tools"]), ("Resources", stats["resources"])):
+            if not series:
+                continue
+            result += f"## {title}\n\n"
+            result += "| Name | Calls | Errors | Timeouts | p50 ms | p95 ms | p99 ms | KB returned | Files read |\n"
+            result += "| --- | ---: | ---: | ---: | ---: | ---: | ---: | ---: | ---: |\n"
+            for key, entry in series.items():
+                outcomes = entry["outcomes"]
+                result += (
+                    f"| {key} | {entry['calls']} | {outcomes.get('error', 0)} | {outcomes.get('timeout', 0)} "
+                    f"| {ms(entry['p50_s'])} | {ms(entry['p95_s'])} | {ms(entry['p99_s'])} "
+                    f"| {entry['bytes_returned'] / 1024:.1f} | {entry['files_read']} |\n"
+                )
+            result += "\n"
+        
+        result += "## Caches\n\n"
+        result += "| Cache | Hits | Misses | Hit rate | Entries |\n"
+        result += "| --- | ---: | ---: | ---: | ---: |\n"
+        for cache_name, cache in stats["caches"].items():
+            rate = "-" if cache["hit_rate"] is None else f"{cache['hit_rate']:.0%}"
+            if cache.get("max_bytes"):
+                fill = f"{cache['size']} ({cache['bytes'] / 1024:.0f}/{cache['max_bytes'] / 1024:.0f} KiB)"
             else:
-                result += "None\n"
+                fill = f"{cache['size']}/{cache['max_size']}"
+            result += f"| {cache_name} | {cache['hits']} | {cache['misses']} | {rate} | {fill} |\n"
+        
+        if stats["slowest_examples"]:
+            result += "\n## Slowest Examples\n\n"
+            for example in stats["slowest_examples"]:
+                result += (
+                    f"- `{example['name']}`: max {ms(example['max_s'])} ms, "
+                    f"mean {ms(example['mean_s'])} ms over {example['calls']} call(s)\n"
+                )
         
         return [TextContent(type="text", text=result)]
     
-    async def run(self):
-        """Run the MCP server."""
+    def _select_examples(
+        self,
+        names: Optional[list[str]] = None,
+        tag: Optional[str] = None,
+        query: Optional[str] = None,
+    ) -> list[str]:
+        """Resolve the example selection of a batch tool."""
+        if names:
+            return list(dict.fromkeys(names))
+        if tag:
+            return [ex.name for ex in self.catalog.tagged(tag)]
+        if query:
+            _, hits = self.search_index.search(query, limit=BATCH_MAX_EXAMPLES)
+            return [hit.name for hit in hits]
+        raise ValueError("Provide 'names', 'tag' or 'query'")
+    
+    async def _report_progress(self, progress: int, total: int) -> None:
+        """Send a progress notification if the client asked for one."""
+        try:
+            ctx = self.server.request_context
+        except LookupError:
+            return
+        token = ctx.meta.progressToken if ctx.meta else None
+        if token is not None:
+            await ctx.session.send_progress_notification(token, progress, total)
+    
+    async def run_batch(
+        self,
+        render,
+        names: Optional[list[str]] = None,
+        tag: Optional[str] = None,
+        query: Optional[str] = None,
+        max_chars: int = BATCH_MAX_CHARS,
+    ) -> list[TextContent]:
+        """Render many examples concurrently, one content item per example."""
+        selected = self._select_examples(names, tag, query)
+        if not selected:
+            return [TextContent(type="text", text="No examples selected.")]
+        skipped = selected[BATCH_MAX_EXAMPLES:]
+        selected = selected[:BATCH_MAX_EXAMPLES]
+        
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        done = 0
+        
+        async def render_one(example_name: str) -> str:
+            nonlocal done
+            async with semaphore:
+                try:
+                    text = await self.io.run(render, example_name)
+                except ValueError as e:
+                    text = f"# {example_name}\n\nError: {e}\n"
+            done += 1
+            await self._report_progress(done, len(selected))
+            return text
+        
+        texts = await asyncio.gather(*(render_one(n) for n in selected))
+        
+        contents = []
+        used = 0
+        for example_name, text in zip(selected, texts):
+            if used + len(text) > max_chars and contents:
+                skipped = selected[len(contents):] + skipped
+                break
+            contents.append(TextContent(type="text", text=text))
+            used += len(text)
+        
+        if skipped:
+            contents.append(TextContent(
+                type="text",
+                text=f"Output limit reached; not included: {', '.join(skipped)}"
+            ))
+        return contents
+    
+    async def run(self, transport: str = TRANSPORT, host: str = HTTP_HOST, port: int = HTTP_PORT):
+        """Run the MCP server over stdio or streamable HTTP."""
+        if transport not in ("stdio", "http"):
+            raise ValueError(f"Unknown transport: {transport}")
+        tasks = [asyncio.create_task(self.catalog.watch(CATALOG_POLL_INTERVAL, self.io.run))]
+        if METRICS_FILE:
+            tasks.append(asyncio.create_task(write_prometheus_file(self.metrics, Path(METRICS_FILE), METRICS_INTERVAL)))
+        metrics_server = await serve_prometheus(self.metrics, METRICS_PORT) if METRICS_PORT else None
+        try:
+            if transport == "http":
+                await self._serve_http(host, port)
+            else:
+                await self._serve_stdio()
+        finally:
+            for task in tasks:
+                task.cancel()
+            if metrics_server is not None:
+                metrics_server.close()
+            for runner in (self.runner, self.profile_runner):
+                if runner is not None:
+                    await runner.pool.close()
+            self.io.close()
+    
+    async def _serve_stdio(self):
         async with stdio_server() as (read_stream, write_stream):
             await self.server.run(
                 read_stream,
@@ -538,16 +2105,30 @@ class SAPGroovyMCPServer:
                     server_name="sap-groovy-mcp",
                     server_version="0.1.0",
                     capabilities=self.server.get_capabilities(
-                        notification_options=NotificationOptions(),
+                        notification_options=NotificationOptions(resources_changed=True),
                         experimental_capabilities={},
                     ),
                 ),
             )
 
+    async def _serve_http(self, host: str, port: int):
+        # Imported here so stdio-only installs do not need starlette/uvicorn
+        from http_transport import create_app, create_uvicorn_server
+        
+        app = create_app(self, HTTP_STATELESS, HTTP_MAX_ACTIVE, HTTP_MAX_QUEUED)
+        logger.info(f"Serving streamable HTTP on http://{host}:{port}/mcp")
+        await create_uvicorn_server(app, host, port, SHUTDOWN_TIMEOUT).serve()
+
 async def main():
     """Main entry point."""
+    parser = argparse.ArgumentParser(description="SAP CPI Groovy examples MCP server")
+    parser.add_argument("--transport", choices=["stdio", "http"], default=TRANSPORT)
+    parser.add_argument("--host", default=HTTP_HOST, help="HTTP bind address")
+    parser.add_argument("--port", type=int, default=HTTP_PORT, help="HTTP port")
+    args = parser.parse_args()
+    
     server = SAPGroovyMCPServer()
-    await server.run()
+    await server.run(args.transport, args.host, args.port)
 
 if __name__ == "__main__":
     asyncio.run(main())
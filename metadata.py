@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Schema for the meta.yaml file of an example.
+
+meta.yaml is parsed once per changed file, with libyaml's CSafeLoader when
+PyYAML was built with it (the pure-Python SafeLoader otherwise), validated
+and kept as a compact ``__slots__`` record:
+
+    author: Fatih Pense
+    tags: [beginner, xml]
+    cpi_version: "6.x"          # SAP Cloud Integration version the script targets
+    adapters: [SFTP, HTTP]      # adapters the integration flow uses
+    complexity: beginner        # beginner, intermediate or advanced
+
+All keys are optional. Unknown keys are kept as they are, so nothing in an
+existing file is lost. A key that violates the schema is logged and left
+out, without discarding the rest of the file.
+"""
+
+import logging
+from typing import Any, Iterable, Optional
+
+import yaml
+
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+logger = logging.getLogger("sap-groovy-mcp")
+
+COMPLEXITY_LEVELS = ("beginner", "intermediate", "advanced")
+
+# Schema keys in the order they are written back out
+FIELDS = ("author", "tags", "cpi_version", "adapters", "complexity")
+
+
+def _scalar(data: dict, key: str) -> Optional[str]:
+    value = data.get(key)
+    if value is None:
+        return None
+    if isinstance(value, (dict, list)):
+        raise ValueError(f"'{key}' must be a single value")
+    return str(value)
+
+
+def _string_list(data: dict, key: str) -> tuple[str, ...]:
+    value = data.get(key)
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    if not isinstance(value, list) or any(isinstance(item, (dict, list)) or item is None for item in value):
+        raise ValueError(f"'{key}' must be a list of strings")
+    return tuple(dict.fromkeys(str(item) for item in value))
+
+
+def _complexity(data: dict, key: str) -> Optional[str]:
+    value = _scalar(data, key)
+    if value is None:
+        return None
+    if value.lower() not in COMPLEXITY_LEVELS:
+        raise ValueError(f"'{key}' must be one of {', '.join(COMPLEXITY_LEVELS)}")
+    return value.lower()
+
+
+# Validation of each schema key
+_READERS = {
+    "author": _scalar,
+    "tags": _string_list,
+    "cpi_version": _scalar,
+    "adapters": _string_list,
+    "complexity": _complexity,
+}
+
+
+class Metadata:
+    """Validated contents of an example's meta.yaml."""
+
+    __slots__ = ("author", "tags", "cpi_version", "adapters", "complexity", "extra")
+
+    def __init__(
+        self,
+        author: Optional[str] = None,
+        tags: Iterable[str] = (),
+        cpi_version: Optional[str] = None,
+        adapters: Iterable[str] = (),
+        complexity: Optional[str] = None,
+        extra: Optional[dict[str, Any]] = None,
+    ):
+        self.author = author
+        self.tags = tuple(tags)
+        self.cpi_version = cpi_version
+        self.adapters = tuple(adapters)
+        self.complexity = complexity
+        self.extra = extra or {}
+
+    @classmethod
+    def from_dict(cls, data: dict, name: str = "meta.yaml") -> "Metadata":
+        """Validate a parsed meta.yaml mapping; raises ValueError when it is not a mapping.
+
+        A field that violates the schema is logged (with ``name``) and dropped;
+        the other fields are kept.
+        """
+        if not isinstance(data, dict):
+            raise ValueError("meta.yaml must be a mapping")
+        fields = {}
+        for key, read in _READERS.items():
+            try:
+                fields[key] = read(data, key)
+            except ValueError as e:
+                logger.warning(f"Invalid metadata for {name}: {e}; ignoring it")
+        return cls(**fields, extra={str(key): value for key, value in data.items() if key not in FIELDS})
+
+    def to_dict(self) -> dict:
+        """The set fields as a plain mapping (for display and the index cache)."""
+        data = {}
+        for key in FIELDS:
+            value = getattr(self, key)
+            if value:
+                data[key] = list(value) if isinstance(value, tuple) else value
+        data.update(self.extra)
+        return data
+
+    def __bool__(self) -> bool:
+        return any(getattr(self, key) for key in self.__slots__)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Metadata):
+            return NotImplemented
+        return all(getattr(self, key) == getattr(other, key) for key in self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Metadata({self.to_dict()!r})"
+
+
+def parse_metadata(text: str, name: str = "meta.yaml") -> Metadata:
+    """Parse and validate meta.yaml text; raises yaml.YAMLError, or ValueError when it is not a mapping."""
+    data = yaml.load(text, Loader=SafeLoader)
+    return Metadata() if data is None else Metadata.from_dict(data, name)
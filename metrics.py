@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Instrumentation of tool calls and resource reads.
+
+Every tool call and resource read is timed into a latency histogram and
+counted by outcome, together with the size of the response and the number
+of files read while serving it. Slow examples are tracked by name so a slow
+tool can be traced back to the example that causes it. Cache hit rates are
+collected from the caches that report them.
+
+Results are available as a dict (``snapshot``) and in the Prometheus text
+format (``render_prometheus``). When the OpenTelemetry API is installed,
+each call also becomes a span; without a configured SDK those spans are
+no-ops.
+"""
+
+import asyncio
+import contextvars
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None
+
+logger = logging.getLogger("sap-groovy-mcp")
+
+# Histogram bucket upper bounds in seconds
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Recent latencies kept per tool for percentiles
+RECENT_SAMPLES = 1024
+
+# Examples reported as slowest in server_stats
+SLOWEST_EXAMPLES = 10
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram plus a window of recent samples."""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.recent: deque = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, value: float) -> None:
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Percentile of the recent samples (None if there are none)."""
+        if not self.recent:
+            return None
+        values = sorted(self.recent)
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+
+@dataclass
+class CallStats:
+    """Counters of the call currently being served."""
+
+    files_read: int = 0
+    bytes_read: int = 0
+
+
+@dataclass
+class _Series:
+    latency: Histogram = field(default_factory=Histogram)
+    outcomes: dict[str, int] = field(default_factory=dict)
+    bytes_returned: int = 0
+    files_read: int = 0
+    bytes_read: int = 0
+
+
+_current_call: contextvars.ContextVar[Optional[CallStats]] = contextvars.ContextVar("sap_groovy_call", default=None)
+
+
+def note_file_read(size: int = 0) -> None:
+    """Count a file read against the call being served, if any.
+
+    Executor threads see the call when the work was submitted with a copy of
+    the caller's context (as ``AsyncFileAccess.run`` does).
+    """
+    stats = _current_call.get()
+    if stats is not None:
+        stats.files_read += 1
+        stats.bytes_read += size
+
+
+def _response_size(result) -> int:
+    if isinstance(result, str):
+        return len(result.encode("utf-8"))
+    if hasattr(result, "model_dump_json"):
+        # Pydantic results such as a page of resources
+        return len(result.model_dump_json(exclude_none=True).encode("utf-8"))
+    total = 0
+    for item in result or ():
+        text = getattr(item, "text", None)
+        if text is not None:
+            total += len(text.encode("utf-8"))
+    return total
+
+
+class Metrics:
+    """Registry of tool and resource metrics for one server."""
+
+    def __init__(self):
+        self.started = time.time()
+        self.tools: dict[str, _Series] = {}
+        self.resources: dict[str, _Series] = {}
+        self.examples: dict[str, list[float]] = {}  # name -> [calls, total seconds, max seconds]
+        self.cache_sources: dict[str, Callable[[], dict]] = {}
+        self._tracer = otel_trace.get_tracer("sap-groovy-mcp") if otel_trace is not None else None
+
+    def add_cache(self, name: str, info: Callable[[], dict]) -> None:
+        """Register a callable returning {"hits", "misses", "size", "max_size"} of a cache.
+
+        Size-bounded caches also report "bytes" and "max_bytes".
+        """
+        self.cache_sources[name] = info
+
+    @contextmanager
+    def _track(
+        self,
+        series: dict[str, _Series],
+        key: str,
+        span_name: str,
+        attributes: dict,
+        examples: tuple = (),
+    ) -> Iterator[dict]:
+        stats = CallStats()
+        token = _current_call.set(stats)
+        outcome = {"status": "ok", "result": None}
+        span_cm = self._tracer.start_as_current_span(span_name, attributes=attributes) if self._tracer else None
+        span = span_cm.__enter__() if span_cm is not None else None
+        started = time.perf_counter()
+        try:
+            yield outcome
+        except BaseException as e:
+            outcome["status"] = "timeout" if isinstance(e, (asyncio.TimeoutError, TimeoutError)) else "error"
+            if span is not None:
+                span.record_exception(e)
+                span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR, str(e)))
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_call.reset(token)
+            entry = series.get(key)
+            if entry is None:
+                entry = series[key] = _Series()
+            entry.latency.observe(elapsed)
+            entry.outcomes[outcome["status"]] = entry.outcomes.get(outcome["status"], 0) + 1
+            size = _response_size(outcome["result"])
+            entry.bytes_returned += size
+            entry.files_read += stats.files_read
+            entry.bytes_read += stats.bytes_read
+            for name in examples if outcome["status"] == "ok" else ():
+                record = self.examples.setdefault(name, [0, 0.0, 0.0])
+                record[0] += 1
+                record[1] += elapsed
+                record[2] = max(record[2], elapsed)
+            if span is not None:
+                span.set_attribute("sap_groovy.status", outcome["status"])
+                span.set_attribute("sap_groovy.bytes_returned", size)
+                span.set_attribute("sap_groovy.files_read", stats.files_read)
+                span_cm.__exit__(None, None, None)
+
+    def tool_call(self, name: str, arguments: dict):
+        """Context manager timing a tool call; set ``outcome["result"]`` to count response bytes."""
+        examples = tuple(
+            value for key in ("example_name", "example1", "example2")
+            if isinstance(value := arguments.get(key), str)
+        )
+        attributes = {"mcp.tool": name, "sap_groovy.examples": list(examples)}
+        return self._track(self.tools, name, f"tool {name}", attributes, examples)
+
+    def resource_read(self, kind: str, uri: str):
+        """Context manager timing a resource read."""
+        return self._track(self.resources, kind, f"resource {kind}", {"mcp.resource": uri})
+
+    def cache_stats(self) -> dict[str, dict]:
+        stats = {}
+        for name, info in self.cache_sources.items():
+            data = dict(info())
+            lookups = data["hits"] + data["misses"]
+            data["hit_rate"] = data["hits"] / lookups if lookups else None
+            stats[name] = data
+        return stats
+
+    def snapshot(self) -> dict:
+        """All metrics as plain data."""
+
+        def series(entries: dict[str, _Series]) -> dict:
+            return {
+                key: {
+                    "calls": entry.latency.count,
+                    "outcomes": dict(entry.outcomes),
+                    "total_s": entry.latency.sum,
+                    "p50_s": entry.latency.percentile(0.50),
+                    "p95_s": entry.latency.percentile(0.95),
+                    "p99_s": entry.latency.percentile(0.99),
+                    "bytes_returned": entry.bytes_returned,
+                    "files_read": entry.files_read,
+                    "bytes_read": entry.bytes_read,
+                }
+                for key, entry in sorted(entries.items())
+            }
+
+        slowest = sorted(self.examples.items(), key=lambda item: -item[1][2])[:SLOWEST_EXAMPLES]
+        return {
+            "uptime_s": time.time() - self.started,
+            "tools": series(self.tools),
+            "resources": series(self.resources),
+            "caches": self.cache_stats(),
+            "slowest_examples": [
+                {"name": name, "calls": int(calls), "mean_s": total / calls, "max_s": worst}
+                for name, (calls, total, worst) in slowest
+            ],
+        }
+
+    def render_prometheus(self) -> str:
+        """Metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def histogram(metric: str, label: str, entries: dict[str, _Series], help_text: str) -> None:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} histogram")
+            for key, entry in sorted(entries.items()):
+                cumulative = 0
+                for bound, count in zip(entry.latency.buckets, entry.latency.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{{label}="{key}",le="{bound:g}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{{label}="{key}",le="+Inf"}} {entry.latency.count}')
+                lines.append(f'{metric}_sum{{{label}="{key}"}} {entry.latency.sum:.6f}')
+                lines.append(f'{metric}_count{{{label}="{key}"}} {entry.latency.count}')
+
+        def counter(metric: str, help_text: str, samples: list[tuple[str, float]]) -> None:
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} counter")
+            for labels, value in samples:
+                lines.append(f"{metric}{{{labels}}} {value:g}")
+
+        histogram("sap_groovy_tool_duration_seconds", "tool", self.tools, "Tool call latency")
+        counter("sap_groovy_tool_calls_total", "Tool calls by outcome", [
+            (f'tool="{key}",status="{status}"', count)
+            for key, entry in sorted(self.tools.items()) for status, count in sorted(entry.outcomes.items())
+        ])
+        counter("sap_groovy_tool_response_bytes_total", "Bytes returned by tools", [
+            (f'tool="{key}"', entry.bytes_returned) for key, entry in sorted(self.tools.items())
+        ])
+        counter("sap_groovy_tool_files_read_total", "Files read while serving tool calls", [
+            (f'tool="{key}"', entry.files_read) for key, entry in sorted(self.tools.items())
+        ])
+        histogram("sap_groovy_resource_duration_seconds", "kind", self.resources, "Resource read latency")
+        counter("sap_groovy_resource_response_bytes_total", "Bytes returned by resource reads", [
+            (f'kind="{key}"', entry.bytes_returned) for key, entry in sorted(self.resources.items())
+        ])
+        caches = self.cache_stats()
+        counter("sap_groovy_cache_hits_total", "Cache hits", [(f'cache="{n}"', c["hits"]) for n, c in caches.items()])
+        counter("sap_groovy_cache_misses_total", "Cache misses", [
+            (f'cache="{n}"', c["misses"]) for n, c in caches.items()
+        ])
+        return "\n".join(lines) + "\n"
+
+
+async def write_prometheus_file(metrics: Metrics, path: Path, interval: float = 15.0) -> None:
+    """Rewrite path with the current metrics every interval seconds."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    while True:
+        try:
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            tmp.write_text(metrics.render_prometheus(), encoding="utf-8")
+            tmp.replace(path)
+        except OSError as e:
+            logger.warning(f"Writing metrics to {path} failed: {e!r}")
+        await asyncio.sleep(interval)
+
+
+async def serve_prometheus(metrics: Metrics, port: int, host: str = "127.0.0.1") -> asyncio.AbstractServer:
+    """Serve the metrics over HTTP on host:port (any path)."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            # Read and ignore the request line and headers
+            while (await reader.readline()).strip():
+                pass
+            body = metrics.render_prometheus().encode("utf-8")
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+                + f"Content-Length: {len(body)}\r\n".encode("ascii")
+                + b"Connection: close\r\n\r\n"
+                + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
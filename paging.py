@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Cursor pagination and size-bounded output for list responses.
+
+Cursors are opaque to clients and hold the name of the last item returned,
+so a page continues after that name even if examples were added or removed
+in between (keyset pagination over the sorted catalog).
+"""
+
+import base64
+import bisect
+import io
+import json
+from typing import Any, Optional
+
+
+def encode_cursor(last_name: str) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"after": last_name}).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[str]:
+    """Name to continue after, or None for the first page."""
+    if not cursor:
+        return None
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(data["after"])
+    except (ValueError, KeyError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+
+def page_start(names: list[str], cursor: Optional[str]) -> int:
+    """Index in sorted names where the page for cursor begins."""
+    after = decode_cursor(cursor)
+    if after is None:
+        return 0
+    return bisect.bisect_right(names, after)
+
+
+class ResponseWriter:
+    """Accumulates output in a buffer and tracks a character budget.
+
+    Writing into a StringIO is linear in the output size, unlike repeated
+    string concatenation of an ever-growing result.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None):
+        self.max_chars = max_chars
+        self._buffer = io.StringIO()
+        self.size = 0
+
+    def fits(self, text: str) -> bool:
+        return self.max_chars is None or self.size + len(text) <= self.max_chars
+
+    def write(self, text: str) -> None:
+        self._buffer.write(text)
+        self.size += len(text)
+
+    def getvalue(self) -> str:
+        return self._buffer.getvalue()
+
+
+def compact_json(value: Any) -> str:
+    """JSON without insignificant whitespace."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
@@ -0,0 +1,612 @@
+#!/usr/bin/env python3
+"""
+Streaming synthetic payload generator.
+
+Infers the record structure of an example's ``input.body.*`` fixture and
+streams out a payload of any size built from those records, for load tests
+with inputs far larger than the few-KB fixtures:
+
+- XML: the repeated children of the first element below the root chain of
+  single wrappers (for SAP's EDI XML, the ``M_*`` message groups)
+- EDIFACT and X12 text: the UNH..UNT messages or ST..SE transaction sets
+- CSV: every line after the header
+- JSON: the longest array, at the top level or nested in objects
+- base64: the decoded bytes, repeated and re-encoded with the fixture's
+  line length
+- other text: every line
+
+Records are copied as they are, except that EDI control references are
+numbered per message and interchange/group counts match the number of
+messages written, so the output still passes EDI envelope checks. The
+template is built once from the fixture; the payload itself is produced by
+generators in chunks of ``CHUNK_BYTES``, so memory use does not depend on
+the output size.
+
+Usage: python payload_generator.py NAME (--size 2G | --records N) [-o FILE]
+"""
+
+import argparse
+import base64
+import binascii
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import threading
+import xml.etree.ElementTree as ET
+from dataclasses import astuple, dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Generator, Optional
+
+from groovy_runner import Fixtures
+from profiler import longest_array, root_start
+
+# Size of the chunks handed to the writer
+CHUNK_BYTES = 1024 * 1024
+
+# Largest payload the generate_payload tool writes; the CLI has no limit
+PAYLOAD_MAX_BYTES = int(float(os.environ.get("SAP_GROOVY_MCP_PAYLOAD_MAX_MB", "1024")) * 1024 * 1024)
+
+# Total size of the payload files the tool keeps; the least recently used go first
+PAYLOAD_DIR_MAX_BYTES = int(float(os.environ.get("SAP_GROOVY_MCP_PAYLOAD_DIR_MAX_MB", "4096")) * 1024 * 1024)
+
+# Placeholders for the message number and the message count (private-use characters)
+SEQ = "\ue000"
+COUNT = "\ue001"
+_RECORDS = "__payload_records__"
+
+# EDI XML elements (SAP B2B naming) holding message references and counts
+_EDI_XML_REFERENCES = ("S_UNH/D_0062", "S_UNT/D_0062", "S_ST/D_329", "S_SE/D_329")
+_EDI_XML_COUNTS = ("S_UNZ/D_0036", "S_GE/D_97")
+
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)i?b?\s*$", re.IGNORECASE)
+
+
+def parse_size(text) -> int:
+    """Bytes of a size such as ``65536``, ``512K``, ``64MB`` or ``2G`` (binary units)."""
+    if isinstance(text, int):
+        size = text
+    else:
+        match = _SIZE_RE.match(str(text))
+        if not match:
+            raise ValueError(f"Invalid size: {text} (use e.g. 512K, 64M or 2G)")
+        size = int(float(match.group(1)) * 1024 ** " KMGT".index(match.group(2).upper() or " "))
+    if size < 1:
+        raise ValueError("Size must be at least 1 byte")
+    return size
+
+
+@dataclass
+class PayloadTemplate:
+    """Head, repeatable records and tail of a payload.
+
+    Records may contain ``SEQ`` (replaced by the 1-based record number) and
+    the tail ``COUNT`` (replaced by the number of records written).
+    A base64 template keeps the decoded bytes in ``binary`` instead.
+    """
+
+    kind: str
+    records: list[str] = field(default_factory=list)
+    head: str = ""
+    tail: str = ""
+    separator: str = ""
+    seq_width: int = 1
+    binary: bytes = b""
+    line_length: int = 0
+
+    @property
+    def suffix(self) -> str:
+        return {"edifact": "edi", "x12": "edi", "base64": "base64.txt"}.get(self.kind, self.kind)
+
+
+def _xml_template(text: str) -> PayloadTemplate:
+    prolog = text[:root_start(text)]
+    for _, (prefix, uri) in ET.iterparse(io.StringIO(text), events=("start-ns",)):
+        if prefix:
+            ET.register_namespace(prefix, uri)
+    root = ET.fromstring(text)
+    container = root
+    while len(container) == 1:
+        container = container[0]
+    children = list(container)
+    if not children:
+        raise ValueError("XML input has no repeated elements")
+    tags = [child.tag for child in children]
+    messages = [i for i, tag in enumerate(tags) if isinstance(tag, str) and tag.startswith("M_")]
+    if messages:
+        # EDI XML: the message groups between the interchange header and trailer
+        first, last = messages[0], messages[-1]
+    else:
+        common = max(tags, key=tags.count)
+        if tags.count(common) > 1:
+            first = tags.index(common)
+            last = len(tags) - 1 - tags[::-1].index(common)
+        else:
+            first, last = 0, len(children) - 1
+    records = children[first:last + 1]
+    for record in records:
+        for path in _EDI_XML_REFERENCES:
+            for element in record.iterfind(path):
+                element.text = SEQ
+    marker = ET.Element(_RECORDS)
+    container[first:last + 1] = [marker]
+    # Counts in the trailer (UNZ, GE) are written once the number of messages is known
+    order = {id(element): position for position, element in enumerate(root.iter())}
+    for path in _EDI_XML_COUNTS:
+        for element in root.iterfind(f".//{path}"):
+            if order[id(element)] > order[id(marker)]:
+                element.text = COUNT
+    head, tail = ET.tostring(root, encoding="unicode").split(f"<{_RECORDS} />")
+    return PayloadTemplate(
+        "xml",
+        records=[ET.tostring(record, encoding="unicode") for record in records],
+        head=prolog + head,
+        tail=tail,
+    )
+
+
+def _split_segments(text: str, terminator: str, release: Optional[str]) -> list[str]:
+    """Segments including their terminator and the line breaks after it."""
+    escaped = re.escape(terminator)
+    guard = f"(?<!{re.escape(release)})" if release else ""
+    return [s for s in re.findall(rf".*?{guard}{escaped}\s*|.+$", text, re.DOTALL) if s.strip()]
+
+
+def _set_element(segment: str, separator: str, terminator: str, position: int, value: str) -> str:
+    """Replace one data element of a segment, keeping its terminator and line break."""
+    body = segment.rstrip()[:-len(terminator)] if segment.rstrip().endswith(terminator) else segment.rstrip()
+    elements = body.split(separator)
+    if position < len(elements):
+        elements[position] = value
+    return separator.join(elements) + segment[len(body):]
+
+
+def _edi_template(text: str) -> PayloadTemplate:
+    if text.startswith("ISA"):
+        kind, separator, terminator, release = "x12", text[3], text[105], None
+        start, end, references, counts = "ST", "SE", {"ST": 2, "SE": 2}, {"GE": 1}
+    else:
+        una = text.startswith("UNA")
+        separator = text[4] if una else "+"
+        release = (text[6] if una else "?").strip() or None
+        terminator = text[8] if una else "'"
+        kind, start, end, references, counts = "edifact", "UNH", "UNT", {"UNH": 1, "UNT": 2}, {"UNZ": 1}
+    segments = _split_segments(text, terminator, release)
+    tags = [segment.strip().split(separator, 1)[0] for segment in segments]
+    if start not in tags or end not in tags:
+        raise ValueError(f"{kind.upper()} input has no {start}..{end} message to repeat")
+    first, last = tags.index(start), len(tags) - 1 - tags[::-1].index(end)
+
+    def mark(segment: str, tag: str, value: str, fields: dict[str, int]) -> str:
+        return _set_element(segment, separator, terminator, fields[tag], value) if tag in fields else segment
+
+    records, current = [], ""
+    for segment, tag in zip(segments[first:last + 1], tags[first:last + 1]):
+        current += mark(segment, tag, SEQ, references)
+        if tag == end:
+            records.append(current)
+            current = ""
+    head = "".join(segments[:first])
+    tail = current + "".join(mark(s, t, COUNT, counts) for s, t in zip(segments[last + 1:], tags[last + 1:]))
+    return PayloadTemplate(kind, records=records, head=head, tail=tail, seq_width=4 if kind == "x12" else 1)
+
+
+def _json_template(text: str) -> PayloadTemplate:
+    data = json.loads(text)
+    array = longest_array(data)
+    if not array:
+        raise ValueError("JSON input has no array to repeat")
+    records = [json.dumps(item) for item in array]
+    array[:] = [_RECORDS]
+    head, tail = json.dumps(data).split(json.dumps(_RECORDS))
+    return PayloadTemplate("json", records=records, head=head, tail=tail, separator=", ")
+
+
+def _lines_template(text: str, kind: str, header: int) -> PayloadTemplate:
+    lines = text.splitlines(keepends=True)
+    if lines and not lines[-1].endswith(("\n", "\r")):
+        lines[-1] += "\r\n" if lines[0].endswith("\r\n") else "\n"
+    if len(lines) <= header:
+        raise ValueError("Input has no records after the header")
+    return PayloadTemplate(kind, records=lines[header:], head="".join(lines[:header]))
+
+
+def _base64_template(text: str) -> PayloadTemplate:
+    lines = text.split()
+    try:
+        binary = base64.b64decode("".join(lines), validate=True)
+    except binascii.Error as e:
+        raise ValueError(f"Invalid base64 input: {e}")
+    if not binary:
+        raise ValueError("Base64 input is empty")
+    # Keep the fixture's line wrapping when it is a whole number of base64 quanta
+    line_length = len(lines[0]) if len(lines) > 1 and len(lines[0]) % 4 == 0 else 0
+    return PayloadTemplate("base64", binary=binary, line_length=line_length)
+
+
+def infer_template(body: str, file_name: Optional[str], encoding: str = "text") -> PayloadTemplate:
+    """Payload template of an input body; raises ValueError when it has no records."""
+    suffix = (file_name or "").lower()
+    stripped = body.lstrip("﻿ \t\r\n")
+    try:
+        if encoding == "base64" or suffix.endswith(".base64.txt"):
+            return _base64_template(body)
+        if suffix.endswith(".xml") or (not suffix.endswith((".csv", ".json")) and stripped.startswith("<")):
+            return _xml_template(stripped)
+        if suffix.endswith(".json"):
+            return _json_template(body)
+    except (ET.ParseError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read the structure of {file_name or 'input body'}: {e}")
+    if stripped.startswith(("UNA", "UNB", "ISA")):
+        return _edi_template(stripped)
+    return _lines_template(body, "csv" if suffix.endswith(".csv") else "text", header=1 if suffix.endswith(".csv") else 0)
+
+
+def fixture_template(fixtures: Fixtures) -> PayloadTemplate:
+    """Payload template of an example's input body fixture."""
+    if fixtures.body is None:
+        raise ValueError("The example has no input.body.* fixture to generate payloads from")
+    return infer_template(fixtures.body, fixtures.body_file, fixtures.body_encoding)
+
+
+class _Parts:
+    """A text split around a placeholder, with the UTF-8 size of its fixed parts."""
+
+    __slots__ = ("parts", "fixed")
+
+    def __init__(self, text: str, placeholder: str):
+        self.parts = text.split(placeholder)
+        self.fixed = sum(len(part.encode("utf-8")) for part in self.parts)
+
+    def size(self, value: str) -> int:
+        return self.fixed + (len(self.parts) - 1) * len(value)
+
+    def render(self, value: str) -> str:
+        return value.join(self.parts)
+
+
+class _Layout:
+    """Byte positions of the records of a text payload, computed without rendering them.
+
+    Record ``i`` (0-based) is numbered ``i + 1`` and repeats row ``i % len(rows)``;
+    every record but the first starts with the separator.
+    """
+
+    def __init__(self, template: PayloadTemplate):
+        self.template = template
+        self.head = template.head.encode("utf-8")
+        self.tail = _Parts(template.tail, COUNT)
+        self.rows = [_Parts(record, SEQ) for record in template.records]
+        self.separator = template.separator.encode("utf-8")
+        self.cycle = sum(row.fixed for row in self.rows)
+        self.numbered = any(len(row.parts) > 1 for row in self.rows)
+
+    def records_size(self, count: int) -> int:
+        """Bytes of the first ``count`` records, with the separators between them."""
+        if count <= 0:
+            return 0
+        cycles, rest = divmod(count, len(self.rows))
+        size = self.cycle * cycles + sum(row.fixed for row in self.rows[:rest]) + len(self.separator) * (count - 1)
+        if not self.numbered:
+            return size
+        width = self.template.seq_width
+        # Numbers of each digit count, split by the row they fall on
+        for digits in range(1, len(str(count)) + 1):
+            low, high = 10 ** (digits - 1), min(10 ** digits - 1, count)
+            for position, row in enumerate(self.rows):
+                if len(row.parts) > 1:
+                    numbers = self._numbered(high, position) - self._numbered(low - 1, position)
+                    size += (len(row.parts) - 1) * max(digits, width) * numbers
+        return size
+
+    def _numbered(self, last: int, position: int) -> int:
+        """How many of the numbers 1..last fall on the row at position."""
+        return (last + len(self.rows) - 1 - position) // len(self.rows)
+
+    def count(self, size: Optional[int], records: Optional[int]) -> int:
+        """Records in a payload of at most ``size`` bytes and ``records`` records (at least one)."""
+        if size is None:
+            return records
+        high = size if records is None else min(size, records)
+        if high <= 1:
+            return 1
+        budget = size - len(self.head)
+        # Largest count whose records and tail fit, by bisection
+        low = 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.records_size(middle) + self.tail.size(str(middle)) <= budget:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def record_at(self, position: int, count: int) -> int:
+        """Index of the record (of ``count``) holding a byte position after the head."""
+        low, high = 0, count - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.records_size(middle) <= position:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def chunks(self, start: int, stop: int, chunk_bytes: int) -> Generator[bytes, None, None]:
+        """UTF-8 chunks of records ``start`` to ``stop - 1``."""
+        rows = len(self.rows)
+        if not self.numbered:
+            # Unnumbered records: repeat whole cycles of them as one prebuilt block
+            cycles = max(1, chunk_bytes // (self.cycle + len(self.separator) * rows))
+            block = self.template.separator.join(self.template.records * cycles).encode("utf-8")
+            per_block = rows * cycles
+        buffer: list[str] = []
+        buffered = 0
+        index = start
+        while index < stop:
+            if not self.numbered and index % rows == 0 and stop - index >= per_block:
+                if buffer:
+                    yield "".join(buffer).encode("utf-8")
+                    buffer, buffered = [], 0
+                yield (self.separator + block) if index else block
+                index += per_block
+                continue
+            number = str(index + 1).zfill(self.template.seq_width)
+            if index:
+                buffer.append(self.template.separator)
+            text = self.rows[index % rows].render(number)
+            buffer.append(text)
+            buffered += len(text) + len(self.separator)
+            index += 1
+            if buffered >= chunk_bytes:
+                yield "".join(buffer).encode("utf-8")
+                buffer, buffered = [], 0
+        if buffer:
+            yield "".join(buffer).encode("utf-8")
+
+
+def stream_payload(
+    template: PayloadTemplate,
+    size: Optional[int] = None,
+    records: Optional[int] = None,
+    chunk_bytes: int = CHUNK_BYTES,
+) -> Generator[bytes, None, int]:
+    """UTF-8 chunks of a payload of at most ``size`` bytes or of ``records`` records.
+
+    With both limits the payload stops at whichever is reached first; at
+    least one record is always written, even when it alone exceeds ``size``.
+    The generator returns the number of records written.
+    """
+    if size is None and records is None:
+        raise ValueError("Give a size or a number of records")
+    if template.kind == "base64":
+        return (yield from _stream_base64(template, size, records, chunk_bytes))
+    layout = _Layout(template)
+    count = layout.count(size, records)
+    yield layout.head
+    yield from layout.chunks(0, count, chunk_bytes)
+    yield layout.tail.render(str(count)).encode("utf-8")
+    return count
+
+
+def _base64_size(decoded: int, line_length: int) -> int:
+    encoded = 4 * -(-decoded // 3)
+    return encoded + (-(-encoded // line_length) if line_length else 0)
+
+
+def _base64_total(template: PayloadTemplate, size: Optional[int], records: Optional[int]) -> int:
+    """Decoded bytes of a base64 payload."""
+    binary = template.binary
+    line_length = template.line_length
+    total = len(binary) * records if records is not None else None
+    if size is not None:
+        # Largest decoded length whose encoding fits, but at least one copy
+        fits = size * 3 // 4
+        while fits > 0 and _base64_size(fits, line_length) > size:
+            fits -= max(1, (_base64_size(fits, line_length) - size) * 3 // 4)
+        fits = max(fits, len(binary))
+        total = fits if total is None else min(total, fits)
+    return total
+
+
+def _base64_quantum(template: PayloadTemplate) -> int:
+    """Decoded bytes of one whole line (or base64 quantum) of the output."""
+    return template.line_length // 4 * 3 if template.line_length else 3
+
+
+def _stream_base64(
+    template: PayloadTemplate,
+    size: Optional[int],
+    records: Optional[int],
+    chunk_bytes: int,
+    start: int = 0,
+) -> Generator[bytes, None, int]:
+    """Base64 text of the template's bytes repeated, wrapped like the fixture,
+    from the decoded position ``start`` (a whole number of quanta) on;
+    returns the number of (started) copies."""
+    binary = template.binary
+    line_length = template.line_length
+    total = _base64_total(template, size, records)
+    # Whole lines (and whole base64 quanta) per chunk, so chunks encode independently
+    quantum = _base64_quantum(template)
+    block = max(quantum, chunk_bytes * 3 // 4 // quantum * quantum)
+    repeated = binary * (-(-block // len(binary)) + 1)
+    copies = -(-total // len(binary))
+    position = start
+    while position < total:
+        take = min(block, total - position)
+        offset = position % len(binary)
+        encoded = base64.b64encode(repeated[offset:offset + take])
+        if line_length:
+            encoded = b"".join(encoded[i:i + line_length] + b"\n" for i in range(0, len(encoded), line_length))
+        yield encoded
+        position += take
+    return copies
+
+
+def write_payload(template: PayloadTemplate, out: BinaryIO, size: Optional[int] = None,
+                  records: Optional[int] = None) -> tuple[int, int]:
+    """Stream a payload into a binary file object; returns (bytes, records) written."""
+    written = 0
+    chunks = stream_payload(template, size, records)
+    while True:
+        try:
+            chunk = next(chunks)
+        except StopIteration as done:
+            return written, done.value
+        out.write(chunk)
+        written += len(chunk)
+
+
+def _cut(chunks, position: int, offset: int, length: int) -> list[bytes]:
+    """The parts of consecutive chunks, the first starting at ``position``, within the range."""
+    parts = []
+    end = offset + length
+    for chunk in chunks:
+        if position >= end:
+            break
+        if position + len(chunk) > offset:
+            parts.append(chunk[max(0, offset - position):end - position])
+        position += len(chunk)
+    return parts
+
+
+def payload_slice(template: PayloadTemplate, offset: int, length: int, size: Optional[int] = None,
+                  records: Optional[int] = None) -> bytes:
+    """Bytes ``offset`` to ``offset + length`` of a payload, without producing the rest.
+
+    The payload is deterministic and the size of every record is known
+    up front, so rendering starts at the record holding ``offset``; reading
+    consecutive slices yields the same bytes as one full write.
+    """
+    if offset < 0 or length < 0:
+        raise ValueError("Offset and length must not be negative")
+    if size is None and records is None:
+        raise ValueError("Give a size or a number of records")
+    chunk_bytes = min(CHUNK_BYTES, max(length, 64 * 1024))
+    if template.kind == "base64":
+        quantum = _base64_quantum(template)
+        encoded = quantum // 3 * 4 + (1 if template.line_length else 0)
+        skipped = offset // encoded
+        chunks = _stream_base64(template, size, records, chunk_bytes, start=skipped * quantum)
+        return b"".join(_cut(chunks, skipped * encoded, offset, length))
+    layout = _Layout(template)
+    count = layout.count(size, records)
+    body_start = len(layout.head)
+    tail_start = body_start + layout.records_size(count)
+    parts = _cut([layout.head], 0, offset, length)
+    if offset + length > body_start and offset < tail_start:
+        first = layout.record_at(max(0, offset - body_start), count)
+        chunks = layout.chunks(first, count, chunk_bytes)
+        parts += _cut(chunks, body_start + layout.records_size(first), offset, length)
+    parts += _cut([layout.tail.render(str(count)).encode("utf-8")], tail_start, offset, length)
+    return b"".join(parts)
+
+
+def measure_payload(template: PayloadTemplate, size: Optional[int] = None,
+                    records: Optional[int] = None) -> tuple[int, int]:
+    """(bytes, records) of a payload, computed without generating it."""
+    if size is None and records is None:
+        raise ValueError("Give a size or a number of records")
+    if template.kind == "base64":
+        total = _base64_total(template, size, records)
+        return _base64_size(total, template.line_length), -(-total // len(template.binary))
+    layout = _Layout(template)
+    count = layout.count(size, records)
+    return len(layout.head) + layout.records_size(count) + layout.tail.size(str(count)), count
+
+
+def payload_key(template: PayloadTemplate, size: Optional[int] = None, records: Optional[int] = None) -> str:
+    """Short hash naming a payload: equal keys mean equal bytes."""
+    return hashlib.sha1(repr((astuple(template), size, records)).encode("utf-8")).hexdigest()[:12]
+
+
+def prune_payloads(directory: Path, max_bytes: int, reserve: int = 0) -> list[Path]:
+    """Remove the least recently used payload files until ``reserve`` more bytes fit
+    under ``max_bytes``; returns the removed files.
+
+    Files still being written (``*.part``) count towards the total but are kept.
+    """
+    if reserve > max_bytes:
+        raise ValueError(f"A payload of {reserve} bytes does not fit in the {max_bytes} bytes kept for payload files")
+    files = []
+    total = reserve
+    for path in directory.glob("*") if directory.is_dir() else ():
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        total += st.st_size
+        if path.is_file() and not path.name.endswith(".part"):
+            files.append((st.st_mtime_ns, path, st.st_size))
+    removed = []
+    for _, path, file_size in sorted(files):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= file_size
+        removed.append(path)
+    return removed
+
+
+def reuse_payload(path: Path, size: int) -> bool:
+    """Whether a complete payload file of ``size`` bytes exists; marks it as recently used."""
+    try:
+        if path.stat().st_size != size:
+            return False
+        os.utime(path)
+    except FileNotFoundError:
+        return False
+    return True
+
+
+def save_payload(template: PayloadTemplate, path: Path, size: Optional[int] = None,
+                 records: Optional[int] = None) -> tuple[int, int]:
+    """Write a payload to a file (through a temporary name); returns (bytes, records) written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Per thread, so concurrent writers of the same payload do not share a file
+    partial = path.with_name(f"{path.name}.{threading.get_ident()}.part")
+    try:
+        with open(partial, "wb") as out:
+            written = write_payload(template, out, size, records)
+        os.replace(partial, path)
+    finally:
+        partial.unlink(missing_ok=True)
+    return written
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from catalog import ExampleCatalog
+    from groovy_runner import load_fixtures
+
+    parser = argparse.ArgumentParser(description="Stream a large synthetic input payload built from an example's fixture")
+    parser.add_argument("name", help="example whose input.body.* fixture is the template")
+    parser.add_argument("--size", help="approximate payload size, e.g. 512M or 4G")
+    parser.add_argument("--records", type=int, help="number of records (messages, rows, elements) to write")
+    parser.add_argument("-o", "--output", default="-", help="output file ('-' for stdout)")
+    parser.add_argument("--base-dir", type=Path, default=Path(__file__).parent)
+    args = parser.parse_args(argv)
+
+    catalog = ExampleCatalog(args.base_dir)
+    catalog.load()
+    try:
+        if args.size is None and args.records is None:
+            raise ValueError("Give --size or --records")
+        size = parse_size(args.size) if args.size is not None else None
+        template = fixture_template(load_fixtures(catalog.get(args.name).path))
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    if args.output == "-":
+        write_payload(template, sys.stdout.buffer, size, args.records)
+        sys.stdout.buffer.flush()
+    else:
+        written, count = save_payload(template, Path(args.output), size, args.records)
+        print(f"Wrote {count} records, {written} bytes of {template.kind} to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Payload-scaling profiler for example scripts.
+
+Runs an example's script against its ``input.body.*`` fixture scaled to
+several multiples (1x, 10x, 100x and 1000x by default) in a warm Groovy
+worker (see groovy_runner.py) and records, per size, the wall time, the
+bytes allocated by the run, the heap growth and the peak resident set size
+of the worker. A power law fitted to each series (least squares on log-log
+points) estimates how the script grows with the payload: an exponent near 1
+is linear, near 2 quadratic.
+
+Payloads are scaled by repeating their records rather than padding them:
+
+- XML: the children of the first element below the root chain of single
+  wrappers (``<Orders><Order/><Order/></Orders>`` repeats the orders)
+- CSV: every line after the header
+- JSON: the longest array, at the top level or nested in objects
+- other text: every line
+
+Binary (base64) inputs cannot be scaled this way and are rejected.
+
+Profiling uses its own worker, separate from the pool other tools share,
+with a capped heap (``PROFILE_HEAP_MB``) and a per-run time limit, so a large
+input fails at that size with an OutOfMemoryError instead of exhausting the
+host's memory.
+
+Usage: python profiler.py NAME [--factors 1 10 100 1000] [--repeat 3] [--max-exponent 1.5]
+"""
+
+import argparse
+import asyncio
+import copy
+import io
+import json
+import math
+import os
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from catalog import Example
+from groovy_runner import (
+    ExampleRunner, Fixtures, GroovyWorkerPool, GROOVY_COMMAND, find_groovy, load_fixtures,
+)
+
+DEFAULT_FACTORS = (1, 10, 100, 1000)
+MAX_FACTORS = 8
+# 10,000 copies of a fixture of a few KiB already exceed PROFILE_MAX_BYTES
+MAX_FACTOR = 10_000
+
+# Largest scaled input sent to a worker; bigger sizes are skipped
+PROFILE_MAX_BYTES = int(float(os.environ.get("SAP_GROOVY_MCP_PROFILE_MAX_MB", "64")) * 1024 * 1024)
+
+# Heap of the profiling worker and seconds allowed for one profiled run
+PROFILE_HEAP_MB = int(os.environ.get("SAP_GROOVY_MCP_PROFILE_HEAP_MB", "1024"))
+PROFILE_RUN_TIMEOUT = float(os.environ.get("SAP_GROOVY_MCP_PROFILE_RUN_TIMEOUT", "60"))
+
+# Points below these floors are dominated by fixed costs and left out of the fit
+TIME_FLOOR_MS = 1.0
+MEMORY_FLOOR_BYTES = 64 * 1024
+
+
+def root_start(text: str) -> int:
+    """Offset of the root element's start tag (after the prolog, comments and DOCTYPE)."""
+    for match in re.finditer(r"<", text):
+        if not text.startswith(("<?", "<!"), match.start()):
+            return match.start()
+    raise ValueError("No root element found")
+
+
+def _scale_xml(text: str, factor: int) -> str:
+    prolog = text[:root_start(text)]
+    for _, (prefix, uri) in ET.iterparse(io.StringIO(text), events=("start-ns",)):
+        if prefix:
+            ET.register_namespace(prefix, uri)
+    root = ET.fromstring(text)
+    container = root
+    while len(container) == 1:
+        container = container[0]
+    if len(container) == 0:
+        container.text = (container.text or "") * factor
+    else:
+        records = list(container)
+        for _ in range(factor - 1):
+            container.extend(copy.deepcopy(record) for record in records)
+    return prolog + ET.tostring(root, encoding="unicode")
+
+
+def longest_array(value) -> Optional[list]:
+    best = value if isinstance(value, list) else None
+    children = value.values() if isinstance(value, dict) else value if isinstance(value, list) else ()
+    for child in children:
+        candidate = longest_array(child) if isinstance(child, (dict, list)) else None
+        if candidate is not None and (best is None or len(candidate) > len(best)):
+            best = candidate
+    return best
+
+
+def _scale_json(text: str, factor: int) -> str:
+    data = json.loads(text)
+    array = longest_array(data)
+    if not array:
+        raise ValueError("JSON input has no array to repeat")
+    array[:] = array * factor
+    return json.dumps(data)
+
+
+def _scale_lines(text: str, factor: int, header: int) -> str:
+    lines = text.splitlines(keepends=True)
+    if lines and not lines[-1].endswith(("\n", "\r")):
+        lines[-1] += "\n"
+    if len(lines) <= header:
+        raise ValueError("Input has no records after the header")
+    return "".join(lines[:header]) + "".join(lines[header:]) * factor
+
+
+def scale_body(body: str, file_name: Optional[str], factor: int) -> str:
+    """An input body with its records repeated ``factor`` times."""
+    if factor == 1:
+        return body
+    suffix = (file_name or "").lower()
+    try:
+        if suffix.endswith(".xml") or (not suffix and body.lstrip().startswith("<")):
+            return _scale_xml(body, factor)
+        if suffix.endswith(".json"):
+            return _scale_json(body, factor)
+    except (ET.ParseError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot scale {file_name or 'input body'}: {e}")
+    return _scale_lines(body, factor, header=1 if suffix.endswith(".csv") else 0)
+
+
+def fit_exponent(sizes: list[float], values: list[Optional[float]], floor: float) -> Optional[float]:
+    """Exponent k of the power law value ~ size^k through the points above ``floor``."""
+    points = [(math.log(s), math.log(v)) for s, v in zip(sizes, values) if s > 0 and v is not None and v >= floor]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if not spread:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def classify(exponent: Optional[float]) -> str:
+    """Growth class of a fitted exponent."""
+    if exponent is None:
+        return "too small to tell"
+    if exponent < 0.5:
+        return "constant"
+    if exponent < 1.3:
+        return "linear"
+    if exponent < 1.7:
+        return "superlinear"
+    if exponent < 2.5:
+        return "quadratic"
+    return "worse than quadratic"
+
+
+@dataclass
+class ProfilePoint:
+    """Best of the repeated runs at one input size."""
+
+    factor: int
+    input_bytes: int
+    elapsed_ms: Optional[float] = None
+    allocated_bytes: Optional[int] = None
+    heap_growth_bytes: Optional[int] = None
+    peak_rss_bytes: Optional[int] = None
+    output_length: Optional[int] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class ProfileReport:
+    name: str
+    input_file: str
+    points: list[ProfilePoint] = field(default_factory=list)
+    skipped: list[tuple[int, str]] = field(default_factory=list)
+
+    def _series(self, attribute: str) -> tuple[list[float], list[Optional[float]]]:
+        measured = [p for p in self.points if p.error is None]
+        return [p.input_bytes for p in measured], [getattr(p, attribute) for p in measured]
+
+    @property
+    def exponents(self) -> dict[str, Optional[float]]:
+        """Fitted growth exponents of time, allocation and heap growth."""
+        return {
+            "time": fit_exponent(*self._series("elapsed_ms"), TIME_FLOOR_MS),
+            "allocation": fit_exponent(*self._series("allocated_bytes"), MEMORY_FLOOR_BYTES),
+            "heap": fit_exponent(*self._series("heap_growth_bytes"), MEMORY_FLOOR_BYTES),
+        }
+
+
+def profiling_pool(groovy: str = GROOVY_COMMAND) -> GroovyWorkerPool:
+    """A one-worker pool with the profiling heap cap."""
+    return GroovyWorkerPool(1, groovy, (f"-Xmx{PROFILE_HEAP_MB}m",))
+
+
+def check_factors(factors: Iterable[int]) -> list[int]:
+    factors = sorted(set(factors))
+    if not factors or len(factors) > MAX_FACTORS or factors[0] < 1 or factors[-1] > MAX_FACTOR:
+        raise ValueError(f"Give 1 to {MAX_FACTORS} scale factors between 1 and {MAX_FACTOR}")
+    return factors
+
+
+async def profile_example(
+    runner: ExampleRunner,
+    example: Example,
+    fixtures: Fixtures,
+    factors: Iterable[int] = DEFAULT_FACTORS,
+    repeat: int = 3,
+    function: str = "processData",
+    budget: Optional[float] = None,
+    max_bytes: int = PROFILE_MAX_BYTES,
+    run: Optional[Callable] = None,
+) -> ProfileReport:
+    """Run an example at each scale factor and collect its profile.
+
+    Scaling stops at the first size that fails, would exceed ``max_bytes``
+    (estimated as fixture size times factor, before the input is built) or
+    would start after ``budget`` seconds. ``run`` is an awaitable
+    executor used to build the scaled inputs off the event loop.
+    """
+    factors = check_factors(factors)
+    if fixtures.body is None:
+        raise ValueError(f"{example.name} has no input.body.* fixture to scale")
+    if fixtures.body_encoding == "base64":
+        raise ValueError(f"{fixtures.body_file} is binary and cannot be scaled by repeating records")
+    run = run or asyncio.to_thread
+    repeat = max(1, min(repeat, 10))
+    deadline = time.monotonic() + budget if budget else None
+    report = ProfileReport(example.name, fixtures.body_file or "input body")
+    inputs = Fixtures(body=fixtures.body, body_file=fixtures.body_file,
+                      headers=fixtures.headers, properties=fixtures.properties)
+
+    # Compile the script and warm the JIT before anything is measured
+    await runner.run(example, function, fixtures=inputs, profile=True)
+    body_bytes = len(fixtures.body.encode("utf-8"))
+    for position, factor in enumerate(factors):
+        # Skip oversized inputs before building them; the build cannot be cancelled
+        if body_bytes * factor > max_bytes:
+            report.skipped += [(f, f"input over {format_bytes(max_bytes)}") for f in factors[position:]]
+            break
+        body = await run(scale_body, fixtures.body, fixtures.body_file, factor)
+        size = len(body.encode("utf-8"))
+        if size > max_bytes:
+            report.skipped += [(f, f"input over {format_bytes(max_bytes)}") for f in factors[position:]]
+            break
+        point = ProfilePoint(factor, size)
+        for _ in range(repeat):
+            limit = PROFILE_RUN_TIMEOUT
+            remaining = limit if deadline is None else min(limit, deadline - time.monotonic())
+            if remaining <= 0:
+                break
+            result = await runner.run(example, function, remaining, replace(inputs, body=body), profile=True)
+            if not result.ok:
+                point.error = result.error or result.status
+                if "OutOfMemoryError" in point.error:
+                    point.error = f"out of memory (heap capped at {PROFILE_HEAP_MB} MiB)"
+                break
+            if point.elapsed_ms is None or result.elapsed_ms < point.elapsed_ms:
+                profile = result.profile or {}
+                point.elapsed_ms = result.elapsed_ms
+                point.allocated_bytes = profile.get("allocatedBytes")
+                peak, baseline = profile.get("peakHeapBytes"), profile.get("heapBaselineBytes")
+                point.heap_growth_bytes = max(0, peak - baseline) if peak is not None and baseline is not None else None
+                point.peak_rss_bytes = profile.get("peakRssBytes")
+                point.output_length = profile.get("outputLength")
+        if point.elapsed_ms is None and point.error is None:
+            report.skipped += [(f, "time budget used up") for f in factors[position:]]
+            break
+        report.points.append(point)
+        if point.error is not None:
+            report.skipped += [(f, f"failed at {factor}x") for f in factors[position + 1:]]
+            break
+    return report
+
+
+def format_bytes(value: Optional[int]) -> str:
+    if value is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB"):
+        if abs(value) < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from catalog import ExampleCatalog
+
+    parser = argparse.ArgumentParser(description="Measure how an example's time and memory grow with payload size")
+    parser.add_argument("name", help="example to profile")
+    parser.add_argument("--factors", type=int, nargs="+", default=list(DEFAULT_FACTORS), help="input scale factors")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size (the fastest is kept)")
+    parser.add_argument("--function", default="processData", help="script function to call")
+    parser.add_argument("--max-exponent", type=float, help="exit with status 1 when time or allocation grows faster")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--base-dir", type=Path, default=Path(__file__).parent)
+    parser.add_argument("--groovy", default=GROOVY_COMMAND, help="groovy launcher")
+    args = parser.parse_args(argv)
+
+    catalog = ExampleCatalog(args.base_dir)
+    catalog.load()
+    try:
+        find_groovy(args.groovy)
+        example = catalog.get(args.name)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    async def run_profile() -> ProfileReport:
+        pool = profiling_pool(args.groovy)
+        try:
+            fixtures = load_fixtures(example.path)
+            return await profile_example(ExampleRunner(pool), example, fixtures, args.factors, args.repeat, args.function)
+        finally:
+            await pool.close()
+
+    try:
+        report = asyncio.run(run_profile())
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    exponents = report.exponents
+    if args.json:
+        data = {
+            "name": report.name,
+            "input": report.input_file,
+            "points": [point.__dict__ for point in report.points],
+            "skipped": report.skipped,
+            "exponents": exponents,
+        }
+        print(json.dumps(data, indent=2))
+    else:
+        print(f"{report.name} ({report.input_file})")
+        for p in report.points:
+            if p.error is not None:
+                print(f"{p.factor:>7}x {format_bytes(p.input_bytes):>11}  ERROR {p.error}")
+                continue
+            print(f"{p.factor:>7}x {format_bytes(p.input_bytes):>11} {p.elapsed_ms:>10.1f} ms"
+                  f"  alloc {format_bytes(p.allocated_bytes):>11}  heap +{format_bytes(p.heap_growth_bytes):>11}"
+                  f"  rss {format_bytes(p.peak_rss_bytes):>11}")
+        for factor, reason in report.skipped:
+            print(f"{factor:>7}x skipped: {reason}")
+        for series, exponent in exponents.items():
+            shown = "-" if exponent is None else f"{exponent:.2f}"
+            print(f"{series:>10}: n^{shown} ({classify(exponent)})")
+    if args.max_exponent is not None:
+        worst = [e for key, e in exponents.items() if key in ("time", "allocation") and e is not None]
+        if any(e > args.max_exponent for e in worst) or any(p.error for p in report.points):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
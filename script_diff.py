@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Line and structure level diff between two Groovy scripts.
+
+Lines are matched with patience diff (unique lines as anchors) and regions
+without unique lines fall back to Myers' O(ND) algorithm, which keeps large
+scripts fast. Methods are paired by name to report added, removed and
+changed methods, and a combined similarity score is computed. Results are
+cached per pair of content hashes.
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Optional
+
+from content_cache import ContentCache
+from groovy_parser import ScriptSummary, content_hash, source_bytes, summarize
+
+# Give up on Myers beyond this edit distance and treat the region as replaced
+MYERS_MAX_D = 2000
+
+# Context lines around each hunk of the unified diff
+CONTEXT_LINES = 3
+
+# Weights of the combined similarity score
+LINE_WEIGHT = 0.6
+IMPORT_WEIGHT = 0.2
+API_WEIGHT = 0.2
+
+
+def _normalize(line: str) -> str:
+    """Compare lines ignoring indentation and inner whitespace changes."""
+    return " ".join(line.split())
+
+
+def _unique_anchors(a: list[str], b: list[str], alo: int, ahi: int, blo: int, bhi: int) -> list[tuple[int, int]]:
+    """Longest increasing run of lines that occur exactly once in both ranges."""
+    counts: dict[str, list[int]] = {}
+    for i in range(alo, ahi):
+        entry = counts.setdefault(a[i], [0, 0, i, -1])
+        entry[0] += 1
+    for j in range(blo, bhi):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[1] += 1
+            entry[3] = j
+    pairs = sorted((e[2], e[3]) for e in counts.values() if e[0] == 1 and e[1] == 1)
+    if not pairs:
+        return []
+
+    # Patience sorting: longest increasing subsequence of b positions
+    tails: list[int] = []
+    tail_index: list[int] = []
+    previous = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        pos = bisect_left(tails, j)
+        if pos == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[pos] = j
+            tail_index[pos] = index
+        previous[index] = tail_index[pos - 1] if pos else -1
+    result = []
+    index = tail_index[-1]
+    while index >= 0:
+        result.append(pairs[index])
+        index = previous[index]
+    result.reverse()
+    return result
+
+
+def _myers(a: list[str], b: list[str], alo: int, ahi: int, blo: int, bhi: int) -> list[tuple[int, int]]:
+    """Matching line pairs of a[alo:ahi] and b[blo:bhi] by Myers' algorithm."""
+    n = ahi - alo
+    m = bhi - blo
+    if n == 0 or m == 0:
+        return []
+    v = {1: 0}
+    trace = []
+    for d in range(min(n + m, MYERS_MAX_D) + 1):
+        trace.append(dict(v))
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v.get(k - 1, -1) < v.get(k + 1, -1)):
+                x = v.get(k + 1, 0)
+            else:
+                x = v.get(k - 1, 0) + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[k] = x
+            if x >= n and y >= m:
+                return _myers_backtrack(trace, n, m, alo, blo)
+    return []
+
+
+def _myers_backtrack(trace: list[dict[int, int]], n: int, m: int, alo: int, blo: int) -> list[tuple[int, int]]:
+    matches = []
+    x, y = n, m
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        if k == -d or (k != d and v.get(k - 1, -1) < v.get(k + 1, -1)):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v.get(prev_k, 0)
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y and x > 0 and y > 0:
+            x -= 1
+            y -= 1
+            matches.append((alo + x, blo + y))
+        x, y = prev_x, prev_y
+    matches.reverse()
+    return matches
+
+
+def match_lines(a: list[str], b: list[str]) -> list[tuple[int, int]]:
+    """Matching (i, j) line index pairs, increasing in both i and j."""
+    matches = []
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        alo, ahi, blo, bhi = stack.pop()
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            matches.append((alo, blo))
+            alo += 1
+            blo += 1
+        while alo < ahi and blo < bhi and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            matches.append((ahi, bhi))
+        if alo >= ahi or blo >= bhi:
+            continue
+        anchors = _unique_anchors(a, b, alo, ahi, blo, bhi)
+        if not anchors:
+            matches.extend(_myers(a, b, alo, ahi, blo, bhi))
+            continue
+        prev_i, prev_j = alo, blo
+        for i, j in anchors:
+            matches.append((i, j))
+            stack.append((prev_i, i, prev_j, j))
+            prev_i, prev_j = i + 1, j + 1
+        stack.append((prev_i, ahi, prev_j, bhi))
+    matches.sort()
+    return matches
+
+
+def opcodes(a: list[str], b: list[str]) -> list[tuple[str, int, int, int, int]]:
+    """difflib-style opcodes ('equal', 'replace', 'delete', 'insert')."""
+    codes = []
+    i = j = 0
+    for mi, mj in match_lines(a, b) + [(len(a), len(b))]:
+        if i < mi and j < mj:
+            codes.append(("replace", i, mi, j, mj))
+        elif i < mi:
+            codes.append(("delete", i, mi, j, j))
+        elif j < mj:
+            codes.append(("insert", i, i, j, mj))
+        if mi < len(a):
+            if codes and codes[-1][0] == "equal" and codes[-1][2] == mi:
+                tag, i1, _, j1, _ = codes[-1]
+                codes[-1] = (tag, i1, mi + 1, j1, mj + 1)
+            else:
+                codes.append(("equal", mi, mi + 1, mj, mj + 1))
+        i, j = mi + 1, mj + 1
+    return codes
+
+
+def _grouped(codes: list[tuple[str, int, int, int, int]], n: int = CONTEXT_LINES):
+    """Split opcodes into hunks with n lines of context (as difflib does)."""
+    if not codes:
+        return
+    codes = list(codes)
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = tag, max(i1, i2 - n), i2, max(j1, j2 - n), j2
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > 2 * n:
+            group.append((tag, i1, min(i2, i1 + n), j1, min(j2, j1 + n)))
+            yield group
+            group = []
+            i1, j1 = max(i1, i2 - n), max(j1, j2 - n)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        yield group
+
+
+def _range(start: int, stop: int) -> str:
+    length = stop - start
+    beginning = start + 1 if length else start
+    return str(beginning) if length == 1 else f"{beginning},{length}"
+
+
+def unified_diff(a: list[str], b: list[str], codes, name_a: str, name_b: str) -> list[str]:
+    """Render opcodes as unified diff lines."""
+    out = []
+    for group in _grouped(codes):
+        if not out:
+            out.append(f"--- {name_a}")
+            out.append(f"+++ {name_b}")
+        first, last = group[0], group[-1]
+        out.append(f"@@ -{_range(first[1], last[2])} +{_range(first[3], last[4])} @@")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                out.extend(" " + line for line in a[i1:i2])
+                continue
+            out.extend("-" + line for line in a[i1:i2])
+            out.extend("+" + line for line in b[j1:j2])
+    return out
+
+
+def line_ratio(a: list[str], b: list[str]) -> float:
+    """Share of lines that match, 2*M / (len(a) + len(b))."""
+    if not a and not b:
+        return 1.0
+    matched = sum(i2 - i1 for tag, i1, i2, _, _ in opcodes(a, b) if tag == "equal")
+    return 2.0 * matched / (len(a) + len(b))
+
+
+def _jaccard(x: set, y: set) -> float:
+    if not x and not y:
+        return 1.0
+    return len(x & y) / len(x | y)
+
+
+@dataclass
+class MethodChange:
+    status: str  # "added", "removed", "changed" or "unchanged"
+    name: str
+    signature: str
+    similarity: float = 1.0
+
+
+@dataclass
+class ScriptDiff:
+    """Diff between two scripts, independent of their file names."""
+
+    lines_a: list[str]
+    lines_b: list[str]
+    codes: list[tuple[str, int, int, int, int]]
+    line_similarity: float
+    import_similarity: float
+    api_similarity: float
+    methods: list[MethodChange] = field(default_factory=list)
+    added_lines: int = 0
+    removed_lines: int = 0
+
+    @property
+    def similarity(self) -> float:
+        return (LINE_WEIGHT * self.line_similarity + IMPORT_WEIGHT * self.import_similarity
+                + API_WEIGHT * self.api_similarity)
+
+    def unified(self, name_a: str, name_b: str) -> list[str]:
+        return unified_diff(self.lines_a, self.lines_b, self.codes, name_a, name_b)
+
+
+def _method_key(method) -> tuple[Optional[str], str]:
+    return method.class_name, method.name
+
+
+def _method_changes(lines_a: list[str], lines_b: list[str], sa: ScriptSummary, sb: ScriptSummary) -> list[MethodChange]:
+    methods_a = {_method_key(m): m for m in sa.methods}
+    methods_b = {_method_key(m): m for m in sb.methods}
+    changes = []
+    for key, ma in methods_a.items():
+        mb = methods_b.get(key)
+        if mb is None:
+            changes.append(MethodChange("removed", ma.name, ma.signature, 0.0))
+            continue
+        body_a = [_normalize(line) for line in lines_a[ma.start - 1:ma.end]]
+        body_b = [_normalize(line) for line in lines_b[mb.start - 1:mb.end]]
+        if body_a == body_b:
+            changes.append(MethodChange("unchanged", ma.name, mb.signature))
+        else:
+            changes.append(MethodChange("changed", ma.name, mb.signature, line_ratio(body_a, body_b)))
+    for key, mb in methods_b.items():
+        if key not in methods_a:
+            changes.append(MethodChange("added", mb.name, mb.signature, 0.0))
+    return changes
+
+
+def _compute(content_a: str, content_b: str) -> ScriptDiff:
+    lines_a = content_a.split("\n")
+    lines_b = content_b.split("\n")
+    norm_a = [_normalize(line) for line in lines_a]
+    norm_b = [_normalize(line) for line in lines_b]
+    codes = opcodes(norm_a, norm_b)
+    matched = sum(i2 - i1 for tag, i1, i2, _, _ in codes if tag == "equal")
+    sa = summarize(content_a)
+    sb = summarize(content_b)
+    return ScriptDiff(
+        lines_a=lines_a,
+        lines_b=lines_b,
+        codes=codes,
+        line_similarity=2.0 * matched / (len(lines_a) + len(lines_b)),
+        import_similarity=_jaccard({i.name for i in sa.imports}, {i.name for i in sb.imports}),
+        api_similarity=_jaccard({c.method for c in sa.sap_calls}, {c.method for c in sb.sap_calls}),
+        methods=_method_changes(lines_a, lines_b, sa, sb),
+        added_lines=sum(j2 - j1 for tag, _, _, j1, j2 in codes if tag != "equal"),
+        removed_lines=sum(i2 - i1 for tag, i1, i2, _, _ in codes if tag != "equal"),
+    )
+
+
+# Diffs keyed by (hash of first script, hash of second script), weighed by both sources' size (in bytes)
+DIFF_CACHE_BYTES = 16 * 1024 * 1024
+_DIFF_CACHE: ContentCache[ScriptDiff] = ContentCache(DIFF_CACHE_BYTES)
+
+
+def diff_cache_info() -> dict:
+    """Hit/miss counters and fill level of the diff cache."""
+    return _DIFF_CACHE.info()
+
+
+def diff_scripts(content_a: str, content_b: str) -> ScriptDiff:
+    """Return the (cached) diff between two scripts. Thread-safe."""
+    key = (content_hash(content_a), content_hash(content_b))
+    weight = source_bytes(content_a) + source_bytes(content_b)
+    return _DIFF_CACHE.get_or_compute(key, weight, lambda: _compute(content_a, content_b))
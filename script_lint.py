@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Rule-based performance linter for CPI Groovy scripts.
+
+Rules look for code that works on small test payloads but fails under load:
+reading the whole body into a String, building full XML DOMs, reading whole
+files, growing Strings inside loops, attaching unbounded payloads to the
+message processing log, and similar patterns. Every finding carries a
+severity, the line and a suggested streaming alternative.
+
+Rules run over the token stream (comments and strings are lexed, so text in
+them never matches). Results are cached per content hash like parsed
+summaries, so re-linting an unchanged corpus costs one lookup per script.
+
+Lint examples from the command line (exit status 1 if any error is found):
+
+    python script_lint.py [NAME ...] [--min-severity warning]
+"""
+
+import argparse
+import logging
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from content_cache import ContentCache
+from groovy_parser import IDENT, OP, STRING, Token, content_hash, match_brackets, source_bytes, summarize, tokenize
+
+logger = logging.getLogger("sap-groovy-mcp")
+
+SEVERITIES = ("error", "warning", "info")
+
+# rule id -> (severity, message, suggestion)
+RULES = {
+    "body-to-string": (
+        "warning",
+        "`getBody(String)` copies the whole payload into one String",
+        "Read `message.getBody(java.io.Reader)` or `getBody(java.io.InputStream)` and process it incrementally",
+    ),
+    "body-to-bytes": (
+        "warning",
+        "`getBody(byte[])` copies the whole payload into a byte array",
+        "Read `message.getBody(java.io.InputStream)` and copy or parse it in chunks",
+    ),
+    "full-dom-parse": (
+        "warning",
+        "builds the complete XML tree in memory",
+        "Stream with StAX (`javax.xml.stream.XMLInputFactory`) or SAX from `getBody(java.io.Reader)`",
+    ),
+    "json-parse-text": (
+        "info",
+        "`JsonSlurper.parseText` needs the whole document as a String",
+        "Use `new JsonSlurper().setType(JsonParserType.CHARACTER_SOURCE).parse(reader)` on the body Reader",
+    ),
+    "file-read-all": (
+        "warning",
+        "reads a whole file into memory",
+        "Use `file.withReader { ... }`, `eachLine` or `Files.newBufferedReader` and process line by line",
+    ),
+    "string-concat-in-loop": (
+        "warning",
+        "String concatenation inside a loop copies the String on every iteration",
+        "Append to a `StringBuilder`, or write to a `Writer` that streams to the output",
+    ),
+    "unbounded-attachment": (
+        "warning",
+        "`addAttachmentAsString` stores the full value in the message processing log",
+        "Cap the attachment (e.g. `body.take(100_000)`) and only attach when a log level property asks for it",
+    ),
+    "xml-serialize-string": (
+        "info",
+        "`XmlUtil.serialize` renders the whole document into a String",
+        "Serialize into a Writer (`XmlUtil.serialize(node, writer)`) or use `StreamingMarkupBuilder`",
+    ),
+    "regex-in-loop": (
+        "info",
+        "a regular expression is compiled on every loop iteration",
+        "Compile the pattern once outside the loop and reuse it",
+    ),
+    "split-lines": (
+        "info",
+        "splits the whole text into an array of lines",
+        "Iterate with `reader.eachLine { ... }` instead of holding every line at once",
+    ),
+}
+
+# Methods whose closure argument runs once per element
+_ITERATORS = {
+    "each", "eachWithIndex", "eachLine", "eachRow", "forEach", "collect", "collectEntries",
+    "collectMany", "findAll", "find", "any", "every", "inject", "times", "upto", "downto",
+    "step", "sum", "grep", "breadthFirst", "depthFirst", "eachMatch", "splitEachLine",
+}
+_DOM_PARSERS = {"XmlSlurper", "XmlParser", "DOMBuilder"}
+_FILE_READ_ALL = {"getText", "text", "readLines", "getBytes", "bytes"}
+_FILES_READ_ALL = {"readAllBytes", "readAllLines", "readString"}
+_STRING_TYPES = {"String", "GString"}
+_STRING_ARGS = {"String", "java.lang.String", "String.class", "java.lang.String.class"}
+_BYTES_ARGS = {"byte[]", "byte[].class"}
+_TRUNCATORS = {"take", "substring", "truncate", "left"}
+_LOG_LEVELS = ("DEBUG", "TRACE")
+
+
+@dataclass(frozen=True)
+class LintFinding:
+    rule: str
+    line: int
+    severity: str
+    detail: str = ""
+
+    @property
+    def message(self) -> str:
+        message = RULES[self.rule][1]
+        return f"{self.detail}: {message}" if self.detail else message
+
+    @property
+    def suggestion(self) -> str:
+        return RULES[self.rule][2]
+
+
+def severity_rank(severity: str) -> int:
+    """0 for error, 1 for warning, 2 for info."""
+    if severity not in SEVERITIES:
+        raise ValueError(f"Unknown severity: {severity} (allowed: {', '.join(SEVERITIES)})")
+    return SEVERITIES.index(severity)
+
+
+class _Linter:
+    def __init__(self, tokens: list[Token]):
+        self.tokens = tokens
+        self.matching = match_brackets(tokens)
+        self.loops = self._loop_ranges()
+        self.log_gates = self._log_gate_ranges()
+        self.var_types: dict[str, str] = {}
+        self.body_vars: set[str] = set()
+        self.findings: list[LintFinding] = []
+
+    def _is(self, index: int, kind: str, value: Optional[str] = None) -> bool:
+        if not 0 <= index < len(self.tokens):
+            return False
+        token = self.tokens[index]
+        return token.kind == kind and (value is None or token.value == value)
+
+    def _after_dot(self, index: int) -> bool:
+        return self._is(index - 1, OP, ".") or self._is(index - 1, OP, "?.")
+
+    def _closing_line(self, open_index: int) -> int:
+        close = self.matching.get(open_index)
+        return self.tokens[close].line if close is not None else self.tokens[-1].end_line
+
+    def _loop_ranges(self) -> list[tuple[int, int]]:
+        """Line ranges of loop bodies and per-element closures."""
+        ranges = []
+        tokens = self.tokens
+        for index, token in enumerate(tokens):
+            if token.kind != IDENT:
+                continue
+            body = None
+            if token.value in ("for", "while") and self._is(index + 1, OP, "(") and not self._after_dot(index):
+                close = self.matching.get(index + 1)
+                if close is None:
+                    continue
+                if self._is(close + 1, OP, "{"):
+                    body = close + 1
+                elif close + 1 < len(tokens):
+                    ranges.append((token.line, tokens[close + 1].end_line))
+            elif token.value == "do" and self._is(index + 1, OP, "{"):
+                body = index + 1
+            elif token.value in _ITERATORS and self._after_dot(index):
+                if self._is(index + 1, OP, "{"):
+                    body = index + 1
+                elif self._is(index + 1, OP, "("):
+                    close = self.matching.get(index + 1)
+                    if close is not None and self._is(close + 1, OP, "{"):
+                        body = close + 1
+            if body is not None:
+                ranges.append((tokens[body].line, self._closing_line(body)))
+        return ranges
+
+    def _in_loop(self, line: int) -> bool:
+        return any(start <= line <= end for start, end in self.loops)
+
+    def _log_gate_ranges(self) -> list[tuple[int, int]]:
+        """Line ranges of ``if`` bodies whose condition tests the log level."""
+        ranges = []
+        tokens = self.tokens
+        for index, token in enumerate(tokens):
+            if token.kind != IDENT or token.value != "if" or not self._is(index + 1, OP, "("):
+                continue
+            close = self.matching.get(index + 1)
+            if close is None or close + 1 >= len(tokens):
+                continue
+            condition = tokens[index + 2:close]
+            if not any(
+                (t.kind == IDENT and "loglevel" in t.value.lower()) or
+                (t.kind == STRING and any(level in t.value for level in _LOG_LEVELS))
+                for t in condition
+            ):
+                continue
+            if self._is(close + 1, OP, "{"):
+                ranges.append((tokens[close + 1].line, self._closing_line(close + 1)))
+            else:
+                ranges.append((token.line, tokens[close + 1].end_line))
+        return ranges
+
+    def _log_gated(self, line: int) -> bool:
+        return any(start <= line <= end for start, end in self.log_gates)
+
+    def _args(self, open_index: int) -> list[Token]:
+        close = self.matching.get(open_index)
+        if close is None:
+            return []
+        return self.tokens[open_index + 1:close]
+
+    def _add(self, rule: str, line: int, detail: str = "", severity: Optional[str] = None) -> None:
+        self.findings.append(LintFinding(rule, line, severity or RULES[rule][0], detail))
+
+    def _assigned_var(self, index: int) -> Optional[str]:
+        """Variable assigned by the statement containing tokens[index], if any."""
+        line = self.tokens[index].line
+        probe = index - 1
+        while probe > 0 and self.tokens[probe].line == line and not self._is(probe, OP, "="):
+            probe -= 1
+        if self._is(probe, OP, "=") and self._is(probe - 1, IDENT):
+            return self.tokens[probe - 1].value
+        return None
+
+    def run(self) -> list[LintFinding]:
+        tokens = self.tokens
+        for index, token in enumerate(tokens):
+            if token.kind == OP:
+                self._check_op(index, token)
+            elif token.kind == IDENT:
+                self._track_types(index, token)
+                self._check_ident(index, token)
+        unique = {(f.line, f.rule, f.detail): f for f in self.findings}
+        return [unique[key] for key in sorted(unique)]
+
+    def _track_types(self, index: int, token: Token) -> None:
+        # Typed declaration: "String s", "File f"
+        if token.value[:1].isupper() and self._is(index + 1, IDENT) and not self._after_dot(index):
+            self.var_types[self.tokens[index + 1].value] = token.value
+        # "x = new Foo(...)" and "x = 'literal'"
+        if self._is(index + 1, OP, "=") and not self._after_dot(index):
+            if self._is(index + 2, IDENT, "new") and self._is(index + 3, IDENT):
+                self.var_types.setdefault(token.value, self.tokens[index + 3].value)
+            elif self._is(index + 2, STRING):
+                self.var_types.setdefault(token.value, "String")
+
+    def _check_op(self, index: int, token: Token) -> None:
+        line = token.line
+        if token.value == "+=" and self._in_loop(line) and self._is(index - 1, IDENT):
+            target = self.tokens[index - 1].value
+            if self.var_types.get(target) in _STRING_TYPES or self._is(index + 1, STRING):
+                self._add("string-concat-in-loop", line, f"`{target} +=`")
+        elif token.value == "~" and self._is(index + 1, STRING) and self._in_loop(line):
+            self._add("regex-in-loop", line, "`~pattern`")
+
+    def _check_ident(self, index: int, token: Token) -> None:
+        tokens = self.tokens
+        name = token.value
+        line = token.line
+        call = self._is(index + 1, OP, "(")
+
+        if name == "getBody" and call and self._after_dot(index):
+            arg = "".join(t.value for t in self._args(index + 1))
+            if arg in _STRING_ARGS:
+                self._add("body-to-string", line)
+                var = self._assigned_var(index)
+                if var:
+                    self.body_vars.add(var)
+            elif arg in _BYTES_ARGS:
+                self._add("body-to-bytes", line)
+
+        elif name == "new" and self._is(index + 1, IDENT):
+            cls = tokens[index + 1].value
+            probe = index + 1
+            while self._is(probe + 1, OP, ".") and self._is(probe + 2, IDENT):
+                probe += 2
+                cls = tokens[probe].value
+            if cls in _DOM_PARSERS:
+                self._add("full-dom-parse", line, f"`new {cls}()`")
+            elif cls == "File" and self._is(probe + 1, OP, "("):
+                close = self.matching.get(probe + 1)
+                if close is not None and self._is(close + 1, OP, ".") and self._is(close + 2, IDENT) \
+                        and tokens[close + 2].value in _FILE_READ_ALL:
+                    self._add("file-read-all", line, f"`new File(...).{tokens[close + 2].value}`")
+
+        elif name == "DocumentBuilderFactory" and self._is(index + 1, OP, "."):
+            self._add("full-dom-parse", line, "`DocumentBuilderFactory`")
+
+        elif name in _FILE_READ_ALL and self._after_dot(index) and self._is(index - 2, IDENT):
+            receiver = tokens[index - 2].value
+            if self.var_types.get(receiver) == "File":
+                self._add("file-read-all", line, f"`{receiver}.{name}`")
+            elif name == "readLines" and call:
+                self._add("split-lines", line, f"`{receiver}.readLines()`")
+
+        elif name in _FILES_READ_ALL and call and self._after_dot(index) and self._is(index - 2, IDENT, "Files"):
+            self._add("file-read-all", line, f"`Files.{name}`")
+
+        elif name == "parseText" and call and self._after_dot(index):
+            receiver = self._receiver_type(index - 1)
+            if receiver == "JsonSlurper":
+                self._add("json-parse-text", line)
+
+        elif name == "serialize" and call and self._after_dot(index) and self._is(index - 2, IDENT, "XmlUtil"):
+            if len([t for t in self._args(index + 1) if t.kind == OP and t.value == ","]) == 0:
+                self._add("xml-serialize-string", line)
+
+        elif name == "compile" and call and self._is(index - 2, IDENT, "Pattern") and self._in_loop(line):
+            self._add("regex-in-loop", line, "`Pattern.compile`")
+
+        elif name in ("split", "tokenize") and call and self._after_dot(index):
+            args = self._args(index + 1)
+            if args and args[0].kind == STRING and "\\n" in args[0].value:
+                self._add("split-lines", line, f"`{name}('\\n')`")
+
+        elif name == "addAttachmentAsString" and call:
+            args = self._args(index + 1)
+            if any(t.kind == IDENT and t.value in _TRUNCATORS for t in args):
+                pass
+            elif self._log_gated(line):
+                # Attached only when a DEBUG/TRACE log level asks for it
+                self._add("unbounded-attachment", line, "only at a debug log level", "info")
+            else:
+                payload = [t.value for t in args if t.kind == IDENT and (t.value in self.body_vars or t.value == "getBody")]
+                if payload:
+                    # The whole payload ends up in the log store on every run
+                    self._add("unbounded-attachment", line, f"payload `{payload[0]}`", "error")
+                else:
+                    self._add("unbounded-attachment", line)
+
+    def _receiver_type(self, dot_index: int) -> Optional[str]:
+        """Type of the expression before ``.method``: a variable or ``new Type(...)``."""
+        if self._is(dot_index - 1, IDENT):
+            return self.var_types.get(self.tokens[dot_index - 1].value)
+        if self._is(dot_index - 1, OP, ")"):
+            opener = self.matching.get(dot_index - 1)
+            if opener is not None and self._is(opener - 1, IDENT) and self._is(opener - 2, IDENT, "new"):
+                return self.tokens[opener - 1].value
+        return None
+
+
+def _lint(source: str) -> tuple[LintFinding, ...]:
+    tokens = tokenize(source)
+    if not tokens:
+        return ()
+    return tuple(_Linter(tokens).run())
+
+
+# Findings keyed by content hash, weighed by source size (in bytes)
+LINT_CACHE_BYTES = 16 * 1024 * 1024
+_LINT_CACHE: ContentCache[tuple[LintFinding, ...]] = ContentCache(LINT_CACHE_BYTES)
+
+
+def lint_cache_info() -> dict:
+    """Hit/miss counters and fill level of the lint cache."""
+    return _LINT_CACHE.info()
+
+
+def lint_source(source: str) -> tuple[LintFinding, ...]:
+    """Return the (cached) findings for a script's source, ordered by line. Thread-safe."""
+    return _LINT_CACHE.get_or_compute(content_hash(source), source_bytes(source), lambda: _lint(source))
+
+
+def select_findings(
+    findings: Iterable[LintFinding],
+    min_severity: str = "info",
+    rules: Optional[Iterable[str]] = None,
+) -> list[LintFinding]:
+    """Findings at or above min_severity, optionally limited to some rules."""
+    limit = severity_rank(min_severity)
+    if rules is not None:
+        rules = set(rules)
+        unknown = rules - set(RULES)
+        if unknown:
+            raise ValueError(f"Unknown rules: {', '.join(sorted(unknown))}")
+    return [
+        f for f in findings
+        if severity_rank(f.severity) <= limit and (rules is None or f.rule in rules)
+    ]
+
+
+def lint_example(example, min_severity: str = "info", rules: Optional[Iterable[str]] = None
+                 ) -> list[tuple[str, LintFinding]]:
+    """(script name, finding) pairs for every script of an example."""
+    return [
+        (script_name, finding)
+        for script_name, source in example.scripts.items()
+        for finding in select_findings(lint_source(source), min_severity, rules)
+    ]
+
+
+def method_name(source: str, line: int) -> Optional[str]:
+    """Name of the method containing a line, from the shared summary cache."""
+    method = summarize(source).method_at(line)
+    return method.name if method is not None else None
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command line entry point."""
+    from catalog import ExampleCatalog
+    from mcp_server import BASE_DIR
+
+    parser = argparse.ArgumentParser(description="Lint SAP CPI Groovy examples for performance problems")
+    parser.add_argument("names", nargs="*", help="Examples to lint (default: all)")
+    parser.add_argument("--base-dir", type=Path, default=BASE_DIR, help="Examples directory")
+    parser.add_argument("--min-severity", choices=SEVERITIES, default="info")
+    args = parser.parse_args(argv)
+
+    catalog = ExampleCatalog(args.base_dir)
+    catalog.load()
+    examples = [catalog.get(name) for name in args.names] if args.names else catalog.examples()
+    errors = 0
+    for example in examples:
+        for script_name, finding in lint_example(example, args.min_severity):
+            errors += finding.severity == "error"
+            print(f"{example.name}/{script_name}:{finding.line}: {finding.severity} "
+                  f"[{finding.rule}] {finding.message}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(main())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Inverted full-text index over the example catalog.
+
+Documents are the README and each Groovy script of an example. Text is split
+into Groovy/Java aware tokens (whole identifiers plus their camelCase and
+snake_case parts) and results are ranked with BM25. A trigram index over the
+vocabulary lets partial identifiers such as ``LogFact`` match
+``getMessageLogFactory``.
+"""
+
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+from catalog import Example
+from groovy_parser import split_identifier
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Number of matching lines reported per document
+SNIPPET_LINES = 3
+
+_WORD_RE = re.compile(r"[A-Za-z_$][A-Za-z0-9_$]*|\d+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Return index terms for a piece of text.
+
+    Every identifier yields its lowercased full form followed by its
+    camelCase/snake_case parts when it has more than one.
+    """
+    terms = []
+    for word in _WORD_RE.findall(text):
+        lower = word.lower()
+        terms.append(lower)
+        parts = split_identifier(word)
+        if len(parts) > 1:
+            terms.extend(p for p in parts if p != lower)
+    return terms
+
+
+def trigrams(term: str) -> set[str]:
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+@dataclass
+class SearchHit:
+    """One ranked example with the documents and lines that matched."""
+
+    name: str
+    score: float
+    matches: list[str] = field(default_factory=list)
+    snippets: list[tuple[str, int, str]] = field(default_factory=list)
+
+
+@dataclass
+class _Document:
+    example: str
+    label: str
+    file_name: Optional[str]
+    length: int
+
+
+class SearchIndex:
+    """BM25 inverted index, updated per example."""
+
+    def __init__(self):
+        self._docs: dict[int, _Document] = {}
+        self._by_example: dict[str, list[int]] = {}
+        self._postings: dict[str, dict[int, int]] = {}
+        self._trigrams: dict[str, set[str]] = {}
+        self._texts: dict[int, str] = {}
+        self._next_id = 0
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # -- building ---------------------------------------------------------
+
+    def build(self, examples: Iterable[Example]) -> None:
+        """Index every example from scratch."""
+        self.__init__()
+        for example in examples:
+            self.add(example)
+
+    def _add_document(self, example: str, label: str, file_name: Optional[str], text: str) -> None:
+        doc_id = self._next_id
+        self._next_id += 1
+        terms = tokenize(text)
+        counts: dict[str, int] = {}
+        for term in terms:
+            counts[term] = counts.get(term, 0) + 1
+        for term, tf in counts.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                for gram in trigrams(term):
+                    self._trigrams.setdefault(gram, set()).add(term)
+            posting[doc_id] = tf
+        self._docs[doc_id] = _Document(example, label, file_name, len(terms))
+        self._texts[doc_id] = text
+        self._by_example.setdefault(example, []).append(doc_id)
+        self._total_length += len(terms)
+
+    def add(self, example: Example) -> None:
+        """Index (or re-index) one example."""
+        self.remove(example.name)
+        if example.readme is not None:
+            self._add_document(example.name, "README", None, example.readme)
+        for script_name, content in example.scripts.items():
+            self._add_document(example.name, f"Script: {script_name}", script_name, content)
+
+    def remove(self, name: str) -> None:
+        """Drop every document belonging to an example."""
+        for doc_id in self._by_example.pop(name, []):
+            doc = self._docs.pop(doc_id)
+            text = self._texts.pop(doc_id)
+            self._total_length -= doc.length
+            for term in set(tokenize(text)):
+                posting = self._postings.get(term)
+                if posting is None:
+                    continue
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self._postings[term]
+                    for gram in trigrams(term):
+                        grams = self._trigrams.get(gram)
+                        if grams is not None:
+                            grams.discard(term)
+                            if not grams:
+                                del self._trigrams[gram]
+
+    def update(self, examples: dict[str, Optional[Example]]) -> None:
+        """Apply catalog changes: a None value removes the example."""
+        for name, example in examples.items():
+            if example is None:
+                self.remove(name)
+            else:
+                self.add(example)
+
+    # -- querying ---------------------------------------------------------
+
+    def _expand(self, term: str) -> set[str]:
+        """Vocabulary terms matching a query term exactly or as a substring."""
+        if term in self._postings:
+            return {term}
+        if len(term) < 3:
+            return set()
+        candidates = None
+        for gram in trigrams(term):
+            grams = self._trigrams.get(gram)
+            if not grams:
+                return set()
+            candidates = set(grams) if candidates is None else candidates & grams
+        return {t for t in candidates or () if term in t}
+
+    def _query_groups(self, query: str) -> list[set[str]]:
+        """Each group is a set of alternative terms; every group must match."""
+        groups = []
+        for word in _WORD_RE.findall(query):
+            expanded = self._expand(word.lower())
+            if expanded:
+                groups.append(expanded)
+                continue
+            parts = split_identifier(word)
+            if len(parts) <= 1:
+                groups.append(set())
+                continue
+            for part in parts:
+                groups.append(self._expand(part))
+        return groups
+
+    def _bm25(self, idf: float, doc_id: int, tf: int, avgdl: float) -> float:
+        length = self._docs[doc_id].length
+        return idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avgdl))
+
+    def _snippets(self, doc_id: int, terms: set[str]) -> list[tuple[int, str]]:
+        lines = []
+        for number, line in enumerate(self._texts[doc_id].split("\n"), 1):
+            if terms.intersection(tokenize(line)):
+                lines.append((number, line.strip()))
+                if len(lines) >= SNIPPET_LINES:
+                    break
+        return lines
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> tuple[int, list[SearchHit]]:
+        """Return the total number of matching examples and one page of hits."""
+        groups = self._query_groups(query)
+        if not groups or not all(groups):
+            return 0, []
+
+        n_docs = len(self._docs)
+        avgdl = self._total_length / n_docs if n_docs else 1.0
+
+        # Per example: which groups matched and accumulated score per document
+        example_groups: dict[str, set[int]] = {}
+        doc_scores: dict[int, float] = {}
+        for index, group in enumerate(groups):
+            for term in group:
+                posting = self._postings[term]
+                df = len(posting)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for doc_id, tf in posting.items():
+                    example = self._docs[doc_id].example
+                    example_groups.setdefault(example, set()).add(index)
+                    doc_scores[doc_id] = doc_scores.get(doc_id, 0.0) + self._bm25(idf, doc_id, tf, avgdl)
+
+        required = len(groups)
+        scores: dict[str, float] = {}
+        for doc_id, score in doc_scores.items():
+            example = self._docs[doc_id].example
+            if len(example_groups[example]) == required:
+                scores[example] = scores.get(example, 0.0) + score
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        all_terms = set().union(*groups)
+        hits = []
+        for name, score in ranked[offset:offset + limit]:
+            hit = SearchHit(name=name, score=score)
+            for doc_id in self._by_example[name]:
+                if doc_id not in doc_scores:
+                    continue
+                doc = self._docs[doc_id]
+                hit.matches.append(doc.label)
+                for number, line in self._snippets(doc_id, all_terms):
+                    hit.snippets.append((doc.file_name or "README.md", number, line))
+            hits.append(hit)
+        return len(ranked), hits
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Nearest-neighbour lookup of examples by script content.
+
+Each example is represented by a sparse TF-IDF vector over code features:
+identifier words (camelCase parts), whole identifiers, imports, SAP API calls
+and instantiated classes, all taken from the cached Groovy parse so comments
+and strings do not count. Cosine similarity is computed through an inverted
+index, so a query only touches examples that share at least one feature.
+
+Catalog changes are queued and applied by the next query, which runs on a
+worker thread: only the changed examples are parsed and re-weighed, and all
+vectors are recomputed once enough examples changed for the IDF weights of
+the others to drift (``REWEIGH_FRACTION``).
+"""
+
+import math
+import threading
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from catalog import Example
+from groovy_parser import ScriptSummary, split_identifier, summarize
+
+# Relative weight of each feature kind (applied to raw counts)
+FEATURE_WEIGHTS = {
+    "word": 1.0,
+    "id": 1.0,
+    "import": 2.0,
+    "api": 3.0,
+    "new": 2.0,
+}
+
+# Share of the corpus that may be re-weighed one by one, against the current
+# IDF, before every vector is recomputed
+REWEIGH_FRACTION = 0.1
+
+
+def script_features(summary: ScriptSummary) -> dict[str, float]:
+    """Weighted feature counts of one parsed script."""
+    features: dict[str, float] = {}
+
+    def add(kind: str, value: str, count: float = 1.0) -> None:
+        key = f"{kind}:{value}"
+        features[key] = features.get(key, 0.0) + count * FEATURE_WEIGHTS[kind]
+
+    for identifier, count in summary.identifier_counts.items():
+        add("id", identifier, count)
+        for part in split_identifier(identifier):
+            if len(part) > 1:
+                add("word", part, count)
+    for imp in summary.imports:
+        add("import", imp.name)
+    for call in summary.sap_calls:
+        add("api", call.method)
+    for class_name, _ in summary.instantiations:
+        add("new", class_name.rsplit(".", 1)[-1])
+    return features
+
+
+def example_features(example: Example) -> dict[str, float]:
+    """Features of all scripts of an example."""
+    features: dict[str, float] = {}
+    for content in example.scripts.values():
+        for key, value in script_features(summarize(content)).items():
+            features[key] = features.get(key, 0.0) + value
+    return features
+
+
+@dataclass
+class SimilarExample:
+    name: str
+    score: float
+    shared: list[str]
+
+
+class SimilarityIndex:
+    """TF-IDF vectors of every example with an inverted index for cosine lookups.
+
+    Thread-safe: ``update`` only queues changes, so it never waits for a
+    query, and queries apply the queued changes under a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue_lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._counts: dict[str, dict[str, float]] = {}
+        self._df: dict[str, int] = {}
+        self._vectors: dict[str, dict[str, float]] = {}
+        self._postings: dict[str, dict[str, float]] = {}
+        # Examples changed since their vectors were weighed, and the number
+        # re-weighed one by one since the last full recompute
+        self._pending: set[str] = set()
+        self._reweighed = 0
+        self._queued: dict[str, Optional[Example]] = {}
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def build(self, examples: Iterable[Example]) -> None:
+        counts = {example.name: example_features(example) for example in examples}
+        with self._lock, self._queue_lock:
+            self._reset()
+            for name, features in counts.items():
+                self._add(name, features)
+
+    def _add(self, name: str, features: dict[str, float]) -> None:
+        self._remove(name)
+        self._counts[name] = features
+        for key in features:
+            self._df[key] = self._df.get(key, 0) + 1
+        self._pending.add(name)
+
+    def _remove(self, name: str) -> None:
+        features = self._counts.pop(name, None)
+        if features is None:
+            return
+        for key in features:
+            self._df[key] -= 1
+            if not self._df[key]:
+                del self._df[key]
+        self._pending.add(name)
+
+    def update(self, examples: dict[str, Optional[Example]]) -> None:
+        """Queue catalog changes (a None value removes the example) for the next query."""
+        with self._queue_lock:
+            self._queued.update(examples)
+
+    def _apply_queued(self) -> None:
+        with self._queue_lock:
+            queued, self._queued = self._queued, {}
+        for name, example in queued.items():
+            if example is None:
+                self._remove(name)
+            else:
+                self._add(name, example_features(example))
+
+    def _idf(self, key: str) -> float:
+        return math.log((1 + len(self._counts)) / (1 + self._df.get(key, 0))) + 1.0
+
+    def _weigh(self, features: dict[str, float]) -> dict[str, float]:
+        """Unit-length TF-IDF vector (sublinear term frequency)."""
+        vector = {key: (1.0 + math.log(count)) * self._idf(key) for key, count in features.items() if count > 0}
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        if not norm:
+            return {}
+        return {key: w / norm for key, w in vector.items()}
+
+    def _ensure_vectors(self) -> None:
+        self._apply_queued()
+        if not self._pending:
+            return
+        if not self._vectors or self._reweighed + len(self._pending) > len(self._counts) * REWEIGH_FRACTION:
+            # IDF depends on the whole corpus: recompute every weight
+            self._vectors = {name: self._weigh(features) for name, features in self._counts.items()}
+            postings: dict[str, dict[str, float]] = {}
+            for name, vector in self._vectors.items():
+                for key, weight in vector.items():
+                    postings.setdefault(key, {})[name] = weight
+            self._postings = postings
+            self._reweighed = 0
+        else:
+            for name in self._pending:
+                for key in self._vectors.pop(name, {}):
+                    posting = self._postings[key]
+                    del posting[name]
+                    if not posting:
+                        del self._postings[key]
+                if name in self._counts:
+                    vector = self._vectors[name] = self._weigh(self._counts[name])
+                    for key, weight in vector.items():
+                        self._postings.setdefault(key, {})[name] = weight
+            self._reweighed += len(self._pending)
+        self._pending.clear()
+
+    def _nearest(self, vector: dict[str, float], k: int, exclude: Optional[str] = None) -> list[SimilarExample]:
+        scores: dict[str, float] = {}
+        for key, weight in vector.items():
+            for name, doc_weight in self._postings.get(key, {}).items():
+                scores[name] = scores.get(name, 0.0) + weight * doc_weight
+        scores.pop(exclude, None)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:k]
+        results = []
+        for name, score in ranked:
+            doc = self._vectors[name]
+            shared = sorted(
+                (key for key in vector if key in doc and not key.startswith("word:")),
+                key=lambda key: -vector[key] * doc[key],
+            )
+            results.append(SimilarExample(name, score, shared[:5]))
+        return results
+
+    def similar_to_example(self, name: str, k: int = 5) -> list[SimilarExample]:
+        """Examples closest to an indexed example (excluding itself)."""
+        with self._lock:
+            self._ensure_vectors()
+            if name not in self._vectors:
+                raise ValueError(f"Example not found: {name}")
+            return self._nearest(self._vectors[name], k, exclude=name)
+
+    def similar_to_source(self, source: str, k: int = 5) -> list[SimilarExample]:
+        """Examples closest to a Groovy snippet."""
+        features = script_features(summarize(source))
+        with self._lock:
+            self._ensure_vectors()
+            return self._nearest(self._weigh(features), k)
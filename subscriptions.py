@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Resource subscriptions and change notifications.
+
+Clients subscribe to resource URIs (``resources/subscribe``) and are sent
+``notifications/resources/updated`` when the content behind one of them
+changes; clients that listed resources are sent
+``notifications/resources/list_changed`` when examples or their files are
+added or removed. Changes come from the catalog's file watcher and are
+coalesced for a short debounce window, so an editor saving several files or
+a ``git pull`` touching many examples produces one notification per URI.
+"""
+
+import asyncio
+import logging
+import os
+import weakref
+from typing import Iterable, Optional
+
+from pydantic import AnyUrl
+
+from catalog import Example
+
+logger = logging.getLogger("sap-groovy-mcp")
+
+# Seconds change events are collected before notifications are sent
+NOTIFY_DEBOUNCE = float(os.environ.get("SAP_GROOVY_MCP_NOTIFY_DEBOUNCE", "0.5"))
+
+RESOURCE_PREFIX = "groovy://examples/"
+
+
+def resource_versions(example: Example) -> dict[str, object]:
+    """Resource URIs of an example, each mapped to a token that changes with its content."""
+    base = f"{RESOURCE_PREFIX}{example.name}/"
+    versions: dict[str, object] = {base + "script": (example.script_name, example.hashes.get(example.script_name))}
+    if example.readme is not None:
+        versions[base + "readme"] = example.hashes.get("README.md")
+    if example.meta_text is not None:
+        versions[base + "meta"] = example.hashes.get("meta.yaml")
+    # Fixtures are not read into memory; their modification time and size stand in
+    stamps = {entry[0]: entry[1:] for entry in example.signature}
+    for file_name in example.fixtures:
+        versions[f"{base}fixtures/{file_name}"] = stamps.get(file_name)
+    return versions
+
+
+def resource_changes(previous: Optional[Example], current: Optional[Example]) -> tuple[set[str], bool]:
+    """URIs whose content changed between two records of an example, and
+    whether the set of resource URIs changed."""
+    before = resource_versions(previous) if previous is not None else {}
+    after = resource_versions(current) if current is not None else {}
+    updated = {uri for uri in before.keys() | after.keys() if before.get(uri) != after.get(uri)}
+    return updated, before.keys() != after.keys()
+
+
+class ResourceSubscriptions:
+    """Subscribed sessions per URI and the debounced notifications sent to them.
+
+    Sessions are held weakly, so a closed session drops its subscriptions
+    without an explicit unsubscribe.
+    """
+
+    def __init__(self, debounce: float = NOTIFY_DEBOUNCE):
+        self.debounce = debounce
+        self._subscribers: dict[str, weakref.WeakSet] = {}
+        self._list_watchers: weakref.WeakSet = weakref.WeakSet()
+        self._pending: set[str] = set()
+        self._list_changed = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flush: Optional[asyncio.Task] = None
+        self.sent = 0
+
+    def subscribe(self, session, uri: str) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._subscribers.setdefault(uri, weakref.WeakSet()).add(session)
+
+    def unsubscribe(self, session, uri: str) -> None:
+        sessions = self._subscribers.get(uri)
+        if sessions is not None:
+            sessions.discard(session)
+            if not sessions:
+                del self._subscribers[uri]
+
+    def watch_list(self, session) -> None:
+        """Send list_changed notifications to a session (one that listed resources)."""
+        self._loop = asyncio.get_running_loop()
+        self._list_watchers.add(session)
+
+    def subscriber_count(self) -> int:
+        return sum(len(sessions) for sessions in self._subscribers.values())
+
+    def publish(self, uris: Iterable[str], list_changed: bool = False) -> None:
+        """Queue notifications for changed URIs; callable from any thread."""
+        uris = {uri for uri in uris if self._subscribers.get(uri)}
+        list_changed = list_changed and bool(self._list_watchers)
+        if (not uris and not list_changed) or self._loop is None or self._loop.is_closed():
+            return
+        self._loop.call_soon_threadsafe(self._queue, uris, list_changed)
+
+    def _queue(self, uris: set[str], list_changed: bool) -> None:
+        self._pending |= uris
+        self._list_changed = self._list_changed or list_changed
+        if self._flush is None:
+            self._flush = asyncio.ensure_future(self._send_later())
+
+    async def _send_later(self) -> None:
+        await asyncio.sleep(self.debounce)
+        uris, self._pending = self._pending, set()
+        list_changed, self._list_changed = self._list_changed, False
+        self._flush = None
+        for uri in sorted(uris):
+            for session in list(self._subscribers.get(uri, ())):
+                await self._send(session, session.send_resource_updated, AnyUrl(uri))
+        if list_changed:
+            for session in list(self._list_watchers):
+                await self._send(session, session.send_resource_list_changed)
+
+    async def _send(self, session, send, *args) -> None:
+        try:
+            await send(*args)
+            self.sent += 1
+        except Exception as e:
+            # The client went away; forget the session
+            logger.debug(f"Dropping resource subscriptions of a closed session: {e!r}")
+            for sessions in self._subscribers.values():
+                sessions.discard(session)
+            self._list_watchers.discard(session)
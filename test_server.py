@@ -4,13 +4,48 @@ Quick test script for SAP Groovy MCP Server
 """
 
 import asyncio
+import base64
+import dataclasses
+import json
+import logging
+import os
+import shutil
+import subprocess
 import sys
+import tempfile
+import xml.etree.ElementTree as ET
 from pathlib import Path
 
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from async_io import AsyncFileAccess
+from benchmark import generate_corpus
+from catalog import ExampleCatalog
+from content_cache import ContentCache
+from facet_index import FacetIndex
+from federation import load_roots
+from fixture_reader import read_lines, tail, xml_select
+from groovy_parser import summarize, summary_cache_info
+from groovy_runner import RunResult, bodies_match, check_result, load_fixtures, parse_properties
+from index_cache import CatalogCache
+from metadata import Metadata, parse_metadata
+from paging import encode_cursor
+from payload_generator import (
+    fixture_template, infer_template, measure_payload, parse_size, payload_slice, prune_payloads, save_payload,
+    stream_payload,
+)
+from profiler import PROFILE_HEAP_MB, TIME_FLOOR_MS, classify, fit_exponent, profile_example, profiling_pool, scale_body
+from script_diff import diff_scripts
+from script_lint import lint_source
+from xref_index import script_references
 from mcp_server import SAPGroovyMCPServer
+from mcp import ClientSession, types
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.memory import create_connected_server_and_client_session
+from mcp.types import CallToolRequest
+from pydantic import AnyUrl
+from http_transport import RequestLimiter, create_app, create_uvicorn_server
 
 async def test_server():
     """Test the MCP server functionality."""
@@ -48,6 +83,535 @@ async def test_server():
     result = await server.compare_examples("basic", "mpl-payload-log")
     print(result[0].text[:500] + "...\n")
     
+    # Test catalog refresh
+    print("7. Testing catalog refresh...")
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copytree(Path(__file__).parent / "basic", Path(tmp) / "basic")
+        catalog = ExampleCatalog(Path(tmp))
+        catalog.load()
+        assert catalog.refresh() == set()
+        os.utime(Path(tmp) / "basic" / "README.md", ns=(0, 0))
+        assert catalog.refresh() == set()
+        (Path(tmp) / "basic" / "script.groovy").write_text("// changed\n", encoding="utf-8")
+        assert catalog.refresh() == {"basic"}
+        assert catalog.get("basic").script == "// changed\n"
+        shutil.rmtree(Path(tmp) / "basic")
+        assert catalog.refresh() == {"basic"} and len(catalog) == 0
+    print("Catalog refresh OK\n")
+    
+    # Test ranked search with partial identifiers and paging
+    print("8. Testing search_examples('LogFact', limit=2)...")
+    result = await server.search_examples("LogFact", limit=2)
+    print(result[0].text[:500] + "...\n")
+    total, hits = server.search_index.search("LogFact", limit=2)
+    assert total > 2 and len(hits) == 2
+    assert "mpl-payload-log" in [hit.name for hit in server.search_index.search("LogFact")[1]]
+    
+    # Test the on-disk index cache
+    print("9. Testing index cache round trip...")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = CatalogCache(Path(tmp) / "catalog.sqlite")
+        cache.save(server.catalog.examples(), replace=True)
+        cached = ExampleCatalog(server.catalog.base_dir, cache)
+        cached.load()
+        assert cached.names() == server.catalog.names()
+        assert cached.get("basic").script == server.catalog.get("basic").script
+        # A cache built at another path is reused once the examples move (mtimes kept)
+        built = Path(tmp) / "ci" / "basic"
+        shutil.copytree(Path(__file__).parent / "basic", built)
+        moved = CatalogCache(Path(tmp) / "moved.sqlite")
+        ExampleCatalog(built.parent, moved).load()
+        (Path(tmp) / "ci").rename(Path(tmp) / "deployed")
+        assert moved.load(Path(tmp) / "deployed")["basic"].path == Path(tmp) / "deployed" / "basic"
+    print("Index cache OK\n")
+    
+    # Test the Groovy parser on code hidden in comments and strings
+    print("10. Testing Groovy parser...")
+    summary = summarize(
+        "import com.sap.gateway.ip.core.customdev.util.Message\n"
+        "// def notAMethod(x) { xml }\n"
+        "Message processData(Message message) {\n"
+        "    def text = \"def alsoNot(y) { }\"\n"
+        "    def log = messageLogFactory.getMessageLog(message)\n"
+        "    log?.addAttachmentAsString('a', text, 'text/plain')\n"
+        "    [1, 2].each { n -> println n }\n"
+        "    return message\n"
+        "}\n"
+    )
+    assert [m.name for m in summary.methods] == ["processData"]
+    assert (summary.methods[0].start, summary.methods[0].end) == (3, 9)
+    assert [c.params for c in summary.closures] == [["n"]]
+    assert [c.text for c in summary.sap_calls] == [
+        "messageLogFactory.getMessageLog", "log.addAttachmentAsString"
+    ]
+    assert "XML processing" not in summary.concepts()
+    # Non-ASCII identifiers and digits do not break tokenizing
+    unicode = summarize("def größe = 2\ndef fläche(int seite²) { größe * seite² }\n")
+    assert [(m.name, m.params) for m in unicode.methods] == [("fläche", ["int seite²"])]
+    print("Groovy parser OK\n")
+    
+    # Test batch tools
+    print("11. Testing analyze_scripts_batch(tag='beginner') and get_examples_batch(max_chars)...")
+    result = await server.run_batch(server._render_analysis, tag="beginner")
+    print(result[0].text[:300] + "...\n")
+    result = await server.run_batch(server._render_example, names=["basic", "mpl-payload-log"], max_chars=100)
+    assert len(result) == 2 and "mpl-payload-log" in result[1].text
+    
+    # Test the watcher scanning off the event loop
+    print("12. Testing catalog watch on the I/O thread pool...")
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copytree(Path(__file__).parent / "basic", Path(tmp) / "basic")
+        catalog = ExampleCatalog(Path(tmp))
+        catalog.load()
+        changes = []
+        catalog.add_listener(changes.append)
+        io = AsyncFileAccess(max_workers=2, timeout=5)
+        watcher = asyncio.create_task(catalog.watch(0.01, io.run))
+        (Path(tmp) / "basic" / "README.md").write_text("# Changed\n", encoding="utf-8")
+        for _ in range(200):
+            if changes:
+                break
+            await asyncio.sleep(0.01)
+        watcher.cancel()
+        io.close()
+        assert changes == [{"basic"}] and catalog.get("basic").description == "Changed"
+    print("Catalog watch OK\n")
+    
+    # Test structural diff between differently named scripts
+    print("13. Testing compare_examples('merge-two-xml', 'merge-two-xml-v2')...")
+    result = await server.compare_examples("merge-two-xml", "merge-two-xml-v2")
+    assert "## Script Diff" in result[0].text and "**changed** `def Message processData" in result[0].text
+    script = server.catalog.get("basic").script
+    assert diff_scripts(script, script).similarity == 1.0
+    edited = diff_scripts(script, script.replace("newHeader value", "other value"))
+    assert (edited.added_lines, edited.removed_lines) == (1, 1)
+    print("Structural diff OK\n")
+    
+    # Test nearest-neighbour lookup
+    print("14. Testing find_similar('mpl-payload-log')...")
+    result = await server.find_similar("mpl-payload-log", top_k=3)
+    print(result[0].text[:400] + "...\n")
+    matches = server.similarity.similar_to_example("mpl-payload-log", 3)
+    assert matches[0].name == "mpl-payload-log-with-loglevel"
+    assert "mpl-payload-log" not in [m.name for m in matches]
+    # Concurrent first calls share one build, run off the event loop
+    fresh = SAPGroovyMCPServer()
+    first, second = await asyncio.gather(fresh._similarity_index(), fresh._similarity_index())
+    assert first is second is fresh.similarity and not fresh._index_builds
+    # A change re-weighs only the changed example, on the next query
+    original = server.catalog.get("mpl-payload-log")
+    server.similarity.update({"mpl-payload-log-copy": dataclasses.replace(original, name="mpl-payload-log-copy")})
+    assert server.similarity.similar_to_example("mpl-payload-log", 1)[0].name == "mpl-payload-log-copy"
+    assert server.similarity._reweighed == 1
+    server.similarity.update({"mpl-payload-log-copy": None})
+    assert "mpl-payload-log-copy" not in [m.name for m in server.similarity.similar_to_example("mpl-payload-log", 3)]
+    
+    # Test fixture handling of the local runner (the JVM part needs Groovy installed)
+    print("15. Testing run_example fixtures and result checking...")
+    assert parse_properties("a = b \\\n   c\n#x=y\nk\\ e:\\u0041 ") == {"a": "b c", "k e": "A "}
+    fixtures = load_fixtures(server.catalog.get("basic").path)
+    assert fixtures.properties == {"oldProperty": "This property is "}
+    assert fixtures.expected_headers["oldHeader"] == "Hello! World!"
+    assert load_fixtures(server.catalog.get("excel-xls-to-xml").path).body_encoding == "base64"
+    assert bodies_match("<a>\n  <b>1</b>\n</a>\n", "<a><b>1</b></a>")
+    response = {
+        "ok": True,
+        "body": fixtures.expected_body,
+        "headers": {"oldHeader": "Hello! World!", "newHeader": "newHeader value"},
+        "properties": {"oldProperty": "This property is modified", "newProperty": "other"},
+    }
+    outcome = check_result("basic", fixtures, response)
+    assert outcome.status == "failed" and outcome.failures == [
+        "property 'newProperty' is 'other', expected 'newProperty value'"
+    ]
+    credentials = load_fixtures(server.catalog.get("reading-credentials").path).credentials
+    assert credentials == {"Partner1_SFTP": {"username": "My Username", "password": "My Password "}}
+    missing = check_result("excel-xls-to-xml", fixtures, {"ok": False, "missing": ["org.apache.poi.ss.usermodel.Cell"]})
+    assert missing.status == "skipped" and "org.apache.poi" in missing.error and not missing.ok
+    print("Runner fixtures OK\n")
+    
+    # Test paged fixture reads
+    print("16. Testing read_fixture('merge-two-xml', 'input.body.xml')...")
+    result = await server.read_fixture("merge-two-xml", "input.body.xml", mode="xpath", xpath="/Root/AnotherField")
+    assert "<AnotherField>123</AnotherField>" in result[0].text
+    with tempfile.TemporaryDirectory() as tmp:
+        big = Path(tmp) / "input.body.xml"
+        big.write_text("<Items>\n" + "".join(f'<Item id="{i}"/>\n' for i in range(5000)) + "</Items>\n")
+        assert read_lines(big, 3000, 2).text == '<Item id="2998"/>\n<Item id="2999"/>\n'
+        assert read_lines(big, 2000, 1).text == '<Item id="1998"/>\n'
+        assert tail(big, 2).text == '<Item id="4999"/>\n</Items>\n'
+        assert xml_select(big, "//Item[@id='4321']") == (['<Item id="4321" />'], False)
+        assert xml_select(big, "Item", offset=10, limit=2) == (['<Item id="10" />', '<Item id="11" />'], True)
+    print("Fixture paging OK\n")
+    
+    # Test cursor pagination of list_examples and resources
+    print("17. Testing list_examples(limit=5, format='json') paging...")
+    names, cursor = [], None
+    while True:
+        result = await server.list_examples(limit=5, cursor=cursor, fields=["tags"], format="json")
+        page = json.loads(result[0].text)
+        assert all(set(item) <= {"name", "tags"} for item in page["examples"])
+        names += [item["name"] for item in page["examples"]]
+        cursor = page["nextCursor"]
+        if cursor is None:
+            break
+    assert names == server.catalog.names()
+    assert server.list_resources_page().nextCursor is None
+    last_page = server.list_resources_page(encode_cursor(server.catalog.names()[-2]))
+    assert {str(r.uri).split("/")[3] for r in last_page.resources} == {server.catalog.names()[-1]}
+    print("Pagination OK\n")
+    
+    # Test the synthetic benchmark corpus
+    print("18. Testing benchmark corpus generation...")
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = generate_corpus(Path(tmp), 30)
+        bench = SAPGroovyMCPServer(corpus, None)
+        assert len(bench.catalog.names()) == 30
+        assert all(ex.tags and "input.body.xml" in ex.fixtures for ex in bench.catalog.examples())
+        total, _ = bench.search_index.search("processData")
+        assert total == 30
+        bench.io.close()
+    print("Benchmark corpus OK\n")
+    
+    # Test tool metrics collected around dispatch
+    print("19. Testing server_stats()...")
+    call = server.server.request_handlers[CallToolRequest]
+    for arguments in ({"example_name": "basic", "file": "input.body.xml"}, {"example_name": "basic", "file": "nope"}):
+        await call(CallToolRequest(method="tools/call", params={"name": "read_fixture", "arguments": arguments}))
+    stats = server.metrics.snapshot()["tools"]["read_fixture"]
+    assert stats["outcomes"] == {"ok": 1, "error": 1} and stats["files_read"] == 1 and stats["bytes_returned"] > 0
+    result = await server.server_stats()
+    print(result[0].text[:400] + "...\n")
+    assert "| read_fixture | 2 | 1 |" in result[0].text
+    prometheus = (await server.server_stats("prometheus"))[0].text
+    assert 'sap_groovy_tool_calls_total{tool="read_fixture",status="error"} 1' in prometheus
+    print("Metrics OK\n")
+    
+    # Test the streamable HTTP transport and its request limiter
+    print("20. Testing streamable HTTP transport...")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    http = create_uvicorn_server(create_app(server), "127.0.0.1", 18765, 5)
+    serving = asyncio.create_task(http.serve())
+    while not http.started:
+        await asyncio.sleep(0.05)
+    async with streamablehttp_client("http://127.0.0.1:18765/mcp") as (read, write, _):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            result = await session.call_tool("search_examples", {"query": "LogFact"})
+            assert "mpl-payload-log" in result.content[0].text
+    http.should_exit = True
+    await serving
+    
+    release = asyncio.Event()
+    
+    async def slow_app(scope, receive, send):
+        await release.wait()
+    
+    limiter = RequestLimiter(slow_app, max_active=1, max_queued=0)
+    sent = []
+    
+    async def record(message):
+        sent.append(message)
+    
+    first = asyncio.create_task(limiter({"type": "http", "method": "POST"}, None, record))
+    await asyncio.sleep(0)
+    await limiter({"type": "http", "method": "POST"}, None, record)
+    assert sent[0]["status"] == 503 and limiter.rejected == 1
+    release.set()
+    await first
+    print("HTTP transport OK\n")
+    
+    # Test federation of directory, archive and git roots
+    print("21. Testing multi-root federation...")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        shutil.copytree(server.catalog.base_dir / "basic", tmp / "team" / "basic-copy")
+        shutil.make_archive(str(tmp / "vendor"), "zip", server.catalog.base_dir, "merge-two-xml")
+        config = "roots:\n  - name: team\n    path: team\n  - name: vendor\n    path: vendor.zip\n    lazy: true\n"
+        git = shutil.which("git")
+        if git:
+            repo = tmp / "upstream-src"
+            shutil.copytree(server.catalog.base_dir / "mpl-payload-log", repo / "mpl-payload-log")
+            commit = [git, "-C", str(repo), "-c", "user.name=t", "-c", "user.email=t@example.com", "commit", "-qm"]
+            subprocess.run([git, "init", "-q", str(repo)], check=True)
+            subprocess.run([git, "-C", str(repo), "add", "."], check=True)
+            subprocess.run([*commit, "initial"], check=True)
+            subprocess.run([git, "clone", "-q", "--bare", str(repo), str(tmp / "upstream.git")], check=True)
+            subprocess.run([git, "-C", str(tmp / "upstream.git"), "gc", "-q"], check=True)
+            config += "  - name: upstream\n    git: upstream.git\n    lazy: true\n"
+        (tmp / "roots.yaml").write_text(config)
+        fed = SAPGroovyMCPServer(cache_path=None, roots=load_roots(tmp / "roots.yaml"), roots_dir=tmp / "work")
+        names = fed.catalog.names()
+        assert "team:basic-copy" in names and "basic" in names
+        assert not any(n.startswith(("vendor:", "upstream:")) for n in names)
+        result = await fed.call_tool("read_fixture", {"example_name": "vendor:merge-two-xml", "file": "input.body.xml"})
+        assert "<" in result[0].text and "vendor" not in fed.catalog.lazy
+        assert "vendor:merge-two-xml" in (await fed.call_tool("list_examples", {"root": "vendor"}))[0].text
+        result = await fed.call_tool("search_examples", {"query": "processData"})
+        assert "team:basic-copy" in result[0].text
+        if git:
+            result = await fed.call_tool("search_examples", {"query": "LogFact", "root": "upstream"})
+            assert "upstream:mpl-payload-log" in result[0].text
+            with open(repo / "mpl-payload-log" / "README.md", "a") as f:
+                f.write("\nUpdated upstream.\n")
+            subprocess.run([git, "-C", str(repo), "add", "."], check=True)
+            subprocess.run([*commit, "update"], check=True)
+            subprocess.run([git, "-C", str(repo), "push", "-q", str(tmp / "upstream.git"), "HEAD"], check=True)
+            assert fed.catalog.refresh() == {"upstream:mpl-payload-log"}
+            assert "Updated upstream" in fed.catalog.get("upstream:mpl-payload-log").readme
+        fed.io.close()
+    print("Federation OK\n")
+    
+    # Test the performance linter
+    print("22. Testing lint_script()...")
+    result = await server.lint_script("mpl-payload-log")
+    assert "**error** `unbounded-attachment`" in result[0].text and "in `processData`" in result[0].text
+    gated = json.loads((await server.lint_script("mpl-payload-log-with-loglevel", format="json"))[0].text)
+    attachments = [f for f in gated["examples"]["mpl-payload-log-with-loglevel"] if f["rule"] == "unbounded-attachment"]
+    assert len(attachments) == 2 and all(f["severity"] == "info" for f in attachments), attachments
+    source = (
+        "def out = ''\n"
+        "// message.getBody(String)\n"
+        "reader.eachLine { line ->\n"
+        "    out += line\n"
+        "}\n"
+        "def xml = new XmlSlurper().parse(reader)\n"
+    )
+    assert [(f.rule, f.line) for f in lint_source(source)] == [("string-concat-in-loop", 4), ("full-dom-parse", 6)]
+    report = json.loads((await server.lint_script(min_severity="warning", format="json"))[0].text)
+    assert report["counts"]["error"] >= 1 and report["counts"]["info"] == 0
+    assert "handle-large-input-output-data" in report["examples"]
+    print("Lint OK\n")
+    
+    print("23. Testing pasted scripts and the content cache...")
+    pasted = server.catalog.get("basic").script
+    hits = summary_cache_info()["hits"]
+    result = await server.analyze_script(script=pasted)
+    assert result[0].text.startswith("# Script Analysis: pasted script") and "processData" in result[0].text
+    assert summary_cache_info()["hits"] > hits, "same text as basic should reuse its cached parse"
+    result = await server.lint_script(script="def xml = new XmlSlurper().parse(reader)\n")
+    assert result[0].text.startswith("# Lint: pasted script") and "`full-dom-parse`" in result[0].text
+    result = await server.compare_examples("basic", script2=pasted + "\n// edited\n")
+    assert "vs script2" in result[0].text and "+// edited" in result[0].text
+    fixtures = server._inline_fixtures([
+        {"name": "input.body.xml", "content": "<a/>"},
+        {"name": "expected.headers", "content": "x=1"},
+    ])
+    assert fixtures.body == "<a/>" and fixtures.expected_headers == {"x": "1"}
+    try:
+        await server.run_example(script=pasted, example_name="basic")
+        assert False, "pasted scripts run only when enabled"
+    except ValueError as e:
+        assert "SAP_GROOVY_MCP_ALLOW_PASTED_SCRIPTS" in str(e)
+    for call in (server.analyze_script(), server.run_example(script=pasted)):
+        try:
+            await call
+            assert False, "expected a ValueError"
+        except ValueError:
+            pass
+    cache = ContentCache(100)
+    for key in "abc":
+        cache.get_or_compute(key, 40, lambda: key)
+    assert len(cache) == 2 and cache.info()["bytes"] == 80
+    assert cache.get_or_compute("big", 500, lambda: "big") == "big" and len(cache) == 2
+    print("Pasted scripts OK\n")
+    
+    print("24. Testing memoized tool responses...")
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copytree(Path(__file__).parent / "basic", Path(tmp) / "basic")
+        local = SAPGroovyMCPServer(Path(tmp), None)
+        first = (await local.get_example("basic"))[0].text
+        assert (await local.get_example("basic"))[0].text == first
+        assert local.responses.info()["hits"] == 1 and local.responses.info()["bytes"] == len(first)
+        (Path(tmp) / "basic" / "script.groovy").write_text("// changed\n", encoding="utf-8")
+        local.catalog.refresh()
+        assert "// changed" in (await local.get_example("basic"))[0].text
+        assert local.responses.info()["misses"] == 2
+    print("Response cache OK\n")
+    
+    print("25. Testing metadata schema and tag index...")
+    meta = parse_metadata("author: A\ntags: [xml, xml, csv]\ncpi_version: 6.1\ncomplexity: Advanced\nowner: x\n")
+    assert meta.tags == ("xml", "csv") and meta.cpi_version == "6.1" and meta.complexity == "advanced"
+    assert meta.to_dict()["owner"] == "x" and Metadata.from_dict(meta.to_dict()) == meta
+    try:
+        parse_metadata("- a\n")
+        assert False, "expected a ValueError for a list"
+    except ValueError:
+        pass
+    # An invalid field is dropped with a warning; the rest of the record is kept
+    meta = parse_metadata("author: A\ncomplexity: hard\ntags: {a: 1}\nadapters: [SFTP]\n", "team:example")
+    assert (meta.author, meta.complexity, meta.tags, meta.adapters) == ("A", None, (), ("SFTP",))
+    assert [ex.name for ex in server.catalog.tagged("beginner")] == \
+        [ex.name for ex in server.catalog.examples() if "beginner" in ex.tags]
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copytree(Path(__file__).parent / "basic", Path(tmp) / "basic")
+        catalog = ExampleCatalog(Path(tmp))
+        catalog.load()
+        assert [ex.name for ex in catalog.tagged("beginner")] == ["basic"]
+        (Path(tmp) / "basic" / "meta.yaml").write_text("tags: [advanced-xml]\n", encoding="utf-8")
+        catalog.refresh()
+        assert catalog.tagged("beginner") == [] and catalog.tag_counts() == {"advanced-xml": 1}
+        assert catalog.get("basic").author == "Unknown"
+    print("Metadata OK\n")
+    
+    print("26. Testing query_examples()...")
+    report = json.loads((await server.query_examples(
+        all_of=["import:com.sap.it.api.*"], none_of=["expected:no"], format="json"))[0].text)
+    assert report["examples"] == ["reading-credentials"] and report["facets"]["api"]["getUserCredential"] == 1
+    result = await server.query_examples(any_of=["input:csv", "input:base64"], all_of=["api:message.getBody"])
+    assert "**Matches:** 2" in result[0].text and "`csv` (1)" in result[0].text
+    try:
+        await server.query_examples(all_of=["colour:red"])
+        assert False, "expected a ValueError"
+    except ValueError:
+        pass
+    index = FacetIndex()
+    index.build(server.catalog.examples())
+    everything = index.query()
+    index.update({"basic": None})
+    assert "basic" not in index.names(index.query()) and index.query(["tag:beginner"]) == 0
+    index.update({"basic": server.catalog.get("basic")})
+    assert index.query() == everything, "freed bit positions are reused"
+    print("Faceted query OK\n")
+    
+    print("27. Testing resource subscriptions...")
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copytree(Path(__file__).parent / "basic", Path(tmp) / "basic")
+        local = SAPGroovyMCPServer(Path(tmp), None)
+        local.subscriptions.debounce = 0.05
+        received = []
+        
+        async def on_message(message):
+            if isinstance(message, types.ServerNotification):
+                received.append(message.root)
+        
+        async with create_connected_server_and_client_session(local.server, message_handler=on_message) as client:
+            assert client.get_server_capabilities().resources.subscribe
+            await client.list_resources()
+            await client.subscribe_resource(AnyUrl("groovy://examples/basic/script"))
+            await client.subscribe_resource(AnyUrl("groovy://examples/basic/readme"))
+            script = Path(tmp) / "basic" / "script.groovy"
+            script.write_text("// one\n", encoding="utf-8")
+            local.catalog.refresh()
+            script.write_text("// two\n", encoding="utf-8")
+            local.catalog.refresh()
+            await asyncio.sleep(0.3)
+            assert [str(n.params.uri) for n in received] == ["groovy://examples/basic/script"], received
+            received.clear()
+            (Path(tmp) / "basic" / "input.body.csv").write_text("a,b\\n", encoding="utf-8")
+            local.catalog.refresh()
+            await asyncio.sleep(0.3)
+            assert [type(n).__name__ for n in received] == ["ResourceListChangedNotification"], received
+    print("Resource subscriptions OK\n")
+    
+    print("28. Testing payload scaling for profile_script...")
+    scaled = scale_body("<?xml version='1.0'?>\n<Orders><List><Order id='1'/><Order id='2'/></List></Orders>",
+                        "input.body.xml", 10)
+    assert scaled.startswith("<?xml") and scaled.count("<Order ") == 20 and scaled.count("<List>") == 1
+    assert scale_body("h1,h2\n1,2\n", "input.body.csv", 3) == "h1,h2\n1,2\n1,2\n1,2\n"
+    assert json.loads(scale_body('{"meta": {"n": 1}, "rows": [1, 2]}', "input.body.json", 2))["rows"] == [1, 2, 1, 2]
+    assert round(fit_exponent([1e3, 1e4, 1e5], [0.5, 20.0, 2000.0], TIME_FLOOR_MS), 2) == 2.0
+    assert classify(fit_exponent([1e3, 1e4], [2.0, 21.0], TIME_FLOOR_MS)) == "linear"
+    
+    class QuadraticRunner:
+        async def run(self, example, function, timeout=None, fixtures=None, profile=False):
+            n = len(fixtures.body)
+            return RunResult(example.name, "unchecked", n * n / 1e4,
+                             profile={"allocatedBytes": 64 * n, "heapBaselineBytes": 0, "peakHeapBytes": 64 * n})
+    
+    built = []
+    
+    async def build(scale, body, file_name, factor):
+        built.append(factor)
+        return scale(body, file_name, factor)
+    
+    report = await profile_example(QuadraticRunner(), server.catalog.get("basic"),
+                                   load_fixtures(Path(__file__).parent / "basic"), [1, 100, 1000, 10**4], repeat=1,
+                                   max_bytes=256 * 1024, run=build)
+    assert [p.factor for p in report.points] == [1, 100, 1000] and report.skipped[0][0] == 10**4
+    assert built == [1, 100, 1000], "oversized inputs are skipped before they are built"
+    assert classify(report.exponents["time"]) == "quadratic" and classify(report.exponents["allocation"]) == "linear"
+    
+    class HeapCappedRunner(QuadraticRunner):
+        async def run(self, example, function, timeout=None, fixtures=None, profile=False):
+            if len(fixtures.body) > 1000:
+                return RunResult(example.name, "error", error="java.lang.OutOfMemoryError: Java heap space")
+            return await super().run(example, function, timeout, fixtures, profile)
+    
+    report = await profile_example(HeapCappedRunner(), server.catalog.get("basic"),
+                                   load_fixtures(Path(__file__).parent / "basic"), [1, 100, 1000], repeat=1)
+    assert report.points[-1].error.startswith("out of memory") and report.skipped == [(1000, "failed at 100x")]
+    assert profiling_pool().jvm_options == (f"-Xmx{PROFILE_HEAP_MB}m",)
+    print("Profiler OK\n")
+    
+    print("29. Testing the symbol cross-reference index...")
+    refs = script_references(
+        "import com.sap.it.api.ITApiFactory\nimport com.sap.it.api.securestore.SecureStoreService as Store\n"
+        "def store = ITApiFactory.getApi(Store.class, null)\nstore.getUserCredential('x')\n"
+        "messageLogFactory.getMessageLog(message)?.setStringProperty('a', 'b')\n"
+    )
+    assert refs["com.sap.it.api.ITApiFactory#getApi"] == (3,)
+    assert refs["com.sap.it.api.securestore.SecureStoreService#getUserCredential"] == (4,)
+    assert refs["com.sap.it.api.msglog.MessageLog#setStringProperty"] == (5,)
+    xref = await server._xref_index()
+    usages = xref.usages("ITApiFactory#getService")
+    assert [(ex, line) for ex, _, line, _ in usages] == [("reading-credentials", 16)], usages
+    assert "com.sap.it.api.ITApiFactory#getApi" in xref.symbols("com.sap.it.api.*")
+    result = await server.call_tool("find_usages", {"symbol": "MessageLog#setStringProperty", "format": "json"})
+    data = json.loads(result[0].text)
+    assert data["total"] >= 1 and data["symbols"] == ["com.sap.it.api.msglog.MessageLog#setStringProperty"]
+    result = await server.call_tool("list_symbols", {"prefix": "com.sap.", "kind": "class"})
+    assert "`com.sap.it.api.ITApiFactory`" in result[0].text and "#" not in result[0].text.split("|---|")[1]
+    with tempfile.TemporaryDirectory() as tmp:
+        shutil.copytree(Path(__file__).parent / "basic", Path(tmp) / "basic")
+        local = SAPGroovyMCPServer(Path(tmp), None)
+        local_xref = await local._xref_index()
+        resolved = local_xref.resolved
+        (Path(tmp) / "basic" / "script.groovy").write_text("def x = new StringBuilder()\nx.append('a')\n", encoding="utf-8")
+        local.catalog.refresh()
+        assert local_xref.resolved == resolved + 1, "only the changed file is re-resolved"
+        assert [line for _, _, line, _ in local_xref.usages("java.lang.StringBuilder")] == [1, 2]
+        assert not local_xref.usages("Message#getBody")
+    print("Cross-reference index OK\n")
+    
+    print("30. Testing the synthetic payload generator...")
+    template = fixture_template(load_fixtures(Path(__file__).parent / "edi-segment-counter"))
+    interchange = ET.fromstring(b"".join(stream_payload(template, records=3)))
+    assert [e.tag for e in interchange][-4:] == ["M_ORDERS", "M_ORDERS", "M_ORDERS", "S_UNZ"]
+    assert [e.text for e in interchange.iter("D_0062")] == ["1", "1", "2", "2", "3", "3"]
+    assert interchange.find("S_UNZ/D_0036").text == "3"
+    edifact = infer_template("UNA:+.? 'UNB+UNOC:3+S+R+220101:1200+REF'\nUNH+7+ORDERS:D:96A:UN'\nBGM+220+A?'B'\n"
+                             "UNT+3+7'\nUNZ+1+REF'\n", "input.body.edi")
+    assert b"".join(stream_payload(edifact, records=2)).decode().endswith(
+        "UNH+2+ORDERS:D:96A:UN'\nBGM+220+A?'B'\nUNT+3+2'\nUNZ+2+REF'\n")
+    rows = fixture_template(load_fixtures(Path(__file__).parent / "csv-to-xml-manual"))
+    chunks = list(stream_payload(rows, size=5 * 1024 * 1024, chunk_bytes=64 * 1024))
+    assert max(map(len, chunks)) <= 64 * 1024 and 5 * 1024 * 1024 - 6 <= sum(map(len, chunks)) <= 5 * 1024 * 1024
+    assert chunks[0] == b"HEADER1,B,C\n" and chunks[1].startswith(b"1,2,3\n4,5,6\n")
+    binary = fixture_template(load_fixtures(Path(__file__).parent / "excel-xls-to-xml"))
+    decoded = base64.b64decode(b"".join(stream_payload(binary, records=2)))
+    assert decoded == binary.binary * 2
+    assert parse_size("64M") == 64 * 1024 * 1024 and parse_size("1.5k") == 1536
+    result = await server.call_tool("generate_payload", {"example_name": "csv-to-xml-manual", "records": 4,
+                                                         "mode": "chunk", "offset": 12, "length": 18})
+    assert "1,2,3\n4,5,6\n1,2,3" in result[0].text, result[0].text
+    # Slices start at the record holding the offset instead of regenerating from byte 0
+    full = b"".join(stream_payload(template, size=300 * 1024))
+    assert payload_slice(template, 200_000, 5000, size=300 * 1024) == full[200_000:205_000]
+    assert measure_payload(template, size=300 * 1024)[0] == len(full)
+    assert payload_slice(binary, 4097, 100, records=40) == b"".join(stream_payload(binary, records=40))[4097:4197]
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / "out.xml"
+        written, count = save_payload(template, target, size=256 * 1024)
+        assert count > 100 and target.stat().st_size == written <= 256 * 1024
+        assert ET.parse(target).getroot().find("S_UNZ/D_0036").text == str(count)
+        # Least recently used payload files go first when the folder would exceed its limit
+        os.utime(target, ns=(0, 0))
+        newer = Path(tmp) / "newer.xml"
+        newer.write_bytes(b"x" * 1000)
+        assert prune_payloads(Path(tmp), written + 1500, reserve=1000) == [target] and newer.exists()
+    print("Payload generator OK\n")
+    
     print("=== All tests completed successfully! ===")
 
 if __name__ == "__main__":
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Cross-reference index of the classes and methods scripts use.
+
+Every script's cached parse is resolved into references to fully-qualified
+symbols: ``com.sap.it.api.ITApiFactory`` for a class (import lines and
+``new``) and ``com.sap.it.api.ITApiFactory#getApi`` for a method
+called on it. Receivers are resolved through the script's ``import`` lines,
+the variables it declares or assigns from SAP factory calls, the ``message``
+and ``messageLogFactory`` bindings SAP Cloud Integration provides, and the
+packages Groovy imports by default. Names that cannot be resolved are kept
+as written (``JSch#getSession``), so they can still be looked up.
+
+References are kept per script file and content hash, so a catalog change
+re-resolves only the files whose content changed, and a lookup is a couple
+of dictionary reads.
+"""
+
+from typing import Iterable, Optional
+
+from catalog import Example
+from groovy_parser import summarize
+
+# Script bindings provided by SAP Cloud Integration
+BINDINGS = {
+    "message": "com.sap.gateway.ip.core.customdev.util.Message",
+    "messageLogFactory": "com.sap.it.api.msglog.MessageLogFactory",
+}
+
+# Classes resolved without an import: the SAP API types scripts commonly use
+# through ``def`` and the classes of Groovy's default imports
+KNOWN_CLASSES = {
+    "Message": "com.sap.gateway.ip.core.customdev.util.Message",
+    "MessageLog": "com.sap.it.api.msglog.MessageLog",
+    "MessageLogFactory": "com.sap.it.api.msglog.MessageLogFactory",
+    "ITApiFactory": "com.sap.it.api.ITApiFactory",
+    "SecureStoreService": "com.sap.it.api.securestore.SecureStoreService",
+    "UserCredential": "com.sap.it.api.securestore.UserCredential",
+    "ValueMappingApi": "com.sap.it.api.mapping.ValueMappingApi",
+    "PartnerDirectoryService": "com.sap.it.api.pd.PartnerDirectoryService",
+    "KeystoreService": "com.sap.it.api.keystore.KeystoreService",
+}
+for _package, _names in {
+    "java.lang": "Boolean Byte Character Double Exception Float Integer Long Math Object Runtime "
+                 "RuntimeException Short String StringBuffer StringBuilder System Thread",
+    "java.util": "ArrayList Arrays Base64 Collections Date HashMap HashSet LinkedHashMap LinkedList "
+                 "List Map Properties Set TreeMap UUID",
+    "java.io": "BufferedReader BufferedWriter ByteArrayInputStream ByteArrayOutputStream File "
+               "InputStream InputStreamReader OutputStream Reader StringReader StringWriter Writer",
+    "java.math": "BigDecimal BigInteger",
+    "java.net": "URL URLDecoder URLEncoder",
+}.items():
+    KNOWN_CLASSES.update((name, f"{_package}.{name}") for name in _names.split())
+
+# Result types of methods whose receiver type is known
+RETURN_TYPES = {
+    "com.sap.it.api.msglog.MessageLogFactory#getMessageLog": "com.sap.it.api.msglog.MessageLog",
+}
+
+KINDS = ("class", "method")
+
+
+def symbol_kind(symbol: str) -> str:
+    return "method" if "#" in symbol else "class"
+
+
+class _Resolver:
+    """Resolves the type names of one script to fully-qualified classes."""
+
+    def __init__(self, summary):
+        self.summary = summary
+        self.classes: dict[str, str] = {}
+        self.static_methods: dict[str, str] = {}
+        self.static_classes: list[str] = []
+        for imp in summary.imports:
+            if imp.static:
+                owner, _, member = imp.name.rpartition(".")
+                if member == "*":
+                    self.static_classes.append(owner)
+                else:
+                    self.static_methods[imp.alias or member] = owner
+            elif not imp.name.endswith(".*"):
+                self.classes[imp.simple_name] = imp.name
+        self.local = {info.name for info in summary.classes}
+
+    def resolve_class(self, name: str) -> str:
+        name = name.split("<", 1)[0]
+        if name in self.local or "." in name:
+            return name
+        return self.classes.get(name) or KNOWN_CLASSES.get(name, name)
+
+    def receiver_type(self, receiver: str) -> Optional[str]:
+        """Class of the value a receiver expression evaluates to, if known."""
+        parts = receiver.split(".")
+        root = parts[0]
+        if root.endswith("()"):
+            return None
+        if root in self.summary.variables:
+            current = self.resolve_class(self.summary.variables[root])
+        elif root in BINDINGS:
+            current = BINDINGS[root]
+        elif root[:1].isupper() and len(parts) == 1:
+            # Static call such as ITApiFactory.getApi(...)
+            current = self.resolve_class(root)
+        else:
+            return None
+        for part in parts[1:]:
+            if not part.endswith("()"):
+                # Property access (System.out) or a package-qualified name
+                return None
+            current = RETURN_TYPES.get(f"{current}#{part[:-2]}")
+            if current is None:
+                return None
+        return current
+
+
+def script_references(source: str) -> dict[str, tuple[int, ...]]:
+    """Symbols referenced by a script, each mapped to the sorted lines it appears on."""
+    summary = summarize(source)
+    resolver = _Resolver(summary)
+    found: dict[str, set[int]] = {}
+
+    def add(symbol: str, line: int) -> None:
+        found.setdefault(symbol, set()).add(line)
+
+    for imp in summary.imports:
+        if imp.name.endswith(".*"):
+            continue
+        if imp.static:
+            owner, _, member = imp.name.rpartition(".")
+            add(f"{owner}#{member}", imp.line)
+        else:
+            add(imp.name, imp.line)
+    for class_name, line in summary.instantiations:
+        if class_name[:1].isupper() or "." in class_name:
+            add(resolver.resolve_class(class_name), line)
+    for call in summary.calls:
+        if call.receiver is None:
+            owner = resolver.static_methods.get(call.method)
+            if owner is None and len(resolver.static_classes) == 1:
+                owner = resolver.static_classes[0]
+            if owner is not None:
+                add(f"{owner}#{call.method}", call.line)
+            continue
+        owner = resolver.receiver_type(call.receiver)
+        if owner is not None:
+            add(f"{owner}#{call.method}", call.line)
+    return {symbol: tuple(sorted(lines)) for symbol, lines in found.items()}
+
+
+class CrossReferenceIndex:
+    """Symbol -> (example, script file) -> lines, over a catalog."""
+
+    def __init__(self):
+        # (example, script file) -> (content hash, references)
+        self._files: dict[tuple[str, str], tuple[Optional[str], dict[str, tuple[int, ...]]]] = {}
+        self._example_files: dict[str, set[str]] = {}
+        self._usages: dict[str, dict[tuple[str, str], tuple[int, ...]]] = {}
+        # Class -> the class and method symbols it owns; simple name -> classes
+        self._by_class: dict[str, set[str]] = {}
+        self._simple: dict[str, set[str]] = {}
+        self.resolved = 0
+
+    def __len__(self) -> int:
+        return len(self._usages)
+
+    def build(self, examples: Iterable[Example]) -> None:
+        self.__init__()
+        for example in examples:
+            self._update_example(example.name, example)
+
+    def update(self, examples: dict[str, Optional[Example]]) -> None:
+        """Apply catalog changes: a None value removes the example."""
+        for name, example in examples.items():
+            self._update_example(name, example)
+
+    def _update_example(self, name: str, example: Optional[Example]) -> None:
+        scripts = example.scripts if example is not None else {}
+        for file_name in self._example_files.get(name, set()) - scripts.keys():
+            self._remove((name, file_name))
+        for file_name, source in scripts.items():
+            key = (name, file_name)
+            digest = example.hashes.get(file_name)
+            previous = self._files.get(key)
+            if previous is not None and digest is not None and previous[0] == digest:
+                # Unchanged file of a changed example
+                continue
+            if previous is not None:
+                self._remove(key)
+            self._add(key, digest, script_references(source))
+
+    def _add(self, key: tuple[str, str], digest: Optional[str], references: dict[str, tuple[int, ...]]) -> None:
+        self._files[key] = (digest, references)
+        self._example_files.setdefault(key[0], set()).add(key[1])
+        self.resolved += 1
+        for symbol, lines in references.items():
+            usages = self._usages.get(symbol)
+            if usages is None:
+                usages = self._usages[symbol] = {}
+                owner = symbol.partition("#")[0]
+                self._by_class.setdefault(owner, set()).add(symbol)
+                self._simple.setdefault(owner.rsplit(".", 1)[-1], set()).add(owner)
+            usages[key] = lines
+
+    def _remove(self, key: tuple[str, str]) -> None:
+        _, references = self._files.pop(key)
+        files = self._example_files[key[0]]
+        files.discard(key[1])
+        if not files:
+            del self._example_files[key[0]]
+        for symbol in references:
+            usages = self._usages[symbol]
+            del usages[key]
+            if usages:
+                continue
+            del self._usages[symbol]
+            owner = symbol.partition("#")[0]
+            owned = self._by_class[owner]
+            owned.discard(symbol)
+            if not owned:
+                del self._by_class[owner]
+                simple = owner.rsplit(".", 1)[-1]
+                self._simple[simple].discard(owner)
+                if not self._simple[simple]:
+                    del self._simple[simple]
+
+    def symbols(self, pattern: str) -> list[str]:
+        """Indexed symbols a lookup pattern names, sorted.
+
+        ``a.b.C`` and ``a.b.C#method`` are exact; a class without a package
+        (``ITApiFactory``, ``MessageLog#setStringProperty``) matches it in
+        every package; a trailing ``*`` matches a prefix. A class also names
+        the methods called on it.
+        """
+        pattern = pattern.strip()
+        if not pattern:
+            raise ValueError("Symbol must not be empty")
+        owner, sep, member = pattern.partition("#")
+        if pattern.endswith("*"):
+            prefix = pattern[:-1]
+            if "." in owner:
+                return sorted(symbol for symbol in self._usages if symbol.startswith(prefix))
+            # Compare the symbol from its simple class name on
+            return sorted(
+                symbol for simple, classes in self._simple.items() if simple.startswith(prefix[:len(simple)])
+                for cls in classes for symbol in self._by_class[cls]
+                if symbol[len(cls) - len(simple):].startswith(prefix)
+            )
+        classes = {owner} if "." in owner else self._simple.get(owner, set())
+        found = []
+        for cls in classes:
+            for symbol in self._by_class.get(cls, ()):
+                if not sep or symbol == f"{cls}#{member}":
+                    found.append(symbol)
+        return sorted(found)
+
+    def usages(
+        self,
+        pattern: str,
+        within: Optional[set[str]] = None,
+    ) -> list[tuple[str, str, int, str]]:
+        """(example, script file, line, symbol) of every use of the named symbols, in file order."""
+        found = []
+        for symbol in self.symbols(pattern):
+            for (example, file_name), lines in self._usages[symbol].items():
+                if within is None or example in within:
+                    found.extend((example, file_name, line, symbol) for line in lines)
+        found.sort()
+        return found
+
+    def counts(
+        self,
+        prefix: str = "",
+        kind: Optional[str] = None,
+        within: Optional[set[str]] = None,
+    ) -> list[tuple[str, int, int]]:
+        """(symbol, uses, examples) of the indexed symbols, most used first."""
+        if kind is not None and kind not in KINDS:
+            raise ValueError(f"Unknown symbol kind: {kind} (available: {', '.join(KINDS)})")
+        counted = []
+        for symbol, usages in self._usages.items():
+            if not symbol.startswith(prefix) or (kind is not None and symbol_kind(symbol) != kind):
+                continue
+            uses = 0
+            examples = set()
+            for (example, _), lines in usages.items():
+                if within is None or example in within:
+                    uses += len(lines)
+                    examples.add(example)
+            if uses:
+                counted.append((symbol, uses, len(examples)))
+        counted.sort(key=lambda item: (-item[1], item[0]))
+        return counted